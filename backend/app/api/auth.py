@@ -2,10 +2,18 @@ from fastapi import APIRouter, Response, Depends, status, HTTPException
 from sqlalchemy.orm import Session
 
 from app.deps.deps import get_db, CurrentUser
-from app.crud.freelancer import authenticate_user, create_freelancer
+from app.crud.freelancer import (
+    authenticate_user,
+    create_freelancer,
+    update_notification_settings,
+)
 from app.core.security import create_access_token
 from app.core.config import settings
-from app.schema.freelancer import FreelancerGet, FreelancerCreate
+from app.schema.freelancer import (
+    FreelancerGet,
+    FreelancerCreate,
+    NotificationSettings,
+)
 from app.exceptions.exception import InvalidCredentialsException
 from app.schema.response import SuccessResponse
 from app.schema.auth import LoginRequest
@@ -64,6 +72,30 @@ def read_current_freelancer(current_user: CurrentUser):
     return current_user
 
 
+@router.put(
+    "/me/notifications",
+    response_model=SuccessResponse[NotificationSettings],
+    status_code=status.HTTP_200_OK,
+)
+def update_my_notification_settings(
+    current_user: CurrentUser,
+    data: NotificationSettings,
+    db: Session = Depends(get_db),
+):
+    """
+    Switch booking request emails between one per request and a digest
+    sent at most every digest_minutes.
+    """
+    freelancer = update_notification_settings(db, current_user, data)
+
+    return SuccessResponse(
+        data=NotificationSettings(
+            digest_minutes=freelancer.notification_digest_minutes
+        ),
+        message="Notification settings updated successfully",
+    )
+
+
 @router.post(
     "/logout", response_model=SuccessResponse[None], status_code=status.HTTP_200_OK
 )
@@ -1,20 +1,44 @@
-from fastapi import APIRouter, Depends, status
+import base64
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.deps.deps import get_db, CurrentUser
-from app.schema.response import SuccessResponse
+from app.schema.response import Page, SuccessResponse
+from app.utils.http_cache import (
+    is_not_modified,
+    make_etag,
+    not_modified,
+    set_validators,
+)
+from app.utils.pagination import decode_cursor, encode_cursor
 from app.schema.available_slots import (
+    AvailableSlotBulkCreate,
     AvailableSlotCreate,
     AvailableSlotResponse,
     AvailableSlotUpdate,
+    BookableUnit,
+    BulkSlotResult,
+    FreeBusyResponse,
+    FreeFreelancerResult,
 )
 from app.crud.available_slots import (
     create_available_slot,
+    create_available_slots_bulk,
     get_available_slots,
     update_available_slot,
     delete_available_slot,
     get_available_slot_by_id,
+    get_free_units,
+    get_freebusy,
+    search_free_freelancers,
 )
+from app.crud.freelancer import get_availability_version, get_slot_availability_version
+from app.services.freebusy import BUCKET
+from app.services.slot_carving import carver
 
 router = APIRouter()
 
@@ -39,33 +63,208 @@ def create_availability(
     )
 
 
+@router.post(
+    "/bulk",
+    response_model=SuccessResponse[list[BulkSlotResult]],
+    status_code=status.HTTP_200_OK,
+)
+def create_availability_bulk(
+    current_user: CurrentUser,
+    data: AvailableSlotBulkCreate,
+    db: Session = Depends(get_db),
+):
+    """
+    Create many slots at once. Conflicting items are reported per item
+    instead of failing the whole request.
+    """
+    results = create_available_slots_bulk(
+        db=db, items=data.slots, freelancer_id=current_user.id
+    )
+    created = sum(result.created for result in results)
+
+    return SuccessResponse(
+        data=results,
+        message=f"{created} of {len(results)} available slots created",
+    )
+
+
+@router.get(
+    "/search",
+    response_model=SuccessResponse[Page[FreeFreelancerResult]],
+    status_code=status.HTTP_200_OK,
+)
+def search_availability(
+    start: datetime = Query(..., description="Start of the wanted time window"),
+    end: datetime = Query(..., description="End of the wanted time window"),
+    min_duration: int = Query(
+        60, ge=1, description="Minimum free time inside the window, in minutes"
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor of the last page"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """
+    Find freelancers who are free during the window, earliest first.
+    """
+    results, next_position = search_free_freelancers(
+        db=db,
+        window_start=start,
+        window_end=end,
+        min_duration=timedelta(minutes=min_duration),
+        after=decode_cursor(cursor) if cursor else None,
+        limit=limit,
+    )
+    return SuccessResponse(
+        data=Page(
+            items=results,
+            next_cursor=encode_cursor(*next_position) if next_position else None,
+        ),
+        message="Free freelancers retrieved successfully",
+    )
+
+
 @router.get(
     "/{slot_id}",
     response_model=SuccessResponse[AvailableSlotResponse],
     status_code=status.HTTP_200_OK,
 )
-def get_single_available_slot(slot_id: int, db: Session = Depends(get_db)):
+def get_single_available_slot(
+    slot_id: int, request: Request, response: Response, db: Session = Depends(get_db)
+):
+    version = get_slot_availability_version(db, slot_id)
+    if version:
+        etag = make_etag("slot", slot_id, version.availability_version)
+        if is_not_modified(request, etag):
+            return not_modified(etag, version.availability_updated_at)
+        set_validators(response, etag, version.availability_updated_at)
+
     slot = get_available_slot_by_id(db=db, slot_id=slot_id)
     return SuccessResponse(data= slot, message="Slot feteched Successfully")
 
 
+@router.get(
+    "/{slot_id}/units",
+    response_model=SuccessResponse[list[BookableUnit]],
+    status_code=status.HTTP_200_OK,
+)
+def get_slot_units(slot_id: int, db: Session = Depends(get_db)):
+    """
+    List the units of the slot that can still be booked.
+    """
+    slot = get_available_slot_by_id(db=db, slot_id=slot_id)
+    units = [
+        BookableUnit(start_time=start, end_time=start + carver.duration)
+        for start in get_free_units(db, slot)
+    ]
+    return SuccessResponse(data=units, message="Bookable units retrieved successfully")
+
+
 @router.get(
     "/freelancer/{freelancer_id}",
-    response_model=SuccessResponse[list[AvailableSlotResponse]],
+    response_model=SuccessResponse[Page[AvailableSlotResponse]],
     status_code=status.HTTP_200_OK,
 )
 def get_availability(
     freelancer_id: int,
+    request: Request,
+    response: Response,
+    from_: Optional[datetime] = Query(
+        None, alias="from", description="Window start, defaults to now"
+    ),
+    to: Optional[datetime] = Query(
+        None, description="Window end, defaults to the rule expansion horizon"
+    ),
+    only_free: bool = Query(False, description="Skip slots that are booked"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the last page"),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
 ):
+    # floored to the minute so that clients polling "from now" can revalidate
+    window_start = from_ or datetime.utcnow().replace(second=0, microsecond=0)
+    window_end = to or window_start + timedelta(days=settings.RULE_EXPANSION_DAYS)
 
-    slots = get_available_slots(db=db, freelancer_id=freelancer_id)
+    version = get_availability_version(db, freelancer_id)
+    if version:
+        etag = make_etag(
+            "slots",
+            freelancer_id,
+            version.availability_version,
+            window_start.isoformat(),
+            window_end.isoformat(),
+            only_free,
+            cursor,
+            limit,
+        )
+        if is_not_modified(request, etag):
+            return not_modified(etag, version.availability_updated_at)
+        set_validators(response, etag, version.availability_updated_at)
+
+    slots, next_position = get_available_slots(
+        db=db,
+        freelancer_id=freelancer_id,
+        window_start=window_start,
+        window_end=window_end,
+        only_free=only_free,
+        after=decode_cursor(cursor) if cursor else None,
+        limit=limit,
+    )
     return SuccessResponse(
-        data=slots,
+        data=Page(
+            items=slots,
+            next_cursor=encode_cursor(*next_position) if next_position else None,
+        ),
         message="Available slots retrieved successfully",
     )
 
 
+@router.get(
+    "/freelancer/{freelancer_id}/freebusy",
+    response_model=SuccessResponse[FreeBusyResponse],
+    status_code=status.HTTP_200_OK,
+)
+def get_availability_freebusy(
+    freelancer_id: int,
+    request: Request,
+    response: Response,
+    start_date: date = Query(..., description="First day (UTC) of the bitmap"),
+    days: int = Query(31, ge=1, le=62),
+    db: Session = Depends(get_db),
+):
+    """
+    Compact free/busy view for calendars: one bit per 15-minute bucket.
+    """
+    version = get_availability_version(db, freelancer_id)
+    if version:
+        etag = make_etag(
+            "freebusy",
+            freelancer_id,
+            version.availability_version,
+            start_date.isoformat(),
+            days,
+        )
+        if is_not_modified(request, etag):
+            return not_modified(etag, version.availability_updated_at)
+        set_validators(response, etag, version.availability_updated_at)
+
+    bitmap = get_freebusy(
+        db=db,
+        freelancer_id=freelancer_id,
+        start_date=start_date,
+        days=days,
+        version=version.availability_version if version else None,
+    )
+    return SuccessResponse(
+        data=FreeBusyResponse(
+            freelancer_id=freelancer_id,
+            start_date=start_date,
+            days=days,
+            bucket_minutes=BUCKET // timedelta(minutes=1),
+            bitmap=base64.b64encode(bitmap).decode(),
+        ),
+        message="Free/busy bitmap retrieved successfully",
+    )
+
+
 @router.put(
     "/{slot_id}",
     response_model=SuccessResponse[AvailableSlotResponse],
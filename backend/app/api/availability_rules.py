@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from app.deps.deps import get_db, CurrentUser
+from app.schema.response import SuccessResponse
+from app.schema.availability_rules import (
+    AvailabilityRuleCreate,
+    AvailabilityRuleResponse,
+    RuleExclusionCreate,
+    RuleExclusionResponse,
+)
+from app.crud.availability_rules import (
+    create_availability_rule,
+    get_availability_rules,
+    delete_availability_rule,
+    add_rule_exclusion,
+)
+
+router = APIRouter()
+
+
+@router.post(
+    "/",
+    response_model=SuccessResponse[AvailabilityRuleResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def create_rule(
+    current_user: CurrentUser,
+    data: AvailabilityRuleCreate,
+    db: Session = Depends(get_db),
+):
+    rule = create_availability_rule(db=db, data=data, freelancer_id=current_user.id)
+
+    return SuccessResponse(
+        data=rule,
+        message="Availability rule created successfully",
+    )
+
+
+@router.get(
+    "/",
+    response_model=SuccessResponse[list[AvailabilityRuleResponse]],
+    status_code=status.HTTP_200_OK,
+)
+def get_rules(
+    current_user: CurrentUser,
+    db: Session = Depends(get_db),
+):
+    rules = get_availability_rules(db=db, freelancer_id=current_user.id)
+
+    return SuccessResponse(
+        data=rules,
+        message="Availability rules retrieved successfully",
+    )
+
+
+@router.delete(
+    "/{rule_id}",
+    response_model=SuccessResponse[None],
+    status_code=status.HTTP_200_OK,
+)
+def delete_rule(
+    current_user: CurrentUser,
+    rule_id: int,
+    db: Session = Depends(get_db),
+):
+    delete_availability_rule(db=db, rule_id=rule_id, freelancer_id=current_user.id)
+
+    return SuccessResponse(
+        data=None,
+        message="Availability rule deleted successfully",
+    )
+
+
+@router.post(
+    "/{rule_id}/exclusions",
+    response_model=SuccessResponse[RuleExclusionResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def create_rule_exclusion(
+    current_user: CurrentUser,
+    rule_id: int,
+    data: RuleExclusionCreate,
+    db: Session = Depends(get_db),
+):
+    """
+    Block out part of a rule (e.g. a holiday) without touching other weeks.
+    """
+    exclusion = add_rule_exclusion(
+        db=db, rule_id=rule_id, freelancer_id=current_user.id, data=data
+    )
+
+    return SuccessResponse(
+        data=exclusion,
+        message="Rule exclusion created successfully",
+    )
@@ -1,33 +1,102 @@
-from fastapi import APIRouter, Query, status, Depends
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Header, Query, Request, Response, status, Depends
 from sqlalchemy.orm import Session
 
 from app.crud.bookings import (
     create_booking,
     update_booking,
     get_bookings_by_freelancer_id,
+    count_bookings_by_status,
     get_booking_by_id,
+    update_bookings_bulk,
+)
+from app.crud.freelancer import get_booking_availability_version
+from app.crud.holds import create_hold, release_hold
+from app.crud.idempotency import get_stored_response, request_fingerprint
+from app.models.bookings import BookingStatus
+from app.schema.bookings import (
+    BookingBulkUpdate,
+    BookingCreate,
+    BookingPage,
+    BookingResponse,
+    BookingUpdate,
+    BulkBookingResult,
+    SlotHoldResponse,
 )
-from app.schema.bookings import BookingCreate, BookingResponse, BookingUpdate
 from app.deps.deps import get_db, CurrentUser
 from app.schema.response import SuccessResponse
+from app.exceptions import exception
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.http_cache import (
+    is_not_modified,
+    make_etag,
+    not_modified,
+    set_validators,
+)
+
 router = APIRouter()
 
 
 @router.get(
     "/",
-    response_model=SuccessResponse[list[BookingResponse]],
+    response_model=SuccessResponse[BookingPage],
     status_code=status.HTTP_200_OK,
 )
 def get_logged_in_freelancer_bookings(
     current_user: CurrentUser,
+    request: Request,
+    response: Response,
+    status_: Optional[list[BookingStatus]] = Query(
+        None, alias="status", description="Only bookings in these statuses"
+    ),
+    from_: Optional[datetime] = Query(
+        None, alias="from", description="Only bookings starting at or after this"
+    ),
+    to: Optional[datetime] = Query(None, description="Only bookings starting before"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the last page"),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
 ):
     """
-    Get all bookings for the logged-in freelancer.
+    Get the logged-in freelancer's bookings, ordered by time.
     """
-    bookings = get_bookings_by_freelancer_id(db=db, freelancer_id=current_user.id)
+    # the version was loaded with the current user, no extra query needed
+    version = current_user.availability_version
+    etag = make_etag(
+        "bookings",
+        current_user.id,
+        version,
+        sorted(status_ or []),
+        from_ and from_.isoformat(),
+        to and to.isoformat(),
+        cursor,
+        limit,
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag, current_user.availability_updated_at)
+    set_validators(response, etag, current_user.availability_updated_at)
 
-    return SuccessResponse(data=bookings, message="Bookings retrieved successfully")
+    bookings, next_position = get_bookings_by_freelancer_id(
+        db=db,
+        freelancer_id=current_user.id,
+        statuses=status_,
+        time_from=from_,
+        time_to=to,
+        after=decode_cursor(cursor) if cursor else None,
+        limit=limit,
+    )
+    counts = count_bookings_by_status(db, current_user.id, version)
+
+    return SuccessResponse(
+        data=BookingPage(
+            items=bookings,
+            next_cursor=encode_cursor(*next_position) if next_position else None,
+            counts=counts,
+        ),
+        message="Bookings retrieved successfully",
+    )
 
 
 @router.get(
@@ -37,8 +106,17 @@ def get_logged_in_freelancer_bookings(
 )
 def get_single_booking(
     booking_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
+    version = get_booking_availability_version(db, booking_id)
+    if version:
+        etag = make_etag("booking", booking_id, version.availability_version)
+        if is_not_modified(request, etag):
+            return not_modified(etag, version.availability_updated_at)
+        set_validators(response, etag, version.availability_updated_at)
+
     booking = get_booking_by_id(db=db, booking_id=booking_id)
 
     return SuccessResponse(data=booking, message="Booking retrieved successfully")
@@ -51,16 +129,106 @@ def get_single_booking(
 )
 def create_booking_endpoint(
     booking_data: BookingCreate,
-    slot_id: int = Query(
-        ..., ge=1, description="ID of the available slot being booked"
+    slot_id: Optional[int] = Query(
+        None, ge=1, description="ID of the available slot being booked"
+    ),
+    rule_id: Optional[int] = Query(
+        None, ge=1, description="ID of the recurring rule whose occurrence is booked"
+    ),
+    start_time: Optional[datetime] = Query(
+        None, description="Start of the rule occurrence being booked"
+    ),
+    idempotency_key: Optional[str] = Header(
+        None,
+        max_length=255,
+        description="Retries with the same key replay the first response",
     ),
     db: Session = Depends(get_db),
 ):
-    # booking = create_booking( booking_data)
-    booking = create_booking(db=db, slot_id=slot_id, data=booking_data)
+    if (slot_id is None) == (rule_id is None) or (
+        rule_id is not None and start_time is None
+    ):
+        raise exception.AppException(
+            "Provide either slot_id, or rule_id together with start_time",
+            code="booking.invalid_target",
+            target="slot_id",
+            status_code=400,
+        )
+
+    fingerprint = None
+    if idempotency_key is not None:
+        fingerprint = request_fingerprint(
+            body=booking_data.model_dump(mode="json"),
+            slot_id=slot_id,
+            rule_id=rule_id,
+            start_time=start_time,
+        )
+        stored = get_stored_response(db, idempotency_key, fingerprint)
+        if stored is not None:
+            return SuccessResponse(data=stored, message="Booking created successfully")
+
+    try:
+        booking = create_booking(
+            db=db,
+            data=booking_data,
+            slot_id=slot_id,
+            rule_id=rule_id,
+            occurrence_start=start_time,
+            idempotency_key=idempotency_key,
+            fingerprint=fingerprint,
+        )
+    except exception.IdempotencyKeyConflictException:
+        # a concurrent retry with the same key won the race; replay its
+        # response, or report the conflict if the key is gone again
+        stored = get_stored_response(db, idempotency_key, fingerprint)
+        if stored is None:
+            raise exception.IdempotencyKeyConflictException()
+        return SuccessResponse(data=stored, message="Booking created successfully")
+
     return SuccessResponse(data=booking, message="Booking created successfully")
 
 
+@router.post(
+    "/holds",
+    response_model=SuccessResponse[SlotHoldResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def create_hold_endpoint(
+    slot_id: int = Query(..., ge=1, description="ID of the available slot to hold"),
+    start_time: Optional[datetime] = Query(
+        None, description="Start of the unit to hold, defaults to the first free one"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Reserve a unit of the slot while the client checks out. Pass the returned
+    token as hold_token when creating the booking.
+    """
+    hold = create_hold(db=db, slot_id=slot_id, start_time=start_time)
+    data = SlotHoldResponse(
+        token=hold.token,
+        slot_id=hold.slot_id,
+        start_time=hold.start_time,
+        end_time=hold.start_time + timedelta(minutes=hold.duration_minutes),
+        expires_at=hold.expires_at,
+    )
+    return SuccessResponse(data=data, message="Slot held successfully")
+
+
+@router.delete(
+    "/holds/{token}",
+    response_model=SuccessResponse[None],
+    status_code=status.HTTP_200_OK,
+)
+def release_hold_endpoint(token: str, db: Session = Depends(get_db)):
+    """
+    Give a held unit back before the hold expires.
+    """
+    release_hold(db=db, token=token)
+
+    return SuccessResponse(data=None, message="Hold released successfully")
+
+
 @router.put(
     "/update/{booking_id}",
     response_model=SuccessResponse[BookingResponse],
@@ -83,3 +251,28 @@ def update_booking_endpoint(
         data=booking_data,
     )
     return SuccessResponse(data=updated_booking, message="Booking updated successfully")
+
+
+@router.put(
+    "/bulk",
+    response_model=SuccessResponse[list[BulkBookingResult]],
+    status_code=status.HTTP_200_OK,
+)
+def update_bookings_bulk_endpoint(
+    current_user: CurrentUser,
+    data: BookingBulkUpdate,
+    db: Session = Depends(get_db),
+):
+    """
+    Confirm, cancel or complete many bookings at once. Transitions that are
+    not allowed are reported per item instead of failing the whole request.
+    """
+    results = update_bookings_bulk(
+        db=db, freelancer_id=current_user.id, items=data.items
+    )
+    updated = sum(result.updated for result in results)
+
+    return SuccessResponse(
+        data=results,
+        message=f"{updated} of {len(results)} bookings updated",
+    )
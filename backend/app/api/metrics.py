@@ -0,0 +1,20 @@
+from fastapi import APIRouter, status
+
+from app.core.metrics import metrics
+from app.schema.response import SuccessResponse
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=SuccessResponse[dict],
+    status_code=status.HTTP_200_OK,
+)
+def get_metrics():
+    """
+    Counters of this worker process, e.g. cache hits and misses.
+    """
+    return SuccessResponse(
+        data=metrics.snapshot(), message="Metrics retrieved successfully"
+    )
@@ -0,0 +1,42 @@
+import asyncio
+import logging
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTasks:
+    """
+    Blocking jobs run on a fixed interval from the app's event loop. Each
+    run happens in a worker thread so requests are never held up.
+    """
+
+    def __init__(self):
+        self._jobs: list[tuple[str, float, Callable[[], object]]] = []
+        self._tasks: list[asyncio.Task] = []
+
+    def register(self, name: str, interval: float, job: Callable[[], object]):
+        self._jobs.append((name, interval, job))
+
+    def start(self):
+        self._tasks = [
+            asyncio.create_task(self._run(name, interval, job), name=name)
+            for name, interval, job in self._jobs
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, name: str, interval: float, job: Callable[[], object]):
+        while True:
+            try:
+                await asyncio.to_thread(job)
+            except Exception:
+                logger.exception("Background job %s failed", name)
+            await asyncio.sleep(interval)
+
+
+periodic_tasks = PeriodicTasks()
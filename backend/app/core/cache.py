@@ -0,0 +1,189 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class CacheBackend(ABC):
+    """
+    Key/value store behind a ReadThroughCache. Values are JSON strings so
+    that a store shared between uvicorn workers can hold them as-is.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: int) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> list[Optional[str]]: ...
+
+    @abstractmethod
+    def incr(self, key: str, ttl: int) -> int:
+        """
+        Atomically add one to an integer key, creating it at 1, and return
+        the new value.
+        """
+
+
+class InProcessBackend(CacheBackend):
+    """
+    Bounded LRU with per-entry expiry, local to one worker. Invalidations
+    do not reach other workers, so their copies live until the TTL runs out.
+
+    Counters written by incr() are kept outside the LRU and only expire:
+    evicting a generation would reset it and bring back older values.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._counters: dict[str, tuple[float, int]] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is not None:
+                expires_at, count = counter
+                if expires_at <= time.monotonic():
+                    del self._counters[key]
+                    return None
+                return str(count)
+
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._counters.pop(key, None)
+
+    def get_many(self, keys: list[str]) -> list[Optional[str]]:
+        return [self.get(key) for key in keys]
+
+    def incr(self, key: str, ttl: int) -> int:
+        with self._lock:
+            now = time.monotonic()
+            if len(self._counters) >= self._max_entries:
+                self._counters = {
+                    name: counter
+                    for name, counter in self._counters.items()
+                    if counter[0] > now
+                }
+            counter = self._counters.get(key)
+            value = 1
+            if counter is not None and counter[0] > now:
+                value = counter[1] + 1
+            self._counters[key] = (now + ttl, value)
+            return value
+
+
+class RedisBackend(CacheBackend):
+    """
+    Store shared by all workers, so an invalidation is seen everywhere.
+    Needs the optional `redis` package.
+    """
+
+    def __init__(self, url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self._client.set(key, value, ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+    def get_many(self, keys: list[str]) -> list[Optional[str]]:
+        return [
+            value.decode() if value is not None else None
+            for value in self._client.mget(keys)
+        ]
+
+    def incr(self, key: str, ttl: int) -> int:
+        with self._client.pipeline() as pipe:
+            value, _ = pipe.incr(key).expire(key, ttl).execute()
+        return value
+
+
+class ReadThroughCache:
+    """
+    Namespaced read-through cache over a backend, counting hits and misses.
+    Loaders return JSON-serializable values; None results are not cached.
+
+    Each key has a generation that invalidate() bumps, and values are stored
+    with the generation read before loading. A load that raced with a write
+    stores its value under the old generation, so it is never served.
+    Invalidate only after the write has committed.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: int):
+        self._backend = backend
+        self._namespace = namespace
+        self._ttl = ttl
+
+    def get_or_load(self, key, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+        cache_key = f"{self._namespace}:{key}"
+        cached, generation = self._backend.get_many(
+            [cache_key, f"{cache_key}:generation"]
+        )
+        generation = int(generation or 0)
+        if cached is not None:
+            entry = json.loads(cached)
+            if entry["generation"] == generation:
+                metrics.inc(f"cache.{self._namespace}.hit")
+                return entry["value"]
+
+        metrics.inc(f"cache.{self._namespace}.miss")
+        value = loader()
+        if value is not None:
+            self._backend.set(
+                cache_key,
+                json.dumps({"generation": generation, "value": value}),
+                self._ttl,
+            )
+        return value
+
+    def invalidate(self, key) -> None:
+        cache_key = f"{self._namespace}:{key}"
+        # outlives every value stored under an older generation
+        self._backend.incr(f"{cache_key}:generation", self._ttl * 2)
+        self._backend.delete(cache_key)
+
+
+def _make_backend() -> CacheBackend:
+    if settings.CACHE_URL:
+        return RedisBackend(settings.CACHE_URL)
+    return InProcessBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+cache_backend = _make_backend()
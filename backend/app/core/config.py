@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -11,6 +13,70 @@ class Settings(BaseSettings):
     ZOOM_CLIENT_SECRET: str
     SENDGRID_API_KEY: str
     FROM_EMAIL: str
+    SLOT_INDEX_MAX_FREELANCERS: int = 1024
+    RULE_EXPANSION_DAYS: int = 28
+    MAX_AVAILABILITY_WINDOW_DAYS: int = 366
+    FREEBUSY_CACHE_MAX_FREELANCERS: int = 1024
+    BOOKING_DURATION_MINUTES: int = 60
+    BOOKING_BUFFER_MINUTES: int = 0
+    CACHE_URL: Optional[str] = None  # e.g. redis://cache:6379/0, shared by workers
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_TTL_SECONDS: int = 300
+    EMAIL_TRANSPORT: str = "sendgrid"  # "smtp", or "stub" to keep emails in memory
+    EMAIL_TIMEOUT_SECONDS: float = 10
+    EMAIL_POOL_SIZE: int = 4
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_USE_TLS: bool = True
+    TEMPLATE_CACHE_DIR: Optional[str] = None  # Jinja bytecode cache, temp dir if unset
+    RUN_BACKGROUND_TASKS: bool = True  # False when workers run as separate processes
+    OUTBOX_POLL_SECONDS: float = 5
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_RETRY_BASE_SECONDS: int = 30
+    OUTBOX_RETRY_MAX_SECONDS: int = 3600
+    ZOOM_API_BASE_URL: str = "https://api.zoom.us/v2"
+    ZOOM_OAUTH_URL: str = "https://zoom.us/oauth/token"
+    ZOOM_TIMEOUT_SECONDS: float = 10  # read timeout
+    ZOOM_CONNECT_TIMEOUT_SECONDS: float = 3
+    ZOOM_HTTP_POOL_SIZE: int = 10
+    ZOOM_HTTP_MAX_RETRIES: int = 3
+    ZOOM_HTTP_RETRY_BASE_SECONDS: float = 0.5
+    ZOOM_HTTP_RETRY_MAX_SECONDS: float = 10
+    ZOOM_BREAKER_FAILURES: int = 5
+    ZOOM_BREAKER_RESET_SECONDS: float = 30
+    # shared by the workers of one host unless CACHE_URL points at Redis
+    ZOOM_TOKEN_FILE: Optional[str] = None
+    ZOOM_TOKEN_RENEW_BEFORE_SECONDS: float = 300
+    ZOOM_TOKEN_RENEW_POLL_SECONDS: float = 60
+    ZOOM_PROVISION_POLL_SECONDS: float = 2
+    ZOOM_PROVISION_CONCURRENCY: int = 4
+    ZOOM_PROVISION_BATCH_SIZE: int = 20
+    ZOOM_PROVISION_MAX_ATTEMPTS: int = 6
+    # how long a claimed batch is left alone; must outlast a call with retries
+    ZOOM_PROVISION_LEASE_SECONDS: int = 300
+    ZOOM_RETRY_BASE_SECONDS: int = 15
+    ZOOM_RETRY_MAX_SECONDS: int = 900
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_SWEEP_SECONDS: float = 600
+    IDEMPOTENCY_SWEEP_BATCH_SIZE: int = 1000
+    SLOT_HOLD_MINUTES: int = 10
+    SLOT_HOLD_SWEEP_SECONDS: float = 60
+    SLOT_HOLD_SWEEP_BATCH_SIZE: int = 1000
+    BOOKING_LIFECYCLE_SECONDS: float = 300
+    BOOKING_LIFECYCLE_BATCH_SIZE: int = 500
+    NOTIFICATION_DIGEST_POLL_SECONDS: float = 30
+    NOTIFICATION_DIGEST_BATCH_SIZE: int = 100
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    # only enable behind a proxy that sets X-Forwarded-For itself
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+    # proxies of ours in front of the app, each appending to X-Forwarded-For
+    RATE_LIMIT_PROXY_HOPS: int = 1
+    # /api/v1/metrics is unauthenticated; only enable it on a private network
+    METRICS_ENABLED: bool = False
 
     class Config:
         env_file = ".env"
@@ -1,20 +1,213 @@
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+import re
+import smtplib
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+
 from app.core.config import settings
 
 
-def send_email(to_email: str, subject: str, html_content: str):
-    message = Mail(
-        from_email=settings.FROM_EMAIL,
-        to_emails=to_email,
-        subject=subject,
-        html_content=html_content,
-    )
-
-    try:
-        sg = SendGridAPIClient(settings.SENDGRID_API_KEY)
-        response = sg.send(message)
-        return response.status_code
-    except Exception as e:
-        print("SendGrid error:", e)
-        return None
+@dataclass
+class Recipient:
+    to_email: str
+    subject: str
+    # placeholder -> value, filled into the shared body for this recipient
+    substitutions: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class EmailBatch:
+    """
+    One body shared by several recipients, each with their own subject and
+    substitutions.
+    """
+
+    html_content: str
+    recipients: list[Recipient]
+
+
+def apply_substitutions(html_content: str, substitutions: dict[str, str]) -> str:
+    if not substitutions:
+        return html_content
+    # one pass, so a value is never substituted again
+    pattern = re.compile("|".join(map(re.escape, substitutions)))
+    return pattern.sub(lambda match: substitutions[match.group(0)], html_content)
+
+
+class EmailTransport:
+    """
+    Delivers rendered emails. Raises on failure so the outbox can retry.
+    """
+
+    def send(self, to_email: str, subject: str, html_content: str) -> None:
+        raise NotImplementedError
+
+    def send_batch(self, batch: EmailBatch) -> list[Exception | None]:
+        """
+        Deliver every recipient of the batch and return one error (or None)
+        per recipient. Transports with a bulk API override this.
+        """
+        errors = []
+        for recipient in batch.recipients:
+            try:
+                self.send(
+                    recipient.to_email,
+                    recipient.subject,
+                    apply_substitutions(batch.html_content, recipient.substitutions),
+                )
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+
+class SendGridTransport(EmailTransport):
+    """
+    Talks to the SendGrid v3 API over one pooled keep-alive session. A batch
+    goes out as a single call with one personalization per recipient.
+    """
+
+    API_URL = "https://api.sendgrid.com/v3/mail/send"
+    MAX_PERSONALIZATIONS = 1000
+
+    def __init__(
+        self,
+        api_key: str,
+        from_email: str,
+        timeout: float = settings.EMAIL_TIMEOUT_SECONDS,
+        pool_size: int = settings.EMAIL_POOL_SIZE,
+    ):
+        self._from_email = from_email
+        self._timeout = timeout
+        self._session = requests.Session()
+        self._session.headers["Authorization"] = f"Bearer {api_key}"
+        self._session.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+
+    def send(self, to_email: str, subject: str, html_content: str) -> None:
+        self._post(html_content, [{"to": [{"email": to_email}], "subject": subject}])
+
+    def send_batch(self, batch: EmailBatch) -> list[Exception | None]:
+        errors = []
+        recipients = batch.recipients
+        for i in range(0, len(recipients), self.MAX_PERSONALIZATIONS):
+            chunk = recipients[i : i + self.MAX_PERSONALIZATIONS]
+            personalizations = [
+                {
+                    "to": [{"email": recipient.to_email}],
+                    "subject": recipient.subject,
+                    "substitutions": recipient.substitutions,
+                }
+                for recipient in chunk
+            ]
+            try:
+                self._post(batch.html_content, personalizations)
+                errors.extend([None] * len(chunk))
+            except Exception as e:
+                errors.extend([e] * len(chunk))
+        return errors
+
+    def _post(self, html_content: str, personalizations: list[dict]) -> None:
+        response = self._session.post(
+            self.API_URL,
+            json={
+                "personalizations": personalizations,
+                "from": {"email": self._from_email},
+                "content": [{"type": "text/html", "value": html_content}],
+            },
+            timeout=self._timeout,
+        )
+        if response.status_code >= 300:
+            raise RuntimeError(
+                f"SendGrid returned {response.status_code}: {response.text[:200]}"
+            )
+
+
+class SmtpTransport(EmailTransport):
+    """
+    Sends through an SMTP relay over one connection that is kept open and
+    reopened when the server drops it.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        from_email: str,
+        username: str | None = None,
+        password: str | None = None,
+        use_tls: bool = True,
+        timeout: float = settings.EMAIL_TIMEOUT_SECONDS,
+    ):
+        self._host = host
+        self._port = port
+        self._from_email = from_email
+        self._username = username
+        self._password = password
+        self._use_tls = use_tls
+        self._timeout = timeout
+        self._connection: smtplib.SMTP | None = None
+        self._lock = Lock()
+
+    def send(self, to_email: str, subject: str, html_content: str) -> None:
+        message = EmailMessage()
+        message["From"] = self._from_email
+        message["To"] = to_email
+        message["Subject"] = subject
+        message.set_content(html_content, subtype="html")
+
+        with self._lock:
+            try:
+                self._connect().send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                # the relay closed the idle connection, retry once on a new one
+                self._connection = None
+                self._connect().send_message(message)
+
+    def _connect(self) -> smtplib.SMTP:
+        if self._connection is None:
+            connection = smtplib.SMTP(self._host, self._port, timeout=self._timeout)
+            if self._use_tls:
+                connection.starttls()
+            if self._username:
+                connection.login(self._username, self._password or "")
+            self._connection = connection
+        return self._connection
+
+
+class StubTransport(EmailTransport):
+    """
+    Keeps emails in memory instead of sending them, for local runs, tests
+    and load tests.
+    """
+
+    def __init__(self):
+        self.sent: list[tuple[str, str, str]] = []
+        self.batches = 0
+        self._lock = Lock()
+
+    def send(self, to_email: str, subject: str, html_content: str) -> None:
+        with self._lock:
+            self.sent.append((to_email, subject, html_content))
+
+    def send_batch(self, batch: EmailBatch) -> list[Exception | None]:
+        with self._lock:
+            self.batches += 1
+        return super().send_batch(batch)
+
+
+def get_email_transport() -> EmailTransport:
+    if settings.EMAIL_TRANSPORT == "stub":
+        return StubTransport()
+    if settings.EMAIL_TRANSPORT == "smtp":
+        return SmtpTransport(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            settings.FROM_EMAIL,
+            username=settings.SMTP_USERNAME,
+            password=settings.SMTP_PASSWORD,
+            use_tls=settings.SMTP_USE_TLS,
+        )
+    return SendGridTransport(settings.SENDGRID_API_KEY, settings.FROM_EMAIL)
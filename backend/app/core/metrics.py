@@ -0,0 +1,71 @@
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import accumulate
+from threading import Lock
+
+# upper bounds in milliseconds, the last bucket catches everything slower
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{bound:g}" for bound in self.buckets] + ["le_inf"]
+        return {
+            # cumulative, like Prometheus: le_100 counts everything <= 100
+            "buckets": dict(zip(labels, accumulate(self.counts))),
+            "count": sum(self.counts),
+            "sum": round(self.total, 3),
+        }
+
+
+class Metrics:
+    """
+    Per-process counters, gauges and latency histograms, read through the
+    /metrics endpoint for tuning.
+    """
+
+    def __init__(self):
+        self._counters: defaultdict[str, int] = defaultdict(int)
+        self._gauges: dict[str, float] = {}
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = Lock()
+
+    def inc(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(
+        self, name: str, value: float, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS
+    ):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(buckets)
+            histogram.observe(value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "gauges": dict(sorted(self._gauges.items())),
+                "histograms": {
+                    name: histogram.snapshot()
+                    for name, histogram in sorted(self._histograms.items())
+                },
+            }
+
+
+metrics = Metrics()
@@ -0,0 +1,291 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from fastapi.responses import JSONResponse
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.schema.error import ErrorDetail, ErrorResponse
+
+
+class TokenBucketStore(ABC):
+    """
+    Holds one token bucket per key. take() is given every bucket a request
+    draws from as (key, capacity, refill_per_second) and returns the seconds
+    to wait for each, 0 when it has a token. Tokens are spent from all of
+    them only when none is empty, so a rejected request costs nothing.
+    """
+
+    @abstractmethod
+    async def take(self, buckets: list[tuple[str, int, float]]) -> list[float]: ...
+
+
+class InProcessTokenBucketStore(TokenBucketStore):
+    """
+    Buckets local to one worker, so each worker enforces the full budget.
+    The least recently used buckets are dropped beyond max_keys.
+    """
+
+    def __init__(self, max_keys: int):
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    async def take(self, buckets: list[tuple[str, int, float]]) -> list[float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens = []
+            waits = []
+            for key, capacity, refill_per_second in buckets:
+                left, updated_at = self._buckets.pop(key, (capacity, now))
+                left = min(capacity, left + (now - updated_at) * refill_per_second)
+                tokens.append(left)
+                waits.append(0.0 if left >= 1 else (1 - left) / refill_per_second)
+            spend = 0 if any(waits) else 1
+            for (key, _, _), left in zip(buckets, tokens):
+                self._buckets[key] = (left - spend, now)
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+            return waits
+
+
+_TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local tokens = {}
+local ttls = {}
+local waits = {}
+local blocked = false
+for i, key in ipairs(KEYS) do
+  local capacity = tonumber(ARGV[2 * i])
+  local rate = tonumber(ARGV[2 * i + 1])
+  local state = redis.call('HMGET', key, 'tokens', 'ts')
+  local left = tonumber(state[1]) or capacity
+  local ts = tonumber(state[2]) or now
+  left = math.min(capacity, left + (now - ts) * rate)
+  tokens[i] = left
+  ttls[i] = math.ceil(capacity / rate)
+  waits[i] = '0'
+  if left < 1 then
+    waits[i] = tostring((1 - left) / rate)
+    blocked = true
+  end
+end
+for i, key in ipairs(KEYS) do
+  local left = tokens[i]
+  if not blocked then left = left - 1 end
+  redis.call('HSET', key, 'tokens', left, 'ts', now)
+  redis.call('EXPIRE', key, ttls[i])
+end
+return waits
+"""
+
+
+class RedisTokenBucketStore(TokenBucketStore):
+    """
+    Buckets shared by all workers, updated atomically by a Lua script over
+    the async client so the event loop never waits on Redis.
+    Needs the optional `redis` package.
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio
+
+        self._take = redis.asyncio.Redis.from_url(url).register_script(_TAKE_SCRIPT)
+
+    async def take(self, buckets: list[tuple[str, int, float]]) -> list[float]:
+        args = [time.time()]
+        for _, capacity, refill_per_second in buckets:
+            args += [capacity, refill_per_second]
+        waits = await self._take(
+            keys=[f"rate_limit:{key}" for key, _, _ in buckets], args=args
+        )
+        return [float(wait) for wait in waits]
+
+
+@dataclass(frozen=True)
+class Budget:
+    # "ip", "email" (from the JSON body) or "slot" (from the query string)
+    key: str
+    capacity: int
+    per_seconds: int
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.per_seconds
+
+
+ROUTE_BUDGETS: dict[tuple[str, str], list[Budget]] = {
+    ("POST", "/api/v1/auth/login"): [
+        Budget("ip", capacity=20, per_seconds=60),
+        Budget("email", capacity=5, per_seconds=60),
+    ],
+    ("POST", "/api/v1/auth/signup"): [
+        Budget("ip", capacity=10, per_seconds=3600),
+    ],
+    ("POST", "/api/v1/bookings/create"): [
+        Budget("ip", capacity=30, per_seconds=60),
+        Budget("email", capacity=10, per_seconds=600),
+        Budget("slot", capacity=20, per_seconds=60),
+    ],
+    ("POST", "/api/v1/bookings/holds"): [
+        Budget("ip", capacity=30, per_seconds=60),
+        Budget("slot", capacity=20, per_seconds=60),
+    ],
+}
+
+# request bodies larger than this are not parsed for an email key
+MAX_INSPECTED_BODY = 16 * 1024
+
+
+class RateLimitMiddleware:
+    """
+    Token-bucket rate limiting for the public write routes.
+
+    Runs as plain ASGI middleware in front of routing, so a rejected request
+    costs a few dictionary lookups and never opens a DB session. Requests
+    with an email budget have their body buffered, inspected and replayed.
+    """
+
+    def __init__(
+        self,
+        app,
+        store: TokenBucketStore,
+        budgets: dict[tuple[str, str], list[Budget]] = ROUTE_BUDGETS,
+    ):
+        self.app = app
+        self.store = store
+        self.budgets = budgets
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        method, path = scope["method"], scope["path"].rstrip("/")
+        budgets = self.budgets.get((method, path))
+        if not budgets:
+            return await self.app(scope, receive, send)
+
+        body = None
+        if any(budget.key == "email" for budget in budgets):
+            body, receive = await _buffer_body(receive)
+
+        keyed = []
+        for budget in budgets:
+            value = _key_value(budget.key, scope, body)
+            if value is not None:
+                keyed.append((budget, f"{method}:{path}:{budget.key}:{value}"))
+        if keyed:
+            waits = await self.store.take(
+                [
+                    (key, budget.capacity, budget.refill_per_second)
+                    for budget, key in keyed
+                ]
+            )
+            # the longest wait is the earliest a retry can get through
+            wait, budget = max(
+                zip(waits, (budget for budget, _ in keyed)), key=lambda w: w[0]
+            )
+            if wait > 0:
+                metrics.inc(f"rate_limit.rejected.{budget.key}")
+                response = _too_many_requests(budget.key, wait)
+                return await response(scope, receive, send)
+
+        return await self.app(scope, receive, send)
+
+
+async def _buffer_body(receive):
+    chunks = []
+    size = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message)
+        size += len(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        if size > MAX_INSPECTED_BODY:
+            break
+
+    body = None
+    if not more_body:
+        body = b"".join(message.get("body", b"") for message in chunks)
+
+    async def replay():
+        if chunks:
+            return chunks.pop(0)
+        return await receive()
+
+    return body, replay
+
+
+def _key_value(key: str, scope, body: Optional[bytes]) -> Optional[str]:
+    if key == "ip":
+        if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+            forwarded = _forwarded_for(scope)
+            if forwarded:
+                return forwarded
+        client = scope.get("client")
+        return client[0] if client else None
+
+    if key == "email":
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            return None
+        if not isinstance(payload, dict):
+            return None
+        email = payload.get("email") or payload.get("client_email")
+        return email.strip().lower() if isinstance(email, str) else None
+
+    if key == "slot":
+        query = dict(parse_qsl(scope["query_string"].decode()))
+        if "slot_id" in query:
+            return f"slot:{query['slot_id']}"
+        if "rule_id" in query:
+            return f"rule:{query['rule_id']}"
+        return None
+
+    raise ValueError(f"Unknown rate limit key {key!r}")
+
+
+def _forwarded_for(scope) -> Optional[str]:
+    """
+    The client address as seen by the outermost trusted proxy: the entry
+    RATE_LIMIT_PROXY_HOPS from the right of X-Forwarded-For. Entries left of
+    it are whatever the client sent and cannot be trusted.
+    """
+    entries = [
+        entry.strip()
+        for name, value in scope["headers"]
+        if name == b"x-forwarded-for"
+        for entry in value.decode("latin-1").split(",")
+    ]
+    entries = [entry for entry in entries if entry]
+    if not entries:
+        return None
+    return entries[-min(settings.RATE_LIMIT_PROXY_HOPS, len(entries))]
+
+
+def _too_many_requests(key: str, wait: float) -> JSONResponse:
+    message = "Too many requests, please try again later"
+    return JSONResponse(
+        status_code=HTTP_429_TOO_MANY_REQUESTS,
+        content=ErrorResponse(
+            message=message,
+            details=[
+                ErrorDetail(code="rate_limit.exceeded", message=message, target=key)
+            ],
+        ).model_dump(),
+        headers={"Retry-After": str(max(1, round(wait)))},
+    )
+
+
+def get_rate_limit_store() -> TokenBucketStore:
+    if settings.CACHE_URL:
+        return RedisTokenBucketStore(settings.CACHE_URL)
+    return InProcessTokenBucketStore(max_keys=settings.RATE_LIMIT_MAX_KEYS)
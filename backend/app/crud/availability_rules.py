@@ -0,0 +1,236 @@
+import heapq
+from datetime import datetime, time, timedelta
+from typing import Iterator
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.availability import (
+    AvailableSlot,
+    AvailabilityRule,
+    AvailabilityRuleExclusion,
+)
+from app.schema.availability_rules import AvailabilityRuleCreate, RuleExclusionCreate
+from app.schema.available_slots import AvailableSlotResponse
+from app.core.config import settings
+from app.exceptions import exception
+from app.crud.freelancer import bump_availability_version
+from app.services.freebusy import freebusy_cache
+from app.services.slot_index import normalize_time
+from app.utils.recurrence import (
+    expand_rule,
+    subtract_intervals,
+    weekdays_to_mask,
+)
+
+# pieces left over after subtracting busy time must still hold a booking
+MIN_OCCURRENCE_LENGTH = timedelta(minutes=settings.BOOKING_DURATION_MINUTES)
+
+
+def create_availability_rule(
+    db: Session, data: AvailabilityRuleCreate, freelancer_id: int
+) -> AvailabilityRule:
+    rule = AvailabilityRule(
+        freelancer_id=freelancer_id,
+        weekdays=weekdays_to_mask(data.weekdays),
+        start_time=data.start_time,
+        end_time=data.end_time,
+        valid_from=data.valid_from,
+        valid_until=data.valid_until,
+        interval_weeks=data.interval_weeks,
+    )
+
+    try:
+        db.add(rule)
+        bump_availability_version(db, freelancer_id)
+        db.commit()
+        db.refresh(rule)
+        freebusy_cache.invalidate(freelancer_id)
+        return rule
+    except SQLAlchemyError:
+        db.rollback()
+        raise exception.AppException(
+            message="Failed to create availability rule",
+            code="rule.creation_error",
+            target="database",
+            status_code=500,
+        )
+
+
+def get_availability_rules(db: Session, freelancer_id: int) -> list[AvailabilityRule]:
+    return (
+        db.query(AvailabilityRule)
+        .filter(AvailabilityRule.freelancer_id == freelancer_id)
+        .order_by(AvailabilityRule.id)
+        .all()
+    )
+
+
+def get_own_availability_rule(
+    db: Session, rule_id: int, freelancer_id: int
+) -> AvailabilityRule:
+    rule = db.query(AvailabilityRule).filter(AvailabilityRule.id == rule_id).first()
+    if not rule:
+        raise exception.AppException(
+            message="Availability rule not found",
+            code="rule.not_found",
+            target="rule_id",
+            status_code=404,
+        )
+    if rule.freelancer_id != freelancer_id:
+        raise exception.AppException(
+            message="You do not have permission to modify this rule",
+            code="rule.permission_denied",
+            target="freelancer_id",
+            status_code=403,
+        )
+    return rule
+
+
+def delete_availability_rule(db: Session, rule_id: int, freelancer_id: int) -> None:
+    rule = get_own_availability_rule(db, rule_id, freelancer_id)
+    try:
+        db.delete(rule)
+        bump_availability_version(db, freelancer_id)
+        db.commit()
+        freebusy_cache.invalidate(freelancer_id)
+    except SQLAlchemyError:
+        db.rollback()
+        raise exception.AppException(
+            message="Failed to delete availability rule",
+            code="rule.deletion_error",
+            target="database",
+            status_code=500,
+        )
+
+
+def add_rule_exclusion(
+    db: Session, rule_id: int, freelancer_id: int, data: RuleExclusionCreate
+) -> AvailabilityRuleExclusion:
+    rule = get_own_availability_rule(db, rule_id, freelancer_id)
+    exclusion = AvailabilityRuleExclusion(
+        rule_id=rule.id, start_time=data.start_time, end_time=data.end_time
+    )
+
+    try:
+        db.add(exclusion)
+        bump_availability_version(db, freelancer_id)
+        db.commit()
+        db.refresh(exclusion)
+        freebusy_cache.invalidate(freelancer_id)
+        return exclusion
+    except SQLAlchemyError:
+        db.rollback()
+        raise exception.AppException(
+            message="Failed to add rule exclusion",
+            code="rule.exclusion_error",
+            target="database",
+            status_code=500,
+        )
+
+
+def expand_rule_availability(
+    db: Session, freelancer_id: int, window_start: datetime, window_end: datetime
+) -> Iterator[AvailableSlotResponse]:
+    """
+    Yield the free occurrences of a freelancer's rules inside the window,
+    ordered by start time.
+
+    Each rule is expanded lazily minus its exclusions, the rule streams are
+    merged in start order, and concrete slot rows (including occurrences
+    materialized by a booking) are subtracted so nothing is listed twice.
+    Occurrences of overlapping rules are kept apart, so each one carries the
+    rule it can be booked through.
+    """
+    window_start = normalize_time(window_start)
+    window_end = normalize_time(window_end)
+
+    rules = (
+        db.query(AvailabilityRule)
+        .options(selectinload(AvailabilityRule.exclusions))
+        .filter(
+            AvailabilityRule.freelancer_id == freelancer_id,
+            AvailabilityRule.valid_from <= window_end.date(),
+            or_(
+                AvailabilityRule.valid_until.is_(None),
+                AvailabilityRule.valid_until >= window_start.date(),
+            ),
+        )
+        .all()
+    )
+    if not rules:
+        return
+
+    busy = (
+        db.query(AvailableSlot.start_time, AvailableSlot.end_time)
+        .filter(
+            AvailableSlot.freelancer_id == freelancer_id,
+            AvailableSlot.end_time > window_start,
+            AvailableSlot.start_time < window_end,
+        )
+        .order_by(AvailableSlot.start_time)
+        .all()
+    )
+
+    streams = [
+        subtract_intervals(
+            expand_rule(rule, window_start, window_end),
+            [(item.start_time, item.end_time) for item in rule.exclusions],
+        )
+        for rule in rules
+    ]
+    free = subtract_intervals(heapq.merge(*streams), busy)
+
+    for start, end, rule_id in free:
+        if end - start < MIN_OCCURRENCE_LENGTH:
+            continue
+        yield AvailableSlotResponse(
+            freelancer_id=freelancer_id,
+            start_time=start,
+            end_time=end,
+            is_booked=False,
+            rule_id=rule_id,
+        )
+
+
+def materialize_rule_occurrence(
+    db: Session, rule_id: int, start_time: datetime
+) -> AvailableSlot:
+    """
+    Turn a free rule occurrence into a concrete slot row at booking time.
+
+    The row is only flushed; the caller commits it together with the booking
+    and handles the exclusion constraint firing on a concurrent booking.
+    """
+    rule = db.query(AvailabilityRule).filter(AvailabilityRule.id == rule_id).first()
+    if not rule:
+        raise exception.AppException(
+            message="Availability rule not found",
+            code="rule.not_found",
+            target="rule_id",
+            status_code=404,
+        )
+
+    start_time = normalize_time(start_time)
+    day_start = datetime.combine(start_time.date(), time.min)
+    for occurrence in expand_rule_availability(
+        db, rule.freelancer_id, day_start, day_start + timedelta(days=1)
+    ):
+        if occurrence.rule_id == rule_id and occurrence.start_time == start_time:
+            slot = AvailableSlot(
+                freelancer_id=rule.freelancer_id,
+                start_time=occurrence.start_time,
+                end_time=occurrence.end_time,
+                is_booked=False,
+            )
+            db.add(slot)
+            db.flush()
+            return slot
+
+    raise exception.AppException(
+        message="This occurrence is not available",
+        code="rule.occurrence_unavailable",
+        target="start_time",
+        status_code=409,
+    )
@@ -1,31 +1,96 @@
-from sqlalchemy import func, literal
+import heapq
+from datetime import date, datetime, time, timedelta
+from itertools import groupby, islice
+
+from sqlalchemy import func, insert, select, true, tuple_, union_all
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.schema.available_slots import (
     AvailableSlotCreate,
     AvailableSlotUpdate,
+    AvailableSlotResponse,
+    BulkSlotResult,
+    FreeFreelancerResult,
     SlotResWithFreelancer,
 )
-from app.models.availability import AvailableSlot
+from app.schema.error import ErrorDetail
+from app.models.availability import AvailableSlot, SlotHold
 from app.models.freelancer import Freelancer
+from app.models.bookings import Booking, UNIT_TAKING_STATUSES
 from app.exceptions import exception
-from app.crud.freelancer import get_freelancer_by_id
+from app.crud.freelancer import (
+    bump_availability_version,
+    get_availability_version,
+    get_freelancer_by_id,
+    get_freelancer_contact,
+)
+from app.crud.availability_rules import expand_rule_availability
+from app.utils.recurrence import merge_intervals, subtract_intervals
+from app.core.cache import ReadThroughCache, cache_backend
+from app.core.config import settings
+from app.services.freebusy import (
+    BYTES_PER_DAY,
+    freebusy_cache,
+    rasterize,
+)
+from app.services.slot_carving import carver
+from app.services.slot_index import (
+    SlotIntervalIndex,
+    normalize_time,
+    slot_index_cache,
+)
 
+# SQLSTATE raised by the available_slots_no_overlap exclusion constraint
+EXCLUSION_VIOLATION = "23P01"
+# SQLSTATE raised by unique indexes such as bookings_confirmed_unit
+UNIQUE_VIOLATION = "23505"
 
-def create_available_slot(
-    db: Session, data: AvailableSlotCreate, freelancer_id: int
-) -> AvailableSlot:
-    overlapping_slot = (
-        db.query(AvailableSlot)
+slot_cache = ReadThroughCache(cache_backend, "slot", settings.CACHE_TTL_SECONDS)
+
+
+def is_overlap_violation(error: IntegrityError) -> bool:
+    return getattr(error.orig, "pgcode", None) == EXCLUSION_VIOLATION
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    return getattr(error.orig, "pgcode", None) == UNIQUE_VIOLATION
+
+
+def _reject_overlap(
+    db: Session,
+    freelancer_id: int,
+    start_time,
+    end_time,
+    exclude_slot_id: int | None = None,
+) -> None:
+    # Early rejection from the freelancer's slot index, built on the first
+    # write and kept in sync afterwards. The exclusion constraint stays the
+    # source of truth: another worker may have moved or deleted the slot the
+    # index found, so a hit is confirmed against that one row first.
+    start_time, end_time = normalize_time(start_time), normalize_time(end_time)
+    overlap = slot_index_cache.get(db, freelancer_id).find_overlap(
+        start_time, end_time, exclude_slot_id
+    )
+    if overlap is None:
+        return
+    still_overlaps = (
+        db.query(AvailableSlot.id)
         .filter(
-            AvailableSlot.freelancer_id == freelancer_id,
-            AvailableSlot.end_time > data.start_time,
-            AvailableSlot.start_time < data.end_time,
+            AvailableSlot.id == overlap,
+            AvailableSlot.end_time > start_time,
+            AvailableSlot.start_time < end_time,
         )
         .first()
     )
-    if overlapping_slot:
+    if still_overlaps:
         raise exception.TimeSlotConflictException()
+    slot_index_cache.invalidate(freelancer_id)
+
+
+def create_available_slot(
+    db: Session, data: AvailableSlotCreate, freelancer_id: int
+) -> AvailableSlot:
+    _reject_overlap(db, freelancer_id, data.start_time, data.end_time)
 
     new_slot = AvailableSlot(
         freelancer_id=freelancer_id,
@@ -36,9 +101,25 @@ def create_available_slot(
 
     try:
         db.add(new_slot)
+        bump_availability_version(db, freelancer_id)
         db.commit()
         db.refresh(new_slot)
+        slot_index_cache.add(
+            freelancer_id, new_slot.id, new_slot.start_time, new_slot.end_time
+        )
+        freebusy_cache.invalidate(freelancer_id)
         return new_slot
+    except IntegrityError as e:
+        db.rollback()
+        if is_overlap_violation(e):
+            slot_index_cache.invalidate(freelancer_id)
+            raise exception.TimeSlotConflictException()
+        raise exception.AppException(
+            message="Failed to create available slot",
+            code="slot.creation_error",
+            target="database",
+            status_code=500,
+        )
     except SQLAlchemyError as e:
         db.rollback()
         raise exception.AppException(
@@ -49,7 +130,134 @@ def create_available_slot(
         )
 
 
-def get_available_slots(db: Session, freelancer_id: int) -> list[AvailableSlot]:
+def create_available_slots_bulk(
+    db: Session, items: list[AvailableSlotCreate], freelancer_id: int
+) -> list[BulkSlotResult]:
+    """
+    Create many slots in one transaction, reporting the outcome per item.
+
+    Items conflicting with existing slots or with an earlier item of the same
+    batch are skipped; the rest are written with a single multi-row INSERT.
+    """
+    results: list[BulkSlotResult | None] = [None] * len(items)
+    spans = [
+        (normalize_time(item.start_time), normalize_time(item.end_time), position)
+        for position, item in enumerate(items)
+    ]
+    spans.sort()
+
+    # one range query covering the whole batch instead of one per item
+    existing = SlotIntervalIndex(
+        db.query(AvailableSlot.id, AvailableSlot.start_time, AvailableSlot.end_time)
+        .filter(
+            AvailableSlot.freelancer_id == freelancer_id,
+            AvailableSlot.end_time > spans[0][0],
+            AvailableSlot.start_time < max(end for _, end, _ in spans),
+        )
+        .all()
+    )
+
+    accepted = []
+    last_end = None
+    for start, end, position in spans:
+        if existing.find_overlap(start, end) is not None:
+            error = ErrorDetail(
+                code="timeslot.conflict",
+                message="This time slot overlaps with an existing available slot.",
+                target=f"slots.{position}",
+            )
+        elif last_end is not None and start < last_end:
+            error = ErrorDetail(
+                code="timeslot.batch_conflict",
+                message="This time slot overlaps with another slot in this request.",
+                target=f"slots.{position}",
+            )
+        else:
+            accepted.append(position)
+            last_end = end
+            continue
+        results[position] = BulkSlotResult(index=position, created=False, error=error)
+
+    if accepted:
+        rows = [
+            {
+                "freelancer_id": freelancer_id,
+                "start_time": items[position].start_time,
+                "end_time": items[position].end_time,
+                "is_booked": False,
+            }
+            for position in accepted
+        ]
+        try:
+            created = db.execute(
+                insert(AvailableSlot)
+                .returning(
+                    AvailableSlot.id,
+                    AvailableSlot.start_time,
+                    AvailableSlot.end_time,
+                    sort_by_parameter_order=True,
+                ),
+                rows,
+            ).all()
+            bump_availability_version(db, freelancer_id)
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if is_overlap_violation(e):
+                # a concurrent write took one of the intervals; nothing was stored
+                slot_index_cache.invalidate(freelancer_id)
+                raise exception.TimeSlotConflictException()
+            raise exception.AppException(
+                message="Failed to create available slots",
+                code="slot.creation_error",
+                target="database",
+                status_code=500,
+            )
+        except SQLAlchemyError:
+            db.rollback()
+            raise exception.AppException(
+                message="Failed to create available slots",
+                code="slot.creation_error",
+                target="database",
+                status_code=500,
+            )
+
+        freebusy_cache.invalidate(freelancer_id)
+        for position, (slot_id, start_time, end_time) in zip(accepted, created):
+            slot_index_cache.add(freelancer_id, slot_id, start_time, end_time)
+            results[position] = BulkSlotResult(
+                index=position,
+                created=True,
+                slot=AvailableSlotResponse(
+                    id=slot_id,
+                    freelancer_id=freelancer_id,
+                    start_time=start_time,
+                    end_time=end_time,
+                    is_booked=False,
+                ),
+            )
+
+    return results
+
+
+def get_available_slots(
+    db: Session,
+    freelancer_id: int,
+    window_start: datetime,
+    window_end: datetime,
+    only_free: bool = False,
+    after: tuple[datetime, int] | None = None,
+    limit: int = 50,
+) -> tuple[list[AvailableSlot | AvailableSlotResponse], tuple[datetime, int] | None]:
+    """
+    Return one page of a freelancer's availability inside the window, ordered
+    by (start_time, id), together with the keyset position of the next page.
+
+    Concrete slots come from the (freelancer_id, start_time) index and are
+    merged with the free occurrences of the freelancer's recurring rules.
+    Occurrences have no id and are keyed by their negated rule id instead, so
+    they sort before a concrete slot with the same start.
+    """
     # Ensure the freelancer exists
     freelancer = get_freelancer_by_id(db, freelancer_id)
     if not freelancer:
@@ -60,13 +268,254 @@ def get_available_slots(db: Session, freelancer_id: int) -> list[AvailableSlot]:
             status_code=404,
         )
 
+    window_start = normalize_time(window_start)
+    window_end = normalize_time(window_end)
+    if window_end <= window_start or window_end - window_start > timedelta(
+        days=settings.MAX_AVAILABILITY_WINDOW_DAYS
+    ):
+        raise exception.AppException(
+            message=(
+                "The time window must be positive and at most "
+                f"{settings.MAX_AVAILABILITY_WINDOW_DAYS} days long"
+            ),
+            code="availability.invalid_window",
+            target="to",
+            status_code=400,
+        )
+
+    query = db.query(AvailableSlot).filter(
+        AvailableSlot.freelancer_id == freelancer_id,
+        AvailableSlot.end_time > window_start,
+        AvailableSlot.start_time < window_end,
+    )
+    if only_free:
+        query = query.filter(AvailableSlot.is_booked.is_(False))
+    if after is not None:
+        query = query.filter(
+            tuple_(AvailableSlot.start_time, AvailableSlot.id) > tuple_(*after)
+        )
     slots = (
-        db.query(AvailableSlot)
-        .filter(AvailableSlot.freelancer_id == freelancer_id)
+        query.order_by(AvailableSlot.start_time, AvailableSlot.id)
+        .limit(limit + 1)
+        .all()
+    )
+
+    def position(slot):
+        if slot.id is None:
+            # a rule occurrence: its negated rule id keeps it before a concrete
+            # slot with the same start and apart from other rules' occurrences
+            return normalize_time(slot.start_time), -(slot.rule_id or 0)
+        return normalize_time(slot.start_time), slot.id
+
+    # rules only need expanding from where this page starts
+    rule_start = max(window_start, after[0]) if after else window_start
+    occurrences = (
+        occurrence
+        for _, same_start in groupby(
+            expand_rule_availability(db, freelancer_id, rule_start, window_end),
+            key=lambda occurrence: occurrence.start_time,
+        )
+        for occurrence in sorted(same_start, key=position)
+        if after is None or position(occurrence) > after
+    )
+
+    page = list(islice(heapq.merge(slots, occurrences, key=position), limit + 1))
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    return page, position(page[-1])
+
+
+def search_free_freelancers(
+    db: Session,
+    window_start: datetime,
+    window_end: datetime,
+    min_duration: timedelta,
+    after: tuple[datetime, int] | None = None,
+    limit: int = 50,
+) -> tuple[list[FreeFreelancerResult], tuple[datetime, int] | None]:
+    """
+    Find freelancers with a slot that leaves at least min_duration free
+    inside the window once the bookings holding its units are subtracted,
+    ranked by the earliest free moment.
+
+    The window lookup is served by the partial GiST index on period and the
+    bookings of each candidate slot by bookings_confirmed_unit; DISTINCT ON
+    keeps only each freelancer's earliest match. Occurrences of recurring
+    rules are not stored as rows and are not searched.
+    """
+    window_start = normalize_time(window_start)
+    window_end = normalize_time(window_end)
+    if window_end - window_start < min_duration or window_end - window_start > (
+        timedelta(days=settings.MAX_AVAILABILITY_WINDOW_DAYS)
+    ):
+        raise exception.AppException(
+            message="The time window must fit min_duration and be at most "
+            f"{settings.MAX_AVAILABILITY_WINDOW_DAYS} days long",
+            code="availability.invalid_window",
+            target="end",
+            status_code=422,
+        )
+    window = func.tsrange(window_start, window_end, "[)")
+
+    booked = (
+        select(
+            func.range_agg(
+                func.tsrange(
+                    Booking.time,
+                    Booking.time
+                    + func.make_interval(0, 0, 0, 0, 0, Booking.duration_minutes),
+                    "[)",
+                )
+            )
+        )
+        .where(
+            Booking.slot_id == AvailableSlot.id,
+            Booking.status.in_(UNIT_TAKING_STATUSES),
+        )
+        .scalar_subquery()
+    )
+    # the slot's free stretches inside the window, one row per stretch
+    free = (
+        func.unnest(
+            func.tsmultirange(AvailableSlot.period.op("*")(window)).op("-")(
+                func.coalesce(booked, func.tsmultirange())
+            )
+        )
+        .table_valued("stretch")
+        .render_derived(name="free")
+        .lateral()
+    )
+    free_from = func.lower(free.c.stretch)
+    free_until = func.upper(free.c.stretch)
+
+    earliest = (
+        select(
+            AvailableSlot.freelancer_id,
+            AvailableSlot.id.label("slot_id"),
+            free_from.label("free_from"),
+            free_until.label("free_until"),
+        )
+        .select_from(AvailableSlot)
+        .join(free, true())
+        .where(
+            # must match the partial index predicate literally
+            ~AvailableSlot.is_booked,
+            AvailableSlot.period.op("&&")(window),
+            free_until - free_from >= min_duration,
+        )
+        .distinct(AvailableSlot.freelancer_id)
+        .order_by(AvailableSlot.freelancer_id, free_from)
+        .subquery()
+    )
+
+    query = select(
+        earliest, Freelancer.first_name, Freelancer.last_name
+    ).join(Freelancer, Freelancer.id == earliest.c.freelancer_id)
+    if after is not None:
+        query = query.where(
+            tuple_(earliest.c.free_from, earliest.c.freelancer_id) > tuple_(*after)
+        )
+    rows = db.execute(
+        query.order_by(earliest.c.free_from, earliest.c.freelancer_id).limit(
+            limit + 1
+        )
+    ).all()
+
+    results = [FreeFreelancerResult.model_validate(row) for row in rows[:limit]]
+    if len(rows) <= limit:
+        return results, None
+    return results, (results[-1].free_from, results[-1].freelancer_id)
+
+
+def get_freebusy(
+    db: Session,
+    freelancer_id: int,
+    start_date: date,
+    days: int,
+    version: int | None = None,
+) -> bytes:
+    """
+    Return the free/busy bitmap of consecutive days (see services.freebusy).
+
+    Days cached at the freelancer's current availability version are served
+    without touching slots or bookings; the missing range is computed in one
+    pass. Pass version when the caller has already read it.
+    """
+    if version is None:
+        row = get_availability_version(db, freelancer_id)
+        if not row:
+            raise exception.AppException(
+                message="Freelancer not found",
+                code="freelancer.not_found",
+                target="freelancer_id",
+                status_code=404,
+            )
+        version = row.availability_version
+
+    requested = [start_date + timedelta(days=offset) for offset in range(days)]
+    bitmaps = freebusy_cache.lookup(freelancer_id, version, requested)
+    missing = [day for day in requested if day not in bitmaps]
+
+    if missing:
+        first_day = missing[0]
+        span = (missing[-1] - first_day).days + 1
+        origin = datetime.combine(first_day, time.min)
+        bitmap = _compute_freebusy(
+            db, freelancer_id, origin, origin + timedelta(days=span), span
+        )
+        computed = {
+            first_day + timedelta(days=offset): bitmap[
+                offset * BYTES_PER_DAY : (offset + 1) * BYTES_PER_DAY
+            ]
+            for offset in range(span)
+        }
+        freebusy_cache.store(freelancer_id, version, computed)
+        bitmaps.update(computed)
+
+    return b"".join(bitmaps[day] for day in requested)
+
+
+def _compute_freebusy(
+    db: Session, freelancer_id: int, origin: datetime, end: datetime, days: int
+) -> bytes:
+    slots = (
+        db.query(AvailableSlot.start_time, AvailableSlot.end_time)
+        .filter(
+            AvailableSlot.freelancer_id == freelancer_id,
+            ~AvailableSlot.is_booked,
+            AvailableSlot.end_time > origin,
+            AvailableSlot.start_time < end,
+        )
+        .order_by(AvailableSlot.start_time)
         .all()
     )
+    occurrences = (
+        (occurrence.start_time, occurrence.end_time, 0)
+        for occurrence in expand_rule_availability(db, freelancer_id, origin, end)
+    )
+    free = merge_intervals(
+        heapq.merge(((start, stop, 0) for start, stop in slots), occurrences)
+    )
+
+    busy = [
+        (booking_time, booking_time + timedelta(minutes=minutes))
+        for booking_time, minutes in db.query(Booking.time, Booking.duration_minutes)
+        .filter(
+            Booking.freelancer_id == freelancer_id,
+            Booking.status.in_(UNIT_TAKING_STATUSES),
+            # no meeting lasts longer than a day
+            Booking.time > origin - timedelta(days=1),
+            Booking.time < end,
+        )
+        .order_by(Booking.time)
+    ]
 
-    return slots
+    return rasterize(
+        origin,
+        days,
+        [(start, stop) for start, stop, _ in subtract_intervals(free, busy)],
+    )
 
 
 def get_available_slot_by_id(db: Session, slot_id: int) -> AvailableSlot:
@@ -81,33 +530,77 @@ def get_available_slot_by_id(db: Session, slot_id: int) -> AvailableSlot:
     return slot
 
 
+def taken_intervals(
+    db: Session,
+    slot_id: int,
+    include_holds: bool = False,
+    except_hold: str | None = None,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Intervals of the slot taken by confirmed or completed bookings and, if
+    asked, by live checkout holds other than except_hold, all read in one
+    query.
+    """
+    query = select(Booking.time, Booking.duration_minutes).where(
+        Booking.slot_id == slot_id, Booking.status.in_(UNIT_TAKING_STATUSES)
+    )
+    if include_holds:
+        held = select(SlotHold.start_time, SlotHold.duration_minutes).where(
+            SlotHold.slot_id == slot_id, SlotHold.expires_at > datetime.utcnow()
+        )
+        if except_hold is not None:
+            held = held.where(SlotHold.token != except_hold)
+        query = union_all(query, held)
+    rows = db.execute(query).all()
+    return [(start, start + timedelta(minutes=minutes)) for start, minutes in rows]
+
+
+def get_free_units(db: Session, slot, except_hold: str | None = None) -> list[datetime]:
+    """
+    Carve the slot into bookable units on the fly, skipping the ones taken by
+    bookings or held by other clients; the slot row itself is never rewritten.
+    """
+    if slot.is_booked:
+        return []
+    return carver.free_units(
+        slot.start_time,
+        slot.end_time,
+        taken_intervals(db, slot.id, include_holds=True, except_hold=except_hold),
+    )
+
+
+def _load_slot(db: Session, slot_id: int) -> dict | None:
+    slot = db.query(AvailableSlot).filter(AvailableSlot.id == slot_id).first()
+    if not slot:
+        return None
+    return AvailableSlotResponse.model_validate(slot).model_dump(
+        mode="json", exclude={"rule_id"}
+    )
+
+
 def get_single_slot_with_freelancer_contact(
-    db: Session, slot_id: int
+    db: Session, slot_id: int, cached: bool = True
 ) -> SlotResWithFreelancer:
-    row = (
-        db.query(
-            AvailableSlot,
-            func.concat(
-                Freelancer.first_name, literal(" "), Freelancer.last_name
-            ).label("freelancer_name"),
-            Freelancer.email.label("freelancer_email"),
-        )
-        .join(Freelancer, AvailableSlot.freelancer_id == Freelancer.id)
-        .filter(AvailableSlot.id == slot_id)
-        .first()
-    )
-    if not row:
+    """
+    The slot and its freelancer's contact details, as the booking flow
+    needs them. Slot and contact are cached separately so a freelancer
+    change drops one entry instead of every slot they own; pass
+    cached=False for a slot that is not committed yet.
+    """
+    if cached:
+        slot = slot_cache.get_or_load(slot_id, lambda: _load_slot(db, slot_id))
+    else:
+        slot = _load_slot(db, slot_id)
+    contact = slot and get_freelancer_contact(db, slot["freelancer_id"])
+    if not contact:
         raise exception.AppException(
             message="Available slot not found",
             code="slot.not_found",
             target="slot_id",
             status_code=404,
         )
-    slot, freelancer_name, freelancer_email = row
-    slot.freelancer_name = freelancer_name
-    slot.freelancer_email = freelancer_email
 
-    return slot
+    return SlotResWithFreelancer(**slot, **contact)
 
 
 def update_available_slot(
@@ -138,22 +631,16 @@ def update_available_slot(
             status_code=403,
         )
 
-    # Only validate overlap if both start and end times are provided
-    if data.start_time and data.end_time:
-        overlapping_slot = (
-            db.query(AvailableSlot)
-            .filter(
-                AvailableSlot.freelancer_id == freelancer_id,
-                AvailableSlot.id != slot_id,
-                AvailableSlot.end_time > data.start_time,
-                AvailableSlot.start_time < data.end_time,
-            )
-            .first()
+    # Overlaps are enforced by the exclusion constraint on commit
+    if data.start_time is not None or data.end_time is not None:
+        _reject_overlap(
+            db,
+            freelancer_id,
+            data.start_time or slot.start_time,
+            data.end_time or slot.end_time,
+            exclude_slot_id=slot_id,
         )
 
-        if overlapping_slot:
-            raise exception.TimeSlotConflictException()
-
     # Update only if fields are present
     if data.start_time is not None:
         slot.start_time = data.start_time
@@ -162,11 +649,25 @@ def update_available_slot(
     if data.is_booked is not None:
         slot.is_booked = data.is_booked
     try:
-
+        bump_availability_version(db, freelancer_id)
         db.commit()
         db.refresh(slot)
+        slot_index_cache.add(freelancer_id, slot.id, slot.start_time, slot.end_time)
+        freebusy_cache.invalidate(freelancer_id)
+        slot_cache.invalidate(slot_id)
         return slot
 
+    except IntegrityError as e:
+        db.rollback()
+        if is_overlap_violation(e):
+            slot_index_cache.invalidate(freelancer_id)
+            raise exception.TimeSlotConflictException()
+        raise exception.AppException(
+            message="Failed to update available slot",
+            code="slot.update_error",
+            target="database",
+            status_code=500,
+        )
     except SQLAlchemyError as e:
         db.rollback()
         raise exception.AppException(
@@ -196,7 +697,11 @@ def delete_available_slot(db: Session, slot_id: int, freelancer_id: int) -> None
         )
     try:
         db.delete(slot)
+        bump_availability_version(db, freelancer_id)
         db.commit()
+        slot_index_cache.remove(freelancer_id, slot_id)
+        freebusy_cache.invalidate(freelancer_id)
+        slot_cache.invalidate(slot_id)
     except SQLAlchemyError as e:
         db.rollback()
         raise exception.AppException(
@@ -1,56 +1,174 @@
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from datetime import timedelta
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from datetime import datetime, timedelta
 
 from .available_slots import (
-    get_available_slot_by_id,
-    update_available_slot,
+    get_free_units,
     get_single_slot_with_freelancer_contact,
+    is_overlap_violation,
+    is_unique_violation,
+    slot_cache,
+    taken_intervals,
 )
+from .availability_rules import materialize_rule_occurrence
+from .holds import get_active_hold
+from .freelancer import bump_availability_version, get_freelancer_contact
+from .idempotency import claim_key
+from app.core.cache import ReadThroughCache, cache_backend
+from app.core.config import settings
 from app.exceptions import exception
-from app.models.bookings import Booking, BookingStatus
-from app.schema.bookings import BookingCreate, BookingUpdate
-from app.schema.available_slots import AvailableSlotUpdate
-from app.services.zoom_service import ZoomService
+from app.models.availability import AvailableSlot
+from app.models.bookings import (
+    Booking,
+    BookingStatus,
+    MeetingStatus,
+    UNIT_TAKING_STATUSES,
+)
+from app.models.freelancer import Freelancer
+from app.schema.bookings import (
+    BookingCreate,
+    BookingResponse,
+    BookingTransition,
+    BookingUpdate,
+    BulkBookingResult,
+)
+from app.services.freebusy import freebusy_cache
+from app.services.slot_carving import carver
+from app.services.slot_index import normalize_time, slot_index_cache
 from app.services.email_notification import (
     notify_client_on_booking_request,
     notify_freelancer_on_booking_request,
-    notify_client_on_booking_confirmation,
     notify_client_on_booking_cancellation,
 )
 
+booking_counts_cache = ReadThroughCache(
+    cache_backend, "booking_counts", settings.CACHE_TTL_SECONDS
+)
+
 
-def create_booking(db: Session, slot_id: int, data: BookingCreate) -> Booking:
-    slot = get_single_slot_with_freelancer_contact(db, slot_id)
-    if slot.is_booked:
+def create_booking(
+    db: Session,
+    data: BookingCreate,
+    slot_id: int | None = None,
+    rule_id: int | None = None,
+    occurrence_start: datetime | None = None,
+    idempotency_key: str | None = None,
+    fingerprint: str | None = None,
+) -> Booking:
+    """
+    Book either a concrete slot or an occurrence of a recurring rule; the
+    latter is materialized as a slot row in the same transaction.
+
+    With an idempotency key, the key and the response are stored in that
+    same transaction too, and so is the release of the client's hold. As in
+    create_hold, the slot row is locked while its free units are read, so a
+    booking never lands on a unit another client has just held.
+    """
+    claimed = None
+    if idempotency_key is not None:
+        claimed = claim_key(db, idempotency_key, fingerprint)
+
+    materialized = None
+    if rule_id is not None:
+        try:
+            materialized = materialize_rule_occurrence(db, rule_id, occurrence_start)
+        except IntegrityError as e:
+            db.rollback()
+            if is_overlap_violation(e):
+                raise exception.TimeSlotConflictException()
+            raise exception.AppException(
+                "Failed to create booking",
+                code="booking.creation_error",
+                target="database",
+                status_code=500,
+            )
+        slot_id = materialized.id
+
+    slot = get_single_slot_with_freelancer_contact(
+        db, slot_id, cached=materialized is None
+    )
+    # the slot row lock orders this booking with concurrent holds and
+    # confirmations on the slot, and is_booked is read fresh, not cached
+    locked_slot = (
+        db.query(AvailableSlot)
+        .filter(AvailableSlot.id == slot.id)
+        .with_for_update()
+        .first()
+    )
+    if not locked_slot:
+        raise exception.AppException(
+            "Available slot not found",
+            code="slot.not_found",
+            target="slot_id",
+            status_code=404,
+        )
+    hold = None
+    if data.hold_token is not None:
+        hold = get_active_hold(db, data.hold_token, slot.id)
+    # units held by other clients are skipped, the caller's own hold is not
+    free_units = get_free_units(db, locked_slot, except_hold=data.hold_token)
+    if not free_units:
         raise exception.AppException(
             "Slot is already booked", code="slot.already_booked", status_code=400
         )
 
+    unit_start = free_units[0]
+    requested = hold.start_time if hold is not None else data.start_time
+    if requested is not None:
+        unit_start = normalize_time(requested)
+        if unit_start not in free_units:
+            raise exception.AppException(
+                "This time is not available in the selected slot",
+                code="slot.unit_unavailable",
+                target="start_time",
+                status_code=400,
+            )
+
     new_booking = Booking(
         freelancer_id=slot.freelancer_id,
         slot_id=slot.id,
-        time=slot.start_time,
+        time=unit_start,
+        duration_minutes=carver.duration // timedelta(minutes=1),
         client_name=data.client_name,
         client_email=data.client_email,
     )
 
     try:
         db.add(new_booking)
-        db.commit()
-        db.refresh(new_booking)
+        if hold is not None:
+            db.delete(hold)
+        # the digest queue row points at the booking, so it needs its id
+        db.flush()
+        # written to the outbox in the same transaction as the booking
         notify_client_on_booking_request(
+            db,
             client_name=new_booking.client_name,
             client_email=new_booking.client_email,
             freelancer_name=slot.freelancer_name,
             booking_time=new_booking.time,
         )
         notify_freelancer_on_booking_request(
+            db,
             freelancer_name=slot.freelancer_name,
             freelancer_email=slot.freelancer_email,
             client_name=new_booking.client_name,
             booking_time=new_booking.time,
+            freelancer_id=slot.freelancer_id,
+            booking_id=new_booking.id,
+            digest_minutes=slot.freelancer_digest_minutes,
         )
+        bump_availability_version(db, slot.freelancer_id)
+        if claimed is not None:
+            claimed.response = BookingResponse.model_validate(new_booking).model_dump(
+                mode="json"
+            )
+        db.commit()
+        db.refresh(new_booking)
+        if materialized is not None:
+            slot_index_cache.add(
+                slot.freelancer_id, slot.id, slot.start_time, slot.end_time
+            )
         return new_booking
     except SQLAlchemyError:
         db.rollback()
@@ -71,126 +189,331 @@ def get_booking_by_id(db: Session, booking_id: int) -> Booking:
     return booking
 
 
-def get_bookings_by_freelancer_id(db: Session, freelancer_id: int) -> list[Booking]:
-    bookings = db.query(Booking).filter(Booking.freelancer_id == freelancer_id).all()
-    return bookings
+def get_bookings_by_freelancer_id(
+    db: Session,
+    freelancer_id: int,
+    statuses: list[BookingStatus] | None = None,
+    time_from: datetime | None = None,
+    time_to: datetime | None = None,
+    after: tuple[datetime, int] | None = None,
+    limit: int = 50,
+) -> tuple[list[Booking], tuple[datetime, int] | None]:
+    """
+    Return one page of a freelancer's bookings ordered by (time, id),
+    together with the keyset position of the next page.
+    """
+    query = db.query(Booking).filter(Booking.freelancer_id == freelancer_id)
+    if statuses:
+        query = query.filter(Booking.status.in_(statuses))
+    if time_from is not None:
+        query = query.filter(Booking.time >= normalize_time(time_from))
+    if time_to is not None:
+        query = query.filter(Booking.time < normalize_time(time_to))
+    if after is not None:
+        query = query.filter(tuple_(Booking.time, Booking.id) > tuple_(*after))
 
+    bookings = query.order_by(Booking.time, Booking.id).limit(limit + 1).all()
+    if len(bookings) <= limit:
+        return bookings, None
+    bookings = bookings[:limit]
+    return bookings, (bookings[-1].time, bookings[-1].id)
 
-def update_booking(
-    db: Session, booking_id: int, logged_in_freelancer_id: int, data: BookingUpdate
-) -> Booking:
-    booking = get_booking_by_id(db, booking_id)
 
-    slot = get_single_slot_with_freelancer_contact(db, booking.slot_id)
+def count_bookings_by_status(
+    db: Session, freelancer_id: int, version: int
+) -> dict[str, int]:
+    """
+    Per-status totals for the freelancer, served from an index-only scan and
+    cached under the availability version, which every booking write bumps.
+    """
+
+    def load():
+        rows = (
+            db.query(Booking.status, func.count())
+            .filter(Booking.freelancer_id == freelancer_id)
+            .group_by(Booking.status)
+            .all()
+        )
+        counts = {status.value: 0 for status in BookingStatus}
+        counts.update({status.value: count for status, count in rows})
+        return counts
+
+    return booking_counts_cache.get_or_load(f"{freelancer_id}:{version}", load)
+
 
-    if booking.freelancer_id != logged_in_freelancer_id:
+def load_booking_for_update(
+    db: Session, booking_id: int
+) -> tuple[Booking, AvailableSlot, str]:
+    """
+    Load the booking, its slot and the freelancer's name in one query,
+    locking the booking and slot rows until the transaction ends.
+
+    Confirmations and cancellations of the same slot queue up on the slot
+    lock, so free-unit checks always see committed bookings.
+    """
+    row = (
+        db.query(Booking, AvailableSlot, Freelancer.first_name, Freelancer.last_name)
+        .join(AvailableSlot, Booking.slot_id == AvailableSlot.id)
+        .join(Freelancer, Booking.freelancer_id == Freelancer.id)
+        .filter(Booking.id == booking_id)
+        .with_for_update(of=(Booking, AvailableSlot))
+        .first()
+    )
+    if not row:
+        raise exception.AppException(
+            "Booking not found", code="booking.not_found", status_code=404
+        )
+    booking, slot, first_name, last_name = row
+    return booking, slot, f"{first_name} {last_name}"
+
+
+# statuses a booking may move to from each non-final status
+ALLOWED_TRANSITIONS = {
+    BookingStatus.PENDING: {BookingStatus.CONFIRMED, BookingStatus.CANCELLED},
+    BookingStatus.CONFIRMED: {BookingStatus.CANCELLED, BookingStatus.COMPLETED},
+}
+
+
+def validate_transition(
+    booking: Booking, freelancer_id: int, status: BookingStatus
+) -> None:
+    if booking.freelancer_id != freelancer_id:
         raise exception.AppException(
             "You do not have permission to update this booking",
             code="booking.permission_denied",
             status_code=403,
         )
 
-    if data.status == booking.status:
+    if status == booking.status:
         raise exception.AppException(
             "No changes detected in booking status",
             code="booking.no_changes",
             status_code=400,
         )
 
-    if booking.status in (BookingStatus.PENDING, BookingStatus.CONFIRMED):
-        if (
-            booking.status == BookingStatus.PENDING
-            and data.status == BookingStatus.CONFIRMED
-        ):
-            if slot.is_booked:
-                raise exception.AppException(
-                    "This slot is already booked",
-                    code="slot.already_booked",
-                    status_code=400,
-                )
-            booking.status = BookingStatus.CONFIRMED
-
-            # create zoom meeting
-            meeting = ZoomService.create_meeting(
-                topic=f"Booking #{booking.id} with {booking.client_name}",
-                start_time=slot.start_time,
-                duration=60,
-            )
+    if booking.status not in ALLOWED_TRANSITIONS:
+        raise exception.AppException(
+            "Completed and cancelled bookings cannot be updated",
+            code="booking.operation_not_allowed",
+            status_code=400,
+        )
 
-            booking.meeting_link = meeting["join_url"]
+    if status not in ALLOWED_TRANSITIONS[booking.status]:
+        raise exception.AppException(
+            "Sorry this operation is not allowed",
+            code="booking.operation_not_allowed",
+            status_code=400,
+        )
 
-            time_diff = slot.end_time - slot.start_time
 
-            if time_diff < timedelta(hours=2):
-                update_data = AvailableSlotUpdate(is_booked=True)
-                print("less than two hours difference", update_data.model_dump())
+def apply_transition(
+    db: Session,
+    booking: Booking,
+    slot: AvailableSlot,
+    status: BookingStatus,
+    taken: list[tuple[datetime, datetime]],
+    freelancer_name: str,
+) -> None:
+    """
+    Apply a validated transition to the locked booking and slot rows.
 
-            else:
-                update_data = AvailableSlotUpdate(
-                    start_time=slot.start_time + timedelta(hours=1)
-                )
-                print("more than two hours difference", update_data.model_dump())
+    taken holds the intervals of the slot's confirmed and completed bookings
+    and is kept up to date, so several transitions on one slot can be
+    applied in a row.
+    """
+    booking_end = booking.time + timedelta(minutes=booking.duration_minutes)
 
-            update_available_slot(
-                db=db,
-                slot_id=slot.id,
-                freelancer_id=logged_in_freelancer_id,
-                data=update_data,
+    if status == BookingStatus.CONFIRMED:
+        if slot.is_booked or not carver.is_free(booking.time, taken):
+            raise exception.AppException(
+                "This slot is already booked",
+                code="slot.already_booked",
+                status_code=400,
             )
+        booking.status = BookingStatus.CONFIRMED
 
-            notify_client_on_booking_confirmation(
-                client_email=booking.client_email,
-                client_name=booking.client_name,
-                booking_time=booking.time,
-                freelancer_name=slot.freelancer_name,
-                meeting_link=booking.meeting_link,
-            )
+        # the meeting provisioner creates the zoom meeting and then sends
+        # the confirmation email with its link
+        booking.meeting_status = MeetingStatus.PENDING
+        booking.meeting_next_attempt_at = datetime.utcnow()
 
-        elif (
-            booking.status == BookingStatus.PENDING
-            and data.status == BookingStatus.CANCELLED
-        ):
-            booking.status = BookingStatus.CANCELLED
-            notify_client_on_booking_cancellation(
-                client_email=booking.client_email,
-                client_name=booking.client_name,
-                booking_time=booking.time,
-                freelancer_name=slot.freelancer_name,
-            )
+        # the slot row is only touched once its last unit is taken
+        taken.append((booking.time, booking_end))
+        if not carver.free_units(slot.start_time, slot.end_time, taken):
+            slot.is_booked = True
+        return
 
-        elif booking.status == BookingStatus.CONFIRMED and (
-            data.status == BookingStatus.CANCELLED
-            or data.status == BookingStatus.COMPLETED
-        ):
-            booking.status = data.status
-            notify_client_on_booking_cancellation(
-                client_email=booking.client_email,
-                client_name=booking.client_name,
-                booking_time=booking.time,
-                freelancer_name=slot.freelancer_name,
-            )
+    if booking.status == BookingStatus.CONFIRMED and status == BookingStatus.CANCELLED:
+        # the cancelled unit can be booked again; the slot is only reopened
+        # if its bookings filled it, not if the freelancer blocked it by hand
+        filled = not carver.free_units(slot.start_time, slot.end_time, taken)
+        taken.remove((booking.time, booking_end))
+        if filled:
+            slot.is_booked = False
+        if booking.meeting_status == MeetingStatus.PENDING:
+            booking.meeting_status = None
+
+    booking.status = status
+    notify_client_on_booking_cancellation(
+        db,
+        client_email=booking.client_email,
+        client_name=booking.client_name,
+        booking_time=booking.time,
+        freelancer_name=freelancer_name,
+    )
+
+
+def update_booking(
+    db: Session, booking_id: int, logged_in_freelancer_id: int, data: BookingUpdate
+) -> Booking:
+    """
+    Apply one status transition as a single unit of work: one locking read,
+    the free-unit check on confirm, and one commit for booking and slot.
+    """
+    booking, slot, freelancer_name = load_booking_for_update(db, booking_id)
+    validate_transition(booking, logged_in_freelancer_id, data.status)
 
-        else:
+    needs_taken = BookingStatus.CONFIRMED in (booking.status, data.status)
+    taken = taken_intervals(db, slot.id) if needs_taken else []
+    apply_transition(db, booking, slot, data.status, taken, freelancer_name)
+
+    try:
+        bump_availability_version(db, booking.freelancer_id)
+        db.commit()
+        db.refresh(booking)
+        freebusy_cache.invalidate(booking.freelancer_id)
+        slot_cache.invalidate(booking.slot_id)
+        return booking
+    except IntegrityError as e:
+        db.rollback()
+        if is_unique_violation(e):
             raise exception.AppException(
-                "Sorry this operation is not allowed",
-                code="booking.operation_not_allowed",
+                "This slot is already booked",
+                code="slot.already_booked",
                 status_code=400,
             )
-    else:
         raise exception.AppException(
-            "Completed and cancelled bookings cannot be updated",
-            code="booking.operation_not_allowed",
-            status_code=400,
+            "Failed to update booking",
+            code="booking.update_error",
+            target="database",
+            status_code=500,
+        )
+    except SQLAlchemyError:
+        db.rollback()
+        raise exception.AppException(
+            "Failed to update booking",
+            code="booking.update_error",
+            target="database",
+            status_code=500,
         )
 
+
+def update_bookings_bulk(
+    db: Session, freelancer_id: int, items: list[BookingTransition]
+) -> list[BulkBookingResult]:
+    """
+    Apply many status transitions in one transaction.
+
+    All bookings and their slots are locked by one query, the taken
+    intervals of those slots are read by another, and every transition is
+    then checked and applied in memory in request order. Items that fail
+    are reported per item without affecting the others.
+    """
+    rows = (
+        db.query(Booking, AvailableSlot)
+        .join(AvailableSlot, Booking.slot_id == AvailableSlot.id)
+        .filter(Booking.id.in_({item.booking_id for item in items}))
+        .order_by(AvailableSlot.id, Booking.id)
+        .with_for_update(of=(Booking, AvailableSlot))
+        .all()
+    )
+    bookings = {booking.id: (booking, slot) for booking, slot in rows}
+
+    taken: dict[int, list[tuple[datetime, datetime]]] = {
+        slot.id: [] for _, slot in rows
+    }
+    for slot_id, start, minutes in (
+        db.query(Booking.slot_id, Booking.time, Booking.duration_minutes)
+        .filter(
+            Booking.slot_id.in_(taken.keys()),
+            Booking.status.in_(UNIT_TAKING_STATUSES),
+        )
+        .all()
+    ):
+        taken[slot_id].append((start, start + timedelta(minutes=minutes)))
+
+    contact = get_freelancer_contact(db, freelancer_id)
+    results = []
+    for index, item in enumerate(items):
+        try:
+            if item.booking_id not in bookings:
+                raise exception.AppException(
+                    "Booking not found", code="booking.not_found", status_code=404
+                )
+            booking, slot = bookings[item.booking_id]
+            validate_transition(booking, freelancer_id, item.status)
+            releases_unit = booking.status == BookingStatus.CONFIRMED
+            apply_transition(
+                db,
+                booking,
+                slot,
+                item.status,
+                taken[slot.id],
+                contact["freelancer_name"],
+            )
+            if releases_unit:
+                # flush rows in request order so that a unit released here
+                # can be confirmed for another booking later in the batch
+                # without tripping bookings_confirmed_unit
+                db.flush()
+        except exception.AppException as e:
+            results.append(
+                BulkBookingResult(
+                    index=index,
+                    booking_id=item.booking_id,
+                    updated=False,
+                    error=e.response.details[0],
+                )
+            )
+            continue
+        results.append(
+            BulkBookingResult(
+                index=index,
+                booking_id=item.booking_id,
+                updated=True,
+                booking=BookingResponse.model_validate(booking),
+            )
+        )
+
+    if not any(result.updated for result in results):
+        db.rollback()
+        return results
+
     try:
+        bump_availability_version(db, freelancer_id)
         db.commit()
-        db.refresh(booking)
-        return booking
+        freebusy_cache.invalidate(freelancer_id)
+        for slot_id in taken:
+            slot_cache.invalidate(slot_id)
+        return results
+    except IntegrityError as e:
+        db.rollback()
+        if is_unique_violation(e):
+            raise exception.AppException(
+                "This slot is already booked",
+                code="slot.already_booked",
+                status_code=400,
+            )
+        raise exception.AppException(
+            "Failed to update bookings",
+            code="booking.update_error",
+            target="database",
+            status_code=500,
+        )
     except SQLAlchemyError:
         db.rollback()
         raise exception.AppException(
-            "Failed to update booking",
+            "Failed to update bookings",
             code="booking.update_error",
             target="database",
             status_code=500,
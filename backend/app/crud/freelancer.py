@@ -1,15 +1,136 @@
+from datetime import datetime
+from sqlalchemy import event, inspect
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from app.schema.freelancer import FreelancerCreate
+from app.core.cache import ReadThroughCache, cache_backend
+from app.core.config import settings
+from app.schema.freelancer import FreelancerCreate, NotificationSettings
+from app.models.availability import AvailableSlot
+from app.models.bookings import Booking
 from app.models.freelancer import Freelancer
 from app.core.security import verify_password, get_password_hash
 from app.exceptions import exception
 
+freelancer_contact_cache = ReadThroughCache(
+    cache_backend, "freelancer_contact", settings.CACHE_TTL_SECONDS
+)
+
 
 def get_freelancer_by_id(db: Session, user_id: int) -> Freelancer | None:
     return db.query(Freelancer).filter(Freelancer.id == user_id).first()
 
 
+def bump_availability_version(db: Session, freelancer_id: int) -> None:
+    """
+    Mark the freelancer's slots and bookings as changed. Runs inside the
+    caller's transaction, so the version moves exactly when the write commits.
+    """
+    bump_availability_versions(db, [freelancer_id])
+
+
+def bump_availability_versions(db: Session, freelancer_ids: list[int]) -> None:
+    db.query(Freelancer).filter(Freelancer.id.in_(freelancer_ids)).update(
+        {
+            Freelancer.availability_version: Freelancer.availability_version + 1,
+            Freelancer.availability_updated_at: datetime.utcnow(),
+        },
+        synchronize_session=False,
+    )
+
+
+def get_availability_version(
+    db: Session, freelancer_id: int
+) -> tuple[int, datetime] | None:
+    return (
+        db.query(Freelancer.availability_version, Freelancer.availability_updated_at)
+        .filter(Freelancer.id == freelancer_id)
+        .first()
+    )
+
+
+def get_slot_availability_version(
+    db: Session, slot_id: int
+) -> tuple[int, datetime] | None:
+    return (
+        db.query(Freelancer.availability_version, Freelancer.availability_updated_at)
+        .join(AvailableSlot, AvailableSlot.freelancer_id == Freelancer.id)
+        .filter(AvailableSlot.id == slot_id)
+        .first()
+    )
+
+
+def get_booking_availability_version(
+    db: Session, booking_id: int
+) -> tuple[int, datetime] | None:
+    return (
+        db.query(Freelancer.availability_version, Freelancer.availability_updated_at)
+        .join(Booking, Booking.freelancer_id == Freelancer.id)
+        .filter(Booking.id == booking_id)
+        .first()
+    )
+
+
+def get_freelancer_contact(db: Session, freelancer_id: int) -> dict | None:
+    """
+    Name, email and digest setting used by the booking emails, cached per
+    freelancer.
+    """
+
+    def load():
+        row = (
+            db.query(
+                Freelancer.first_name,
+                Freelancer.last_name,
+                Freelancer.email,
+                Freelancer.notification_digest_minutes,
+            )
+            .filter(Freelancer.id == freelancer_id)
+            .first()
+        )
+        if not row:
+            return None
+        return {
+            "freelancer_name": f"{row.first_name} {row.last_name}",
+            "freelancer_email": row.email,
+            "freelancer_digest_minutes": row.notification_digest_minutes,
+        }
+
+    return freelancer_contact_cache.get_or_load(freelancer_id, load)
+
+
+# fired at flush time, for any ORM write to a freelancer; the cache entry is
+# dropped once the transaction commits, so a concurrent read cannot cache the
+# old row again
+@event.listens_for(Freelancer, "after_update")
+def _drop_changed_contact(mapper, connection, target):
+    state = inspect(target)
+    if any(
+        state.attrs[name].history.has_changes()
+        for name in ("first_name", "last_name", "email", "notification_digest_minutes")
+    ):
+        _changed_contacts(state.session).add(target.id)
+
+
+@event.listens_for(Freelancer, "after_delete")
+def _drop_deleted_contact(mapper, connection, target):
+    _changed_contacts(inspect(target).session).add(target.id)
+
+
+def _changed_contacts(session: Session) -> set[int]:
+    return session.info.setdefault("changed_freelancer_contacts", set())
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_contacts(session: Session):
+    for freelancer_id in session.info.pop("changed_freelancer_contacts", ()):
+        freelancer_contact_cache.invalidate(freelancer_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_contacts(session: Session):
+    session.info.pop("changed_freelancer_contacts", None)
+
+
 def get_freelancer_by_email(db: Session, email: str) -> Freelancer | None:
     return db.query(Freelancer).filter(Freelancer.email == email).first()
 
@@ -55,3 +176,21 @@ def authenticate_user(db: Session, email: str, password: str) -> Freelancer | No
     if not verify_password(str(password), str(user.hashed_password)):
         return None
     return user
+
+
+def update_notification_settings(
+    db: Session, freelancer: Freelancer, data: NotificationSettings
+) -> Freelancer:
+    freelancer.notification_digest_minutes = data.digest_minutes
+    try:
+        db.commit()
+        db.refresh(freelancer)
+        return freelancer
+    except SQLAlchemyError:
+        db.rollback()
+        raise exception.AppException(
+            "Failed to update notification settings",
+            code="freelancer.update_error",
+            target="database",
+            status_code=500,
+        )
@@ -0,0 +1,126 @@
+import secrets
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .available_slots import get_free_units
+from app.core.config import settings
+from app.exceptions import exception
+from app.models.availability import AvailableSlot, SlotHold
+from app.services.slot_carving import carver
+from app.services.slot_index import normalize_time
+
+
+def create_hold(
+    db: Session, slot_id: int, start_time: datetime | None = None
+) -> SlotHold:
+    """
+    Reserve one unit of the slot for SLOT_HOLD_MINUTES. The slot row is
+    locked while the unit is picked, so two holds never share a unit.
+    """
+    slot = (
+        db.query(AvailableSlot)
+        .filter(AvailableSlot.id == slot_id)
+        .with_for_update()
+        .first()
+    )
+    if not slot:
+        raise exception.AppException(
+            "Available slot not found",
+            code="slot.not_found",
+            target="slot_id",
+            status_code=404,
+        )
+
+    free_units = get_free_units(db, slot)
+    if not free_units:
+        db.rollback()
+        raise exception.AppException(
+            "Slot is already booked", code="slot.already_booked", status_code=400
+        )
+
+    unit_start = free_units[0]
+    if start_time is not None:
+        unit_start = normalize_time(start_time)
+        if unit_start not in free_units:
+            db.rollback()
+            raise exception.AppException(
+                "This time is not available in the selected slot",
+                code="slot.unit_unavailable",
+                target="start_time",
+                status_code=400,
+            )
+
+    hold = SlotHold(
+        slot_id=slot.id,
+        token=secrets.token_urlsafe(32),
+        start_time=unit_start,
+        duration_minutes=carver.duration // timedelta(minutes=1),
+        expires_at=datetime.utcnow() + timedelta(minutes=settings.SLOT_HOLD_MINUTES),
+    )
+    try:
+        db.add(hold)
+        db.commit()
+        db.refresh(hold)
+        return hold
+    except SQLAlchemyError:
+        db.rollback()
+        raise exception.AppException(
+            "Failed to hold slot",
+            code="hold.creation_error",
+            target="database",
+            status_code=500,
+        )
+
+
+def get_active_hold(db: Session, token: str, slot_id: int) -> SlotHold:
+    hold = (
+        db.query(SlotHold)
+        .filter(SlotHold.token == token, SlotHold.expires_at > datetime.utcnow())
+        .first()
+    )
+    if not hold or hold.slot_id != slot_id:
+        raise exception.AppException(
+            "Hold not found or expired",
+            code="hold.not_found",
+            target="hold_token",
+            status_code=404,
+        )
+    return hold
+
+
+def release_hold(db: Session, token: str) -> None:
+    try:
+        db.query(SlotHold).filter(SlotHold.token == token).delete(
+            synchronize_session=False
+        )
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise exception.AppException(
+            "Failed to release hold",
+            code="hold.release_error",
+            target="database",
+            status_code=500,
+        )
+
+
+def sweep_expired_holds(db: Session) -> int:
+    """
+    Delete expired holds in batches, committing after each one, and return
+    how many were removed.
+    """
+    removed = 0
+    while True:
+        expired = (
+            select(SlotHold.id)
+            .where(SlotHold.expires_at <= datetime.utcnow())
+            .limit(settings.SLOT_HOLD_SWEEP_BATCH_SIZE)
+        )
+        result = db.execute(delete(SlotHold).where(SlotHold.id.in_(expired)))
+        db.commit()
+        removed += result.rowcount
+        if result.rowcount < settings.SLOT_HOLD_SWEEP_BATCH_SIZE:
+            return removed
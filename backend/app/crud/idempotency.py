@@ -0,0 +1,84 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.exceptions import exception
+from app.models.idempotency import IdempotencyKey
+
+
+def request_fingerprint(**parts) -> str:
+    return hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def get_stored_response(db: Session, key: str, fingerprint: str) -> dict | None:
+    """
+    Return the response stored for the key, or None if the key is unused.
+    Reusing a key for a different request is rejected.
+    """
+    row = db.query(IdempotencyKey).filter(IdempotencyKey.key == key).first()
+    if row is None:
+        return None
+    if row.expires_at <= datetime.utcnow():
+        # expired but not swept yet: free the key for this request
+        db.delete(row)
+        db.commit()
+        return None
+    if row.fingerprint != fingerprint:
+        raise exception.AppException(
+            "This Idempotency-Key was already used for a different request",
+            code="idempotency.key_reused",
+            target="Idempotency-Key",
+            status_code=422,
+        )
+    if row.response is None:
+        raise exception.IdempotencyKeyConflictException()
+    return row.response
+
+
+def claim_key(db: Session, key: str, fingerprint: str) -> IdempotencyKey:
+    """
+    Insert the key inside the caller's transaction before any other write.
+    A concurrent request with the same key blocks on the primary key until
+    this transaction ends, then fails here instead of writing twice.
+    """
+    row = IdempotencyKey(
+        key=key,
+        fingerprint=fingerprint,
+        expires_at=datetime.utcnow()
+        + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+    )
+    try:
+        db.add(row)
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise exception.IdempotencyKeyConflictException()
+    return row
+
+
+def sweep_expired_keys(db: Session) -> int:
+    """
+    Delete expired keys in batches, committing after each one, and return
+    how many were removed.
+    """
+    removed = 0
+    while True:
+        expired = (
+            select(IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= datetime.utcnow())
+            .limit(settings.IDEMPOTENCY_SWEEP_BATCH_SIZE)
+        )
+        result = db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired))
+        )
+        db.commit()
+        removed += result.rowcount
+        if result.rowcount < settings.IDEMPOTENCY_SWEEP_BATCH_SIZE:
+            return removed
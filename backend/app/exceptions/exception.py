@@ -64,3 +64,13 @@ class TimeSlotConflictException(AppException):
             target="time_slot",
             status_code=status.HTTP_409_CONFLICT,
         )
+
+
+class IdempotencyKeyConflictException(AppException):
+    def __init__(self):
+        super().__init__(
+            message="A request with this Idempotency-Key is already being processed.",
+            code="idempotency.conflict",
+            target="Idempotency-Key",
+            status_code=status.HTTP_409_CONFLICT,
+        )
@@ -1,13 +1,27 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import sys
-from app.db.session import engine
+from app.db.session import SessionLocal, engine
 from app.db.base import Base
 from app.api import (
     auth as routes_auth,
     availability as routes_availability,
+    availability_rules as routes_availability_rules,
     bookings as routes_bookings,
+    metrics as routes_metrics,
 )
+from app.core.background import periodic_tasks
+from app.core.config import settings
+from app.core.email import get_email_transport
 from app.core.handlers import register_exception_handlers
+from app.core.rate_limit import RateLimitMiddleware, get_rate_limit_store
+from app.crud.holds import sweep_expired_holds
+from app.crud.idempotency import sweep_expired_keys
+from app.services.booking_lifecycle import BookingLifecycleJob
+from app.services.meeting_provisioner import MeetingProvisioner
+from app.services.notification_digest import NotificationDigestJob
+from app.services.outbox import OutboxWorker
+from app.services.zoom_token_manager import zoom_token_manager
 
 try:
     Base.metadata.create_all(bind=engine)
@@ -15,11 +29,70 @@ except Exception as e:
     print("schema creation failed:", e)
     sys.exit(1)
 
-app = FastAPI()
+def sweep_idempotency_keys():
+    with SessionLocal() as db:
+        sweep_expired_keys(db)
+
+
+def sweep_slot_holds():
+    with SessionLocal() as db:
+        sweep_expired_holds(db)
+
+
+if settings.RUN_BACKGROUND_TASKS:
+    outbox_worker = OutboxWorker(SessionLocal, get_email_transport())
+    periodic_tasks.register("outbox", settings.OUTBOX_POLL_SECONDS, outbox_worker.drain)
+    meeting_provisioner = MeetingProvisioner(SessionLocal)
+    periodic_tasks.register(
+        "meetings", settings.ZOOM_PROVISION_POLL_SECONDS, meeting_provisioner.drain
+    )
+    periodic_tasks.register(
+        "idempotency-sweep", settings.IDEMPOTENCY_SWEEP_SECONDS, sweep_idempotency_keys
+    )
+    periodic_tasks.register(
+        "hold-sweep", settings.SLOT_HOLD_SWEEP_SECONDS, sweep_slot_holds
+    )
+    booking_lifecycle = BookingLifecycleJob(SessionLocal)
+    periodic_tasks.register(
+        "booking-lifecycle", settings.BOOKING_LIFECYCLE_SECONDS, booking_lifecycle.run
+    )
+    notification_digest = NotificationDigestJob(SessionLocal)
+    periodic_tasks.register(
+        "notification-digest",
+        settings.NOTIFICATION_DIGEST_POLL_SECONDS,
+        notification_digest.run,
+    )
+    periodic_tasks.register(
+        "zoom-token",
+        settings.ZOOM_TOKEN_RENEW_POLL_SECONDS,
+        zoom_token_manager.renew_if_expiring,
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    periodic_tasks.start()
+    yield
+    await periodic_tasks.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 register_exception_handlers(app)  # global error handlers
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, store=get_rate_limit_store())
 
 app.include_router(routes_auth.router, prefix="/api/v1/auth", tags=["Auth"])
+# registered before the availability router so "/rules" is not read as a slot id
+app.include_router(
+    routes_availability_rules.router,
+    prefix="/api/v1/availability/rules",
+    tags=["Availability Rules"],
+)
 app.include_router(
     routes_availability.router, prefix="/api/v1/availability", tags=["Availability"]
 )
 app.include_router(routes_bookings.router, prefix="/api/v1/bookings", tags=["Bookings"])
+if settings.METRICS_ENABLED:
+    app.include_router(
+        routes_metrics.router, prefix="/api/v1/metrics", tags=["Metrics"]
+    )
@@ -1,5 +1,23 @@
-from .availability import AvailableSlot
+from .availability import (
+    AvailableSlot,
+    AvailabilityRule,
+    AvailabilityRuleExclusion,
+    SlotHold,
+)
 from .bookings import Booking
 from .freelancer import Freelancer
+from .idempotency import IdempotencyKey
+from .notifications import FreelancerNotification
+from .outbox import OutboxMessage
 
-__all__ = ["AvailableSlot", "Booking", "Freelancer"]
\ No newline at end of file
+__all__ = [
+    "AvailableSlot",
+    "AvailabilityRule",
+    "AvailabilityRuleExclusion",
+    "Booking",
+    "Freelancer",
+    "FreelancerNotification",
+    "IdempotencyKey",
+    "OutboxMessage",
+    "SlotHold",
+]
\ No newline at end of file
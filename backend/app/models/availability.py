@@ -1,10 +1,44 @@
-from sqlalchemy import Column, Integer, DateTime, Boolean, ForeignKey
+from datetime import datetime
+from sqlalchemy import (
+    Column,
+    Integer,
+    Date,
+    DateTime,
+    Time,
+    Boolean,
+    ForeignKey,
+    Computed,
+    DDL,
+    Index,
+    String,
+    event,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSRANGE, ExcludeConstraint
 from app.db.base import Base
 from sqlalchemy.orm import relationship, validates
 
 
 class AvailableSlot(Base):
     __tablename__ = "available_slots"
+    __table_args__ = (
+        # Postgres rejects overlapping slots of the same freelancer atomically
+        ExcludeConstraint(
+            ("freelancer_id", "="),
+            ("period", "&&"),
+            name="available_slots_no_overlap",
+            using="gist",
+        ),
+        # keyset pagination of a freelancer's slots by (start_time, id)
+        Index("ix_available_slots_freelancer_start", "freelancer_id", "start_time"),
+        # cross-freelancer "who is free" range lookups
+        Index(
+            "ix_available_slots_free_period",
+            "period",
+            postgresql_using="gist",
+            postgresql_where=text("NOT is_booked"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     freelancer_id = Column(
@@ -13,11 +47,96 @@ class AvailableSlot(Base):
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=False)
     is_booked = Column(Boolean, default=False, nullable=False)
+    period = Column(
+        TSRANGE,
+        Computed("tsrange(start_time, end_time, '[)')", persisted=True),
+        nullable=False,
+    )
 
     # Relationships
     freelancer = relationship("Freelancer", back_populates="available_slots")
-    booking = relationship(
-        "Booking", back_populates="slot", uselist=False, cascade="all, delete-orphan"
+    # a long slot is carved into several bookable units
+    bookings = relationship(
+        "Booking", back_populates="slot", cascade="all, delete-orphan"
+    )
+
+
+class AvailabilityRule(Base):
+    """
+    Weekly recurring availability, expanded on demand instead of being
+    stored as one AvailableSlot row per occurrence.
+    """
+
+    __tablename__ = "availability_rules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    freelancer_id = Column(
+        Integer,
+        ForeignKey("freelancers.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    weekdays = Column(Integer, nullable=False)  # bitmask, Monday = 1 << 0
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    valid_from = Column(Date, nullable=False)
+    valid_until = Column(Date, nullable=True)
+    interval_weeks = Column(Integer, default=1, nullable=False)
+
+    # Relationships
+    freelancer = relationship("Freelancer", back_populates="availability_rules")
+    exclusions = relationship(
+        "AvailabilityRuleExclusion",
+        back_populates="rule",
+        cascade="all, delete-orphan",
+        order_by="AvailabilityRuleExclusion.start_time",
+    )
+
+
+class AvailabilityRuleExclusion(Base):
+    __tablename__ = "availability_rule_exclusions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    rule_id = Column(
+        Integer,
+        ForeignKey("availability_rules.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+
+    # Relationships
+    rule = relationship("AvailabilityRule", back_populates="exclusions")
+
+
+class SlotHold(Base):
+    """
+    A unit of a slot reserved for one client while they check out. Expired
+    holds stop counting straight away and are deleted by a background sweep.
+    """
+
+    __tablename__ = "slot_holds"
+    __table_args__ = (
+        # live holds of one slot, read together with its confirmed bookings
+        Index("ix_slot_holds_slot_expires", "slot_id", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    slot_id = Column(
+        Integer, ForeignKey("available_slots.id", ondelete="CASCADE"), nullable=False
+    )
+    token = Column(String(64), nullable=False, unique=True)
+    start_time = Column(DateTime, nullable=False)
+    duration_minutes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
 
-    
+# the exclusion constraint compares freelancer_id with "=", which GiST only
+# supports through the btree_gist extension
+event.listen(
+    AvailableSlot.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"),
+)
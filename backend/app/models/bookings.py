@@ -6,6 +6,8 @@ from sqlalchemy import (
     String,
     DateTime,
     ForeignKey,
+    Index,
+    text,
     Enum as SQLAlchemyEnum,
 )
 from app.db.base import Base
@@ -19,8 +21,42 @@ class BookingStatus(str, Enum):
     COMPLETED = "completed"
 
 
+# a booking holds its unit of the slot while confirmed and after it took place
+UNIT_TAKING_STATUSES = (BookingStatus.CONFIRMED, BookingStatus.COMPLETED)
+
+
+class MeetingStatus(str, Enum):
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # dashboard listing: filter by status, keyset-paginate by time
+        Index("ix_bookings_freelancer_status_time", "freelancer_id", "status", "time"),
+        # the meeting provisioner only scans bookings still waiting for a link
+        Index(
+            "ix_bookings_meeting_due",
+            "meeting_next_attempt_at",
+            postgresql_where=text("meeting_status = 'PENDING'"),
+        ),
+        # the lifecycle job only scans bookings that can still change state
+        Index(
+            "ix_bookings_open_time",
+            "time",
+            postgresql_where=text("status IN ('PENDING', 'CONFIRMED')"),
+        ),
+        # backstop for the slot lock: a unit is taken by at most one booking
+        Index(
+            "bookings_confirmed_unit",
+            "slot_id",
+            "time",
+            unique=True,
+            postgresql_where=text("status IN ('CONFIRMED', 'COMPLETED')"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     freelancer_id = Column(
@@ -32,11 +68,16 @@ class Booking(Base):
     time = Column(DateTime, default=datetime.utcnow, nullable=False)
     client_name = Column(String(100), nullable=False)
     client_email = Column(String(255), nullable=False)
+    duration_minutes = Column(Integer, default=60, nullable=False)
     meeting_link = Column(String(500))
+    # set on confirmation; the link is filled in by the meeting provisioner
+    meeting_status = Column(SQLAlchemyEnum(MeetingStatus))
+    meeting_attempts = Column(Integer, default=0, nullable=False)
+    meeting_next_attempt_at = Column(DateTime)
     status = Column(
         SQLAlchemyEnum(BookingStatus), default=BookingStatus.PENDING, nullable=False
     )
 
     # Relationships
     freelancer = relationship("Freelancer", back_populates="bookings")
-    slot = relationship("AvailableSlot", back_populates="booking")
\ No newline at end of file
+    slot = relationship("AvailableSlot", back_populates="bookings")
\ No newline at end of file
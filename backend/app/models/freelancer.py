@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
 from app.db.base import Base
 from sqlalchemy.orm import relationship, validates
 from app.utils.validators import ValidatorUtils
@@ -11,11 +12,20 @@ class Freelancer(Base):
     last_name = Column(String(50), nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
+    # bumped by every slot, rule and booking write; drives HTTP ETags
+    availability_version = Column(Integer, default=0, nullable=False)
+    availability_updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # 0 sends each booking request email right away, otherwise requests are
+    # collected for this many minutes and sent as one digest
+    notification_digest_minutes = Column(Integer, default=0, nullable=False)
 
     # Relationships
     available_slots = relationship(
         "AvailableSlot", back_populates="freelancer", cascade="all, delete-orphan"
     )
+    availability_rules = relationship(
+        "AvailabilityRule", back_populates="freelancer", cascade="all, delete-orphan"
+    )
     bookings = relationship(
         "Booking", back_populates="freelancer", cascade="all, delete-orphan"
     )
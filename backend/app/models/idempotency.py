@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlalchemy import JSON, Column, DateTime, String
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    A client-supplied Idempotency-Key, the fingerprint of the request that
+    first used it and the response that request produced.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    # null while the first request is still running
+    response = Column(JSON)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
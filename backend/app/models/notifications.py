@@ -0,0 +1,32 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from app.db.base import Base
+
+
+class FreelancerNotification(Base):
+    """
+    A booking request waiting to go out in the freelancer's next digest
+    email instead of its own.
+    """
+
+    __tablename__ = "freelancer_notifications"
+
+    id = Column(Integer, primary_key=True, index=True)
+    freelancer_id = Column(
+        Integer,
+        ForeignKey("freelancers.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    # the request itself; the digest skips it once it is no longer pending
+    booking_id = Column(
+        Integer,
+        ForeignKey("bookings.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    client_name = Column(String(100), nullable=False)
+    booking_time = Column(DateTime, nullable=False)
+    # end of the digest window this request opened or joined
+    send_after = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
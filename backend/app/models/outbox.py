@@ -0,0 +1,51 @@
+from datetime import datetime
+from enum import Enum
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+    Enum as SQLAlchemyEnum,
+)
+from app.db.base import Base
+
+
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class OutboxMessage(Base):
+    """
+    An email written in the same transaction as the change it announces and
+    delivered later by the outbox worker.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # the worker only ever scans messages that are still due
+        Index(
+            "ix_email_outbox_due",
+            "next_attempt_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    template = Column(String(100), nullable=False)
+    context = Column(JSON, nullable=False)
+    status = Column(
+        SQLAlchemyEnum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False
+    )
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime)
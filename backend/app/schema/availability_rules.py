@@ -0,0 +1,69 @@
+from datetime import date, datetime, time
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from app.utils.validators import ValidatorUtils
+from app.utils.recurrence import mask_to_weekdays
+
+
+class AvailabilityRuleBase(BaseModel):
+    weekdays: list[int] = Field(
+        ..., min_length=1, max_length=7, examples=[[0, 1, 2, 3, 4]]
+    )
+    start_time: time = Field(..., examples=["09:00"])
+    end_time: time = Field(..., examples=["17:00"])
+    valid_from: date
+    valid_until: Optional[date] = None
+    interval_weeks: int = Field(1, ge=1, le=52)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AvailabilityRuleCreate(AvailabilityRuleBase):
+    @field_validator("weekdays")
+    def validate_weekdays(cls, v: list[int]) -> list[int]:
+        if any(day < 0 or day > 6 for day in v):
+            raise ValueError("Weekdays must be between 0 (Monday) and 6 (Sunday)")
+        return sorted(set(v))
+
+    @model_validator(mode="after")
+    def validate_rule(cls, values):
+        day = values.valid_from
+        ValidatorUtils.validate_time_slot(
+            datetime.combine(day, values.start_time),
+            datetime.combine(day, values.end_time),
+        )
+        if values.valid_until is not None and values.valid_until < values.valid_from:
+            raise ValueError("valid_until must not be before valid_from")
+        return values
+
+
+class AvailabilityRuleResponse(AvailabilityRuleBase):
+    id: int
+    freelancer_id: int
+
+    @field_validator("weekdays", mode="before")
+    def unpack_weekdays(cls, v):
+        # stored as a bitmask on the model
+        if isinstance(v, int):
+            return mask_to_weekdays(v)
+        return v
+
+
+class RuleExclusionCreate(BaseModel):
+    start_time: datetime
+    end_time: datetime
+
+    @model_validator(mode="after")
+    def validate_exclusion(cls, values):
+        if values.end_time <= values.start_time:
+            raise ValueError("End time must be after start time")
+        return values
+
+
+class RuleExclusionResponse(RuleExclusionCreate):
+    id: int
+    rule_id: int
+
+    model_config = ConfigDict(from_attributes=True)
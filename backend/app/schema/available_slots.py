@@ -1,9 +1,10 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from pydantic import BaseModel, model_validator, ConfigDict
+from pydantic import BaseModel, Field, model_validator, ConfigDict
 
 from app.utils.validators import ValidatorUtils
+from app.schema.error import ErrorDetail
 
 
 class AvailableSlotBase(BaseModel):
@@ -38,11 +39,50 @@ class AvailableSlotUpdate(BaseModel):
 
 
 class AvailableSlotResponse(AvailableSlotBase):
-    id: int
+    # rule occurrences have no row until they are booked
+    id: Optional[int] = None
     freelancer_id: int
     is_booked: bool
+    rule_id: Optional[int] = None
 
 
 class SlotResWithFreelancer(AvailableSlotResponse):
     freelancer_name: str
     freelancer_email: str
+    freelancer_digest_minutes: int = 0
+
+
+class AvailableSlotBulkCreate(BaseModel):
+    slots: list[AvailableSlotCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class BulkSlotResult(BaseModel):
+    index: int
+    created: bool
+    slot: Optional[AvailableSlotResponse] = None
+    error: Optional[ErrorDetail] = None
+
+
+class FreeFreelancerResult(BaseModel):
+    freelancer_id: int
+    first_name: str
+    last_name: str
+    slot_id: int
+    free_from: datetime
+    free_until: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FreeBusyResponse(BaseModel):
+    freelancer_id: int
+    start_date: date
+    days: int
+    bucket_minutes: int
+    # base64 of one bit per bucket (1 = free), days * 96 bits, MSB first
+    bitmap: str
+
+
+class BookableUnit(BaseModel):
+    start_time: datetime
+    end_time: datetime
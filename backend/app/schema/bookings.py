@@ -2,8 +2,10 @@ from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, Field, EmailStr, model_validator, ConfigDict
 
+from app.schema.error import ErrorDetail
+from app.schema.response import Page
 from app.utils.validators import ValidatorUtils
-from app.models.bookings import BookingStatus
+from app.models.bookings import BookingStatus, MeetingStatus
 
 
 class BookingBase(BaseModel):
@@ -13,6 +15,10 @@ class BookingBase(BaseModel):
 class BookingCreate(BookingBase):
     client_name: str = Field(..., min_length=1, max_length=100)
     client_email: EmailStr
+    # start of the unit to book inside the slot, defaults to the first free one
+    start_time: Optional[datetime] = None
+    # token from POST /bookings/holds; books the held unit and releases it
+    hold_token: Optional[str] = Field(None, max_length=64)
 
     @model_validator(mode="after")
     def validate_booking(cls, values):
@@ -21,6 +27,14 @@ class BookingCreate(BookingBase):
         return values
 
 
+class SlotHoldResponse(BaseModel):
+    token: str
+    slot_id: int
+    start_time: datetime
+    end_time: datetime
+    expires_at: datetime
+
+
 class BookingUpdate(BaseModel):
     status: Optional[BookingStatus] = None
 
@@ -30,5 +44,29 @@ class BookingResponse(BookingBase):
     freelancer_id: int = Field(..., ge=1)
     slot_id: int = Field(..., ge=1)
     time: datetime
+    duration_minutes: int = Field(..., ge=1)
     meeting_link: Optional[str] = None
+    meeting_status: Optional[MeetingStatus] = None
     status: BookingStatus = Field(default=BookingStatus.PENDING)
+
+
+class BookingPage(Page[BookingResponse]):
+    # totals per status over all of the freelancer's bookings
+    counts: dict[str, int]
+
+
+class BookingTransition(BaseModel):
+    booking_id: int = Field(..., ge=1)
+    status: BookingStatus
+
+
+class BookingBulkUpdate(BaseModel):
+    items: list[BookingTransition] = Field(..., min_length=1, max_length=200)
+
+
+class BulkBookingResult(BaseModel):
+    index: int
+    booking_id: int
+    updated: bool
+    booking: Optional[BookingResponse] = None
+    error: Optional[ErrorDetail] = None
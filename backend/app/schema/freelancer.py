@@ -37,6 +37,12 @@ class FreelancerCreate(FreelancerBase):
 
 class FreelancerGet(FreelancerBase):
     id: int = Field(..., ge=1, example=1)
+    notification_digest_minutes: int = 0
+
+
+class NotificationSettings(BaseModel):
+    # 0 emails every booking request right away
+    digest_minutes: int = Field(..., ge=0, le=1440, examples=[30])
 
 
 class FreelancerUpdate(FreelancerBase):  # Now inherits from base
@@ -10,3 +10,8 @@ class SuccessResponse(BaseModel, Generic[T]):
     message: Optional[str] = None
     trace_id: Optional[str] = None  # Optional for observability
     documentation_url: Optional[str] = None  # Optional for DX
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
@@ -0,0 +1,133 @@
+import argparse
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.crud.freelancer import bump_availability_versions
+from app.models.bookings import Booking, BookingStatus, MeetingStatus
+
+logger = logging.getLogger(__name__)
+
+
+class BookingLifecycleJob:
+    """
+    Completes confirmed bookings once they have ended and cancels pending
+    requests whose time has passed.
+
+    Each batch is one UPDATE ... WHERE id IN (SELECT ... LIMIT n) driven by
+    the partial index on open bookings; rows locked by a request are skipped
+    and picked up by the next run. No emails are sent for these changes.
+    """
+
+    def __init__(
+        self, session_factory, batch_size: int = settings.BOOKING_LIFECYCLE_BATCH_SIZE
+    ):
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+
+    def run(self) -> dict[str, int]:
+        started = time.monotonic()
+        now = datetime.utcnow()
+        ends_at = Booking.time + func.make_interval(
+            0, 0, 0, 0, 0, Booking.duration_minutes
+        )
+        processed = {
+            "completed": self._drain(
+                BookingStatus.CONFIRMED, BookingStatus.COMPLETED, ends_at <= now, now
+            ),
+            "expired": self._drain(
+                BookingStatus.PENDING, BookingStatus.CANCELLED, Booking.time <= now, now
+            ),
+        }
+        elapsed = time.monotonic() - started
+
+        for name, count in processed.items():
+            metrics.inc(f"booking_lifecycle.{name}", count)
+        metrics.inc("booking_lifecycle.runs")
+        metrics.set_gauge("booking_lifecycle.last_run_seconds", round(elapsed, 3))
+        if any(processed.values()):
+            logger.info("Booking lifecycle run: %s in %.2fs", processed, elapsed)
+        return processed
+
+    def _drain(
+        self, from_status: BookingStatus, to_status: BookingStatus, due, now: datetime
+    ) -> int:
+        total = 0
+        while True:
+            with self._session_factory() as db:
+                count = self._update_batch(db, from_status, to_status, due, now)
+            total += count
+            if count < self._batch_size:
+                return total
+
+    def _update_batch(
+        self,
+        db: Session,
+        from_status: BookingStatus,
+        to_status: BookingStatus,
+        due,
+        now: datetime,
+    ) -> int:
+        batch = (
+            select(Booking.id)
+            # time <= now is the index range, due narrows it down
+            .where(Booking.status == from_status, Booking.time <= now, due)
+            .order_by(Booking.time)
+            .limit(self._batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = db.execute(
+            update(Booking)
+            # the status is checked again in case a request changed the row
+            .where(Booking.id.in_(batch), Booking.status == from_status)
+            .values(
+                status=to_status,
+                # a meeting is no longer worth creating for a past booking
+                meeting_status=case(
+                    (Booking.meeting_status == MeetingStatus.PENDING, None),
+                    else_=Booking.meeting_status,
+                ),
+            )
+            .returning(Booking.freelancer_id)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        if rows:
+            # cached booking counts and ETags follow the availability version
+            bump_availability_versions(db, list({row.freelancer_id for row in rows}))
+        db.commit()
+        return len(rows)
+
+
+def main():
+    """
+    Entry point for cron or a standalone process:
+    python -m app.services.booking_lifecycle [--once]
+    """
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--once", action="store_true", help="run one pass and exit")
+    args = parser.parse_args()
+
+    job = BookingLifecycleJob(SessionLocal)
+    while True:
+        try:
+            job.run()
+        except Exception:
+            logger.exception("Booking lifecycle run failed")
+            if args.once:
+                raise
+        if args.once:
+            return
+        time.sleep(settings.BOOKING_LIFECYCLE_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
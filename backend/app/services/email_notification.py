@@ -1,6 +1,7 @@
-from datetime import datetime
-from app.core.email import send_email
-from app.utils.template_renderer import render_template
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.models.notifications import FreelancerNotification
+from app.services.outbox import enqueue_email
 
 
 def format_time(time: datetime):
@@ -8,60 +9,154 @@ def format_time(time: datetime):
 
 
 def notify_client_on_booking_request(
-    client_email: str, client_name: str, freelancer_name: str, booking_time: datetime
+    db: Session,
+    client_email: str,
+    client_name: str,
+    freelancer_name: str,
+    booking_time: datetime,
 ):
-    subject = "Booking Request Received"
-    html_content = render_template(
-        "client_booking_request.html",
-        client_name=client_name,
-        freelancer_name=freelancer_name,
-        time=format_time(booking_time),
-        current_year=datetime.now().year,
+    enqueue_email(
+        db,
+        to_email=client_email,
+        subject="Booking Request Received",
+        template="client_booking_request.html",
+        context=dict(
+            client_name=client_name,
+            freelancer_name=freelancer_name,
+            time=format_time(booking_time),
+            current_year=datetime.now().year,
+        ),
     )
-    send_email(to_email=client_email, subject=subject, html_content=html_content)
 
 
 def notify_freelancer_on_booking_request(
-    freelancer_name: str, freelancer_email: str, client_name: str, booking_time: datetime
+    db: Session,
+    freelancer_name: str,
+    freelancer_email: str,
+    client_name: str,
+    booking_time: datetime,
+    freelancer_id: int | None = None,
+    booking_id: int | None = None,
+    digest_minutes: int = 0,
 ):
-    subject = "New Booking Request"
-    html_content = render_template(
-        "freelancer_booking_request.html",
-        freelancer_name=freelancer_name,
-        client_name=client_name,
-        booking_time=format_time(booking_time),
-        current_year=datetime.now().year,
+    if digest_minutes > 0 and freelancer_id is not None and booking_id is not None:
+        # picked up by the digest job once the freelancer's window closes
+        db.add(
+            FreelancerNotification(
+                freelancer_id=freelancer_id,
+                booking_id=booking_id,
+                client_name=client_name,
+                booking_time=booking_time,
+                send_after=datetime.utcnow() + timedelta(minutes=digest_minutes),
+            )
+        )
+        return
+
+    enqueue_email(
+        db,
+        to_email=freelancer_email,
+        subject="New Booking Request",
+        template="freelancer_booking_request.html",
+        context=dict(
+            freelancer_name=freelancer_name,
+            client_name=client_name,
+            booking_time=format_time(booking_time),
+            current_year=datetime.now().year,
+        ),
+    )
+
+
+def notify_freelancer_of_booking_requests(
+    db: Session,
+    freelancer_name: str,
+    freelancer_email: str,
+    requests: list[tuple[str, datetime]],
+):
+    """
+    One email for several (client_name, booking_time) requests.
+    """
+    enqueue_email(
+        db,
+        to_email=freelancer_email,
+        subject=f"{len(requests)} New Booking Requests",
+        template="freelancer_booking_digest.html",
+        context=dict(
+            freelancer_name=freelancer_name,
+            requests=[
+                dict(client_name=client_name, booking_time=format_time(booking_time))
+                for client_name, booking_time in requests
+            ],
+            current_year=datetime.now().year,
+        ),
     )
-    send_email(to_email=freelancer_email, subject=subject, html_content=html_content)
 
 
 def notify_client_on_booking_confirmation(
+    db: Session,
     client_email: str,
     client_name: str,
     booking_time: datetime,
     freelancer_name: str,
-    meeting_link: str,
+    meeting_link: str | None,
 ):
-    subject = "Booking Confirmation"
-    html_content = render_template(
-        "client_booking_confirmation.html",
+    context = dict(
         client_name=client_name,
         booking_time=format_time(booking_time),
         freelancer_name=freelancer_name,
-        meeting_link=meeting_link,
         current_year=datetime.now().year,
     )
-    send_email(to_email=client_email, subject=subject, html_content=html_content)
+    # left out rather than None when there is no meeting: the outbox batches
+    # emails by template and context keys, so these never share a body with
+    # the ones that have a link
+    if meeting_link:
+        context["meeting_link"] = meeting_link
+    enqueue_email(
+        db,
+        to_email=client_email,
+        subject="Booking Confirmation",
+        template="client_booking_confirmation.html",
+        context=context,
+    )
+
+
+def notify_freelancer_on_meeting_failure(
+    db: Session,
+    freelancer_name: str,
+    freelancer_email: str,
+    client_name: str,
+    client_email: str,
+    booking_time: datetime,
+):
+    enqueue_email(
+        db,
+        to_email=freelancer_email,
+        subject="Meeting Link Needed",
+        template="freelancer_meeting_failed.html",
+        context=dict(
+            freelancer_name=freelancer_name,
+            client_name=client_name,
+            client_email=client_email,
+            booking_time=format_time(booking_time),
+            current_year=datetime.now().year,
+        ),
+    )
 
 
 def notify_client_on_booking_cancellation(
-    client_email: str, client_name: str, booking_time: datetime, freelancer_name: str
+    db: Session,
+    client_email: str,
+    client_name: str,
+    booking_time: datetime,
+    freelancer_name: str,
 ):
-    subject = "Booking Cancellation"
-    html_content = render_template(
-        "client_booking_cancellation.html",
-        client_name=client_name,
-        booking_time=format_time(booking_time),
-        freelancer_name=freelancer_name,
+    enqueue_email(
+        db,
+        to_email=client_email,
+        subject="Booking Cancellation",
+        template="client_booking_cancellation.html",
+        context=dict(
+            client_name=client_name,
+            booking_time=format_time(booking_time),
+            freelancer_name=freelancer_name,
+        ),
     )
-    send_email(to_email=client_email, subject=subject, html_content=html_content)
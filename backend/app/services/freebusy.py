@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from threading import Lock
+
+from app.core.config import settings
+
+BUCKET = timedelta(minutes=15)
+BUCKETS_PER_DAY = timedelta(days=1) // BUCKET
+BYTES_PER_DAY = BUCKETS_PER_DAY // 8
+
+
+def rasterize(
+    origin: datetime, days: int, free: list[tuple[datetime, datetime]]
+) -> bytes:
+    """
+    Pack free intervals into one bit per 15-minute bucket, most significant
+    bit first. A bucket is only free when the whole bucket is free.
+    """
+    bits = bytearray(days * BYTES_PER_DAY)
+    total = days * BUCKETS_PER_DAY
+    for start, end in free:
+        first = -((origin - start) // BUCKET)  # round up to the next bucket
+        last = (end - origin) // BUCKET
+        for bucket in range(max(first, 0), min(last, total)):
+            bits[bucket >> 3] |= 0x80 >> (bucket & 7)
+    return bytes(bits)
+
+
+class FreeBusyCache:
+    """
+    Per-process LRU of per-day bitmaps, grouped by freelancer and tagged with
+    the availability version they were computed at.
+
+    Every slot, rule and booking write bumps that version in the database,
+    including writes made by other workers and background jobs, so a lookup
+    under a newer version never sees bitmaps computed before the write.
+    """
+
+    def __init__(self, max_freelancers: int):
+        self._max_freelancers = max_freelancers
+        self._days: OrderedDict[int, tuple[int, dict[date, bytes]]] = OrderedDict()
+        self._lock = Lock()
+
+    def lookup(
+        self, freelancer_id: int, version: int, days: list[date]
+    ) -> dict[date, bytes]:
+        """
+        Return the cached bitmaps among the requested days, computed at the
+        given version.
+        """
+        with self._lock:
+            entry = self._days.get(freelancer_id)
+            if entry is None or entry[0] != version:
+                return {}
+            self._days.move_to_end(freelancer_id)
+            cached = entry[1]
+            return {day: cached[day] for day in days if day in cached}
+
+    def store(self, freelancer_id: int, version: int, bitmaps: dict[date, bytes]):
+        with self._lock:
+            entry = self._days.get(freelancer_id)
+            if entry is not None and entry[0] > version:
+                # a request that read a newer version got here first
+                return
+            if entry is None or entry[0] < version:
+                entry = (version, {})
+                self._days[freelancer_id] = entry
+            entry[1].update(bitmaps)
+            self._days.move_to_end(freelancer_id)
+            while len(self._days) > self._max_freelancers:
+                self._days.popitem(last=False)
+
+    def invalidate(self, freelancer_id: int):
+        # frees the memory early; correctness comes from the version
+        with self._lock:
+            self._days.pop(freelancer_id, None)
+
+
+freebusy_cache = FreeBusyCache(max_freelancers=settings.FREEBUSY_CACHE_MAX_FREELANCERS)
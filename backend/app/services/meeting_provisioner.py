@@ -0,0 +1,225 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.freelancer import bump_availability_versions, get_freelancer_contact
+from app.models.bookings import Booking, MeetingStatus
+from app.services.email_notification import (
+    notify_client_on_booking_confirmation,
+    notify_freelancer_on_meeting_failure,
+)
+from app.services.zoom_service import ZoomService
+from app.utils.backoff import backoff_delay
+from app.utils.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class MeetingProvisioner:
+    """
+    Creates Zoom meetings for confirmed bookings outside the request.
+
+    A batch of due bookings is claimed with FOR UPDATE SKIP LOCKED by moving
+    their next attempt a lease into the future, and that transaction commits
+    before Zoom is called, so no row lock is held during the calls. The
+    calls run on a bounded thread pool, and their results are written in a
+    second short transaction, only for bookings still holding this claim.
+    A worker that dies mid-batch leaves its bookings to be retried once the
+    lease runs out.
+
+    Once a link is stored, the confirmation email goes to the outbox in the
+    same transaction. When the last attempt fails, the client still gets
+    the confirmation, without a link, and the freelancer is asked to send
+    one.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        concurrency: int = settings.ZOOM_PROVISION_CONCURRENCY,
+        batch_size: int = settings.ZOOM_PROVISION_BATCH_SIZE,
+        max_attempts: int = settings.ZOOM_PROVISION_MAX_ATTEMPTS,
+        lease: timedelta = timedelta(seconds=settings.ZOOM_PROVISION_LEASE_SECONDS),
+    ):
+        self._session_factory = session_factory
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="zoom"
+        )
+        self._batch_size = batch_size
+        self._max_attempts = max_attempts
+        self._lease = lease
+
+    def drain(self) -> int:
+        """
+        Provision every booking that is due and return how many got a link.
+        """
+        provisioned = 0
+        while True:
+            with self._session_factory() as db:
+                claimed, claimed_until = self._claim_batch(db)
+            if claimed:
+                outcomes = self._create_meetings(claimed)
+                with self._session_factory() as db:
+                    provisioned += self._record_outcomes(db, outcomes, claimed_until)
+            if len(claimed) < self._batch_size:
+                return provisioned
+
+    def _claim_batch(self, db: Session) -> tuple[list, datetime]:
+        now = datetime.utcnow()
+        claimed_until = now + self._lease
+        due = (
+            select(Booking.id)
+            .where(
+                Booking.meeting_status == MeetingStatus.PENDING,
+                Booking.meeting_next_attempt_at <= now,
+            )
+            .order_by(Booking.meeting_next_attempt_at)
+            .limit(self._batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = db.execute(
+            update(Booking)
+            .where(Booking.id.in_(due))
+            .values(meeting_next_attempt_at=claimed_until)
+            .returning(
+                Booking.id,
+                Booking.client_name,
+                Booking.time,
+                Booking.duration_minutes,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        return claimed, claimed_until
+
+    def _create_meetings(self, claimed: list) -> dict[int, dict | Exception]:
+        calls = {
+            booking.id: self._executor.submit(
+                ZoomService.create_meeting,
+                topic=f"Booking #{booking.id} with {booking.client_name}",
+                start_time=booking.time,
+                duration=booking.duration_minutes,
+            )
+            for booking in claimed
+        }
+        outcomes = {}
+        for booking_id, call in calls.items():
+            try:
+                outcomes[booking_id] = call.result()
+            except Exception as e:
+                outcomes[booking_id] = e
+        return outcomes
+
+    def _record_outcomes(
+        self, db: Session, outcomes: dict[int, dict | Exception], claimed_until
+    ) -> int:
+        now = datetime.utcnow()
+        bookings = (
+            db.query(Booking)
+            .filter(
+                Booking.id.in_(outcomes.keys()),
+                # skips bookings cancelled or completed during the calls, and
+                # ones whose lease ran out and were claimed again
+                Booking.meeting_status == MeetingStatus.PENDING,
+                Booking.meeting_next_attempt_at == claimed_until,
+            )
+            .with_for_update()
+            .all()
+        )
+        for booking_id in outcomes.keys() - {booking.id for booking in bookings}:
+            if not isinstance(outcomes[booking_id], Exception):
+                logger.warning(
+                    "Booking %s changed while its meeting was created, "
+                    "dropping the meeting link",
+                    booking_id,
+                )
+
+        provisioned = 0
+        changed_freelancers = set()
+        for booking in bookings:
+            outcome = outcomes[booking.id]
+            if isinstance(outcome, CircuitOpenError):
+                # Zoom is down, not this booking: retry once the circuit may
+                # close, without using up an attempt
+                booking.meeting_next_attempt_at = now + timedelta(
+                    seconds=max(outcome.retry_in, 1)
+                )
+                continue
+            if isinstance(outcome, Exception):
+                booking.meeting_attempts += 1
+                if booking.meeting_attempts >= self._max_attempts:
+                    booking.meeting_status = MeetingStatus.FAILED
+                    changed_freelancers.add(booking.freelancer_id)
+                    logger.error(
+                        "Giving up on meeting for booking %s: %s", booking.id, outcome
+                    )
+                    self._announce(db, booking)
+                else:
+                    booking.meeting_next_attempt_at = now + backoff_delay(
+                        booking.meeting_attempts,
+                        settings.ZOOM_RETRY_BASE_SECONDS,
+                        settings.ZOOM_RETRY_MAX_SECONDS,
+                    )
+                continue
+
+            booking.meeting_link = outcome["join_url"]
+            booking.meeting_status = MeetingStatus.READY
+            changed_freelancers.add(booking.freelancer_id)
+            provisioned += 1
+            self._announce(db, booking)
+
+        if changed_freelancers:
+            # booking reads carry ETags derived from the availability version
+            bump_availability_versions(db, list(changed_freelancers))
+        db.commit()
+        return provisioned
+
+    def _announce(self, db: Session, booking: Booking):
+        """
+        Queue the client's confirmation and, when no meeting could be made,
+        ask the freelancer to send a link themselves.
+        """
+        contact = get_freelancer_contact(db, booking.freelancer_id)
+        notify_client_on_booking_confirmation(
+            db,
+            client_email=booking.client_email,
+            client_name=booking.client_name,
+            booking_time=booking.time,
+            freelancer_name=contact["freelancer_name"],
+            meeting_link=booking.meeting_link,
+        )
+        if booking.meeting_status == MeetingStatus.FAILED:
+            notify_freelancer_on_meeting_failure(
+                db,
+                freelancer_name=contact["freelancer_name"],
+                freelancer_email=contact["freelancer_email"],
+                client_name=booking.client_name,
+                client_email=booking.client_email,
+                booking_time=booking.time,
+            )
+
+
+def run_forever():
+    """
+    Entry point of the standalone worker process:
+    python -m app.services.meeting_provisioner
+    """
+    from app.db.session import SessionLocal
+
+    provisioner = MeetingProvisioner(SessionLocal)
+    while True:
+        try:
+            provisioner.drain()
+        except Exception:
+            logger.exception("Meeting provisioning failed")
+        time.sleep(settings.ZOOM_PROVISION_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_forever()
@@ -0,0 +1,140 @@
+import logging
+import time
+from datetime import datetime
+from itertools import groupby
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.crud.freelancer import get_freelancer_contact
+from app.models.bookings import Booking, BookingStatus
+from app.models.notifications import FreelancerNotification
+from app.services.email_notification import (
+    notify_freelancer_of_booking_requests,
+    notify_freelancer_on_booking_request,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDigestJob:
+    """
+    Turns the queued booking requests of freelancers in digest mode into
+    one outbox email per freelancer once their window has closed.
+
+    Queue rows are claimed with FOR UPDATE SKIP LOCKED and deleted in the
+    same transaction that writes the email to the outbox. Requests that are
+    no longer pending (cancelled, expired or already answered) are dropped
+    without being mentioned.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        batch_size: int = settings.NOTIFICATION_DIGEST_BATCH_SIZE,
+    ):
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+
+    def run(self) -> int:
+        """
+        Queue every digest that is due and return how many were queued.
+        """
+        queued = 0
+        while True:
+            with self._session_factory() as db:
+                batch_queued, batch_size = self._flush_batch(db)
+            queued += batch_queued
+            # a freelancer whose requests were all dropped queues no digest,
+            # so only a short batch of freelancers means the queue is drained
+            if batch_size < self._batch_size:
+                return queued
+
+    def _flush_batch(self, db: Session) -> tuple[int, int]:
+        due = (
+            select(FreelancerNotification.freelancer_id)
+            .where(FreelancerNotification.send_after <= datetime.utcnow())
+            .distinct()
+            .order_by(FreelancerNotification.freelancer_id)
+            .limit(self._batch_size)
+        )
+        # a window closes once the oldest queued row's send_after has passed;
+        # the rows queued after it go out in the same digest
+        rows = (
+            db.query(FreelancerNotification, Booking.status)
+            .join(Booking, Booking.id == FreelancerNotification.booking_id)
+            .filter(FreelancerNotification.freelancer_id.in_(due))
+            .order_by(
+                FreelancerNotification.freelancer_id,
+                FreelancerNotification.booking_time,
+            )
+            .with_for_update(of=FreelancerNotification, skip_locked=True)
+            .all()
+        )
+
+        digests = 0
+        freelancers = 0
+        for freelancer_id, group in groupby(
+            rows, key=lambda row: row.FreelancerNotification.freelancer_id
+        ):
+            group = list(group)
+            freelancers += 1
+            pending = [
+                notification
+                for notification, status in group
+                if status == BookingStatus.PENDING
+            ]
+            contact = get_freelancer_contact(db, freelancer_id)
+            if contact and pending:
+                self._notify(db, contact, pending)
+                digests += 1
+                metrics.inc("notifications.digests")
+                metrics.inc("notifications.coalesced", len(pending))
+            metrics.inc("notifications.dropped", len(group) - len(pending))
+            for notification, _ in group:
+                db.delete(notification)
+
+        db.commit()
+        return digests, freelancers
+
+    def _notify(
+        self, db: Session, contact: dict, group: list[FreelancerNotification]
+    ):
+        if len(group) == 1:
+            notify_freelancer_on_booking_request(
+                db,
+                freelancer_name=contact["freelancer_name"],
+                freelancer_email=contact["freelancer_email"],
+                client_name=group[0].client_name,
+                booking_time=group[0].booking_time,
+            )
+            return
+        notify_freelancer_of_booking_requests(
+            db,
+            freelancer_name=contact["freelancer_name"],
+            freelancer_email=contact["freelancer_email"],
+            requests=[(n.client_name, n.booking_time) for n in group],
+        )
+
+
+def run_forever():
+    """
+    Entry point of the standalone worker process:
+    python -m app.services.notification_digest
+    """
+    from app.db.session import SessionLocal
+
+    job = NotificationDigestJob(SessionLocal)
+    while True:
+        try:
+            job.run()
+        except Exception:
+            logger.exception("Notification digest run failed")
+        time.sleep(settings.NOTIFICATION_DIGEST_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_forever()
@@ -0,0 +1,186 @@
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from markupsafe import escape
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.email import EmailBatch, EmailTransport, Recipient, get_email_transport
+from app.core.metrics import metrics
+from app.models.outbox import OutboxMessage, OutboxStatus
+from app.utils.backoff import backoff_delay
+from app.utils.template_renderer import render_template
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(
+    db: Session, to_email: str, subject: str, template: str, context: dict
+) -> None:
+    """
+    Add an email to the caller's transaction; it is only delivered if the
+    caller commits.
+    """
+    db.add(
+        OutboxMessage(
+            to_email=to_email, subject=subject, template=template, context=context
+        )
+    )
+
+
+class OutboxWorker:
+    """
+    Drains the email outbox in batches. Rows are claimed with
+    FOR UPDATE SKIP LOCKED, so several workers can run side by side, and
+    messages of one template go to the transport as a single batch.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        transport: EmailTransport,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+    ):
+        self._session_factory = session_factory
+        self._transport = transport
+        self._batch_size = batch_size
+        self._max_attempts = max_attempts
+
+    def drain(self) -> int:
+        """
+        Deliver every message that is due and return how many were sent.
+        """
+        sent = 0
+        while True:
+            with self._session_factory() as db:
+                batch_sent, batch_size = self._deliver_batch(db)
+            sent += batch_sent
+            if batch_size < self._batch_size:
+                return sent
+
+    def _deliver_batch(self, db: Session) -> tuple[int, int]:
+        now = datetime.utcnow()
+        messages = (
+            db.query(OutboxMessage)
+            .filter(
+                OutboxMessage.status == OutboxStatus.PENDING,
+                OutboxMessage.next_attempt_at <= now,
+            )
+            .order_by(OutboxMessage.next_attempt_at)
+            .limit(self._batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        # messages of one template share a body and differ by substitutions
+        groups: defaultdict[tuple, list[OutboxMessage]] = defaultdict(list)
+        for message in messages:
+            groups[_batch_key(message)].append(message)
+
+        sent = 0
+        for group in groups.values():
+            errors = self._send_group(group)
+            for message, error in zip(group, errors):
+                if error is not None:
+                    self._record_failure(message, error, now)
+                    continue
+                message.status = OutboxStatus.SENT
+                message.sent_at = datetime.utcnow()
+                sent += 1
+
+        db.commit()
+        return sent, len(messages)
+
+    def _send_group(self, group: list[OutboxMessage]) -> list[Exception | None]:
+        started = time.monotonic()
+        try:
+            errors = self._transport.send_batch(_build_batch(group))
+        except Exception as e:
+            errors = [e] * len(group)
+
+        failed = sum(error is not None for error in errors)
+        metrics.inc("email.batches")
+        metrics.observe("email.batch_ms", (time.monotonic() - started) * 1000)
+        metrics.inc("email.sent", len(group) - failed)
+        metrics.inc("email.failed", failed)
+        return errors
+
+    def _record_failure(self, message: OutboxMessage, error: Exception, now):
+        message.attempts += 1
+        message.last_error = str(error)[:1000]
+        if message.attempts >= self._max_attempts:
+            message.status = OutboxStatus.FAILED
+            logger.error("Giving up on outbox message %s: %s", message.id, error)
+        else:
+            message.next_attempt_at = now + backoff_delay(
+                message.attempts,
+                settings.OUTBOX_RETRY_BASE_SECONDS,
+                settings.OUTBOX_RETRY_MAX_SECONDS,
+            )
+
+
+def _batch_key(message: OutboxMessage) -> tuple:
+    if all(
+        value is None or isinstance(value, (str, int, float))
+        for value in message.context.values()
+    ):
+        return (message.template, tuple(sorted(message.context)))
+    # lists and dicts are looped over by the template, so it has to be
+    # rendered with the real context
+    return (message.template, message.id)
+
+
+def _build_batch(group: list[OutboxMessage]) -> EmailBatch:
+    first = group[0]
+    if len(group) == 1:
+        return EmailBatch(
+            html_content=render_template(first.template, **first.context),
+            recipients=[Recipient(to_email=first.to_email, subject=first.subject)],
+        )
+
+    # plain values are only interpolated, so rendering the template once with
+    # placeholders and substituting escaped values per recipient gives the
+    # same email as rendering it for each of them
+    return EmailBatch(
+        html_content=render_template(
+            first.template, **{key: _placeholder(key) for key in first.context}
+        ),
+        recipients=[
+            Recipient(
+                to_email=message.to_email,
+                subject=message.subject,
+                substitutions={
+                    _placeholder(key): str(escape(value))
+                    for key, value in message.context.items()
+                },
+            )
+            for message in group
+        ],
+    )
+
+
+def _placeholder(key: str) -> str:
+    return f"%{key}%"
+
+
+def run_forever():
+    """
+    Entry point of the standalone worker process: python -m app.services.outbox
+    """
+    from app.db.session import SessionLocal
+
+    worker = OutboxWorker(SessionLocal, get_email_transport())
+    while True:
+        try:
+            worker.drain()
+        except Exception:
+            logger.exception("Outbox drain failed")
+        time.sleep(settings.OUTBOX_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_forever()
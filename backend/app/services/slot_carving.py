@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from app.core.config import settings
+
+
+class SlotCarver:
+    """
+    Splits an availability window into bookable units of a fixed duration.
+
+    Units sit on a grid anchored at the slot start, one every
+    duration + buffer. A unit is free when no taken interval comes within
+    the buffer of it, so off-grid bookings made under an older
+    configuration still block the units around them.
+    """
+
+    def __init__(self, duration: timedelta, buffer: timedelta = timedelta(0)):
+        self.duration = duration
+        self.buffer = buffer
+
+    def units(self, slot_start: datetime, slot_end: datetime) -> Iterator[datetime]:
+        unit_start = slot_start
+        while unit_start + self.duration <= slot_end:
+            yield unit_start
+            unit_start += self.duration + self.buffer
+
+    def is_free(
+        self, unit_start: datetime, taken: list[tuple[datetime, datetime]]
+    ) -> bool:
+        blocked_from = unit_start - self.buffer
+        blocked_until = unit_start + self.duration + self.buffer
+        return not any(
+            start < blocked_until and end > blocked_from for start, end in taken
+        )
+
+    def free_units(
+        self,
+        slot_start: datetime,
+        slot_end: datetime,
+        taken: list[tuple[datetime, datetime]],
+    ) -> list[datetime]:
+        return [
+            unit_start
+            for unit_start in self.units(slot_start, slot_end)
+            if self.is_free(unit_start, taken)
+        ]
+
+
+carver = SlotCarver(
+    duration=timedelta(minutes=settings.BOOKING_DURATION_MINUTES),
+    buffer=timedelta(minutes=settings.BOOKING_BUFFER_MINUTES),
+)
@@ -0,0 +1,172 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timezone
+from threading import Lock
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.availability import AvailableSlot
+
+
+def normalize_time(value: datetime) -> datetime:
+    """
+    Slots are stored as naive UTC timestamps, so aware datetimes coming from
+    request payloads are converted before they are compared with the index.
+    """
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class SlotIntervalIndex:
+    """
+    Sorted-array index over one freelancer's slots.
+
+    Slots of a freelancer never overlap, so ordering them by start_time also
+    orders them by end_time and every lookup can bisect either list.
+
+    Writes are copy-on-write: add() and remove() build new arrays and swap
+    them in with one assignment, so a lookup works on a consistent snapshot
+    without taking a lock. Writers must still be serialized by the caller.
+    """
+
+    def __init__(self, slots=()):
+        entries = sorted((start, end, slot_id) for slot_id, start, end in slots)
+        # (starts, ends, ids), replaced as a whole on every write
+        self._arrays = (
+            [entry[0] for entry in entries],
+            [entry[1] for entry in entries],
+            [entry[2] for entry in entries],
+        )
+        self._start_by_id = {entry[2]: entry[0] for entry in entries}
+
+    def __len__(self) -> int:
+        return len(self._arrays[2])
+
+    def add(self, slot_id: int, start: datetime, end: datetime) -> None:
+        if slot_id in self._start_by_id:
+            self.remove(slot_id)
+        starts, ends, ids = self._arrays
+        position = bisect_left(starts, start)
+        self._arrays = (
+            starts[:position] + [start] + starts[position:],
+            ends[:position] + [end] + ends[position:],
+            ids[:position] + [slot_id] + ids[position:],
+        )
+        self._start_by_id[slot_id] = start
+
+    def remove(self, slot_id: int) -> None:
+        start = self._start_by_id.pop(slot_id, None)
+        if start is None:
+            return
+        starts, ends, ids = self._arrays
+        position = bisect_left(starts, start)
+        while ids[position] != slot_id:
+            position += 1
+        self._arrays = (
+            starts[:position] + starts[position + 1 :],
+            ends[:position] + ends[position + 1 :],
+            ids[:position] + ids[position + 1 :],
+        )
+
+    def find_overlap(
+        self, start: datetime, end: datetime, exclude_slot_id: int | None = None
+    ) -> int | None:
+        """
+        Return the id of a slot overlapping [start, end), or None.
+        """
+        start, end = normalize_time(start), normalize_time(end)
+        starts, ends, ids = self._arrays
+        # first slot that ends after the requested start
+        position = bisect_right(ends, start)
+        if position < len(ids) and ids[position] == exclude_slot_id:
+            position += 1
+        if position < len(ids) and starts[position] < end:
+            return ids[position]
+        return None
+
+    def free_gaps(
+        self, window_start: datetime, window_end: datetime
+    ) -> list[tuple[datetime, datetime]]:
+        """
+        Return the parts of [window_start, window_end) not covered by any slot.
+        """
+        window_start = normalize_time(window_start)
+        window_end = normalize_time(window_end)
+        starts, ends, ids = self._arrays
+        gaps = []
+        cursor = window_start
+        position = bisect_right(ends, window_start)
+        while position < len(ids) and starts[position] < window_end:
+            if starts[position] > cursor:
+                gaps.append((cursor, starts[position]))
+            cursor = max(cursor, ends[position])
+            position += 1
+        if cursor < window_end:
+            gaps.append((cursor, window_end))
+        return gaps
+
+
+class SlotIndexCache:
+    """
+    Per-process LRU of freelancer slot indexes.
+
+    Indexes are built from the database on a cache miss and then kept in
+    sync by the slot CRUD functions after each successful commit.
+    """
+
+    def __init__(self, max_freelancers: int):
+        self._max_freelancers = max_freelancers
+        self._indexes: OrderedDict[int, SlotIntervalIndex] = OrderedDict()
+        # bumped on every write so a rebuild racing with a commit is discarded
+        self._generations: dict[int, int] = {}
+        self._lock = Lock()
+
+    def get(self, db: Session, freelancer_id: int) -> SlotIntervalIndex:
+        with self._lock:
+            index = self._indexes.get(freelancer_id)
+            if index is not None:
+                self._indexes.move_to_end(freelancer_id)
+                return index
+            generation = self._generations.get(freelancer_id, 0)
+
+        rows = (
+            db.query(AvailableSlot.id, AvailableSlot.start_time, AvailableSlot.end_time)
+            .filter(AvailableSlot.freelancer_id == freelancer_id)
+            .all()
+        )
+        index = SlotIntervalIndex(rows)
+
+        with self._lock:
+            if self._generations.get(freelancer_id, 0) == generation:
+                self._indexes[freelancer_id] = index
+                self._indexes.move_to_end(freelancer_id)
+                while len(self._indexes) > self._max_freelancers:
+                    self._indexes.popitem(last=False)
+        return index
+
+    def add(self, freelancer_id: int, slot_id: int, start: datetime, end: datetime):
+        with self._lock:
+            self._bump(freelancer_id)
+            index = self._indexes.get(freelancer_id)
+            if index is not None:
+                index.add(slot_id, start, end)
+
+    def remove(self, freelancer_id: int, slot_id: int):
+        with self._lock:
+            self._bump(freelancer_id)
+            index = self._indexes.get(freelancer_id)
+            if index is not None:
+                index.remove(slot_id)
+
+    def invalidate(self, freelancer_id: int):
+        with self._lock:
+            self._bump(freelancer_id)
+            self._indexes.pop(freelancer_id, None)
+
+    def _bump(self, freelancer_id: int):
+        self._generations[freelancer_id] = self._generations.get(freelancer_id, 0) + 1
+
+
+slot_index_cache = SlotIndexCache(max_freelancers=settings.SLOT_INDEX_MAX_FREELANCERS)
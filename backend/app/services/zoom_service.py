@@ -1,42 +1,324 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
 import requests
-from app.services.zoom_token_manager import ZoomTokenManager
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.zoom_token_manager import ZoomTokenManager, zoom_token_manager
+from app.utils.backoff import backoff_delay
+from app.utils.circuit_breaker import CircuitBreaker
 
-class ZoomService:
-    @staticmethod
-    def create_meeting(topic: str, start_time: datetime, duration: int = 50):
-        token = ZoomTokenManager.get_token()
-
-        print("Creating Zoom meeting with token:", token)
-
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
-
-        data = {
-            "topic": topic,
-            "type": 2,
-            "start_time": start_time.isoformat(),
-            "duration": duration,
-            "timezone": "Asia/Dhaka",
-            "settings": {
-                "host_video": True,
-                "participant_video": True,
-                "join_before_host": False,
-                "mute_upon_entry": True,
-            },
-        }
+# statuses after which Zoom did not act on the request and asks to retry
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ZoomAPIError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ZoomRequestRejected(ZoomAPIError):
+    """
+    Zoom answered but refused the request (4xx); retrying will not help and
+    Zoom itself is up.
+    """
+
+
+def _meeting_payload(topic: str, start_time: datetime, duration: int) -> dict:
+    return {
+        "topic": topic,
+        "type": 2,
+        "start_time": start_time.isoformat(),
+        "duration": duration,
+        "timezone": "Asia/Dhaka",
+        "settings": {
+            "host_video": True,
+            "participant_video": True,
+            "join_before_host": False,
+            "mute_upon_entry": True,
+        },
+    }
+
+
+def _response_error(status_code: int, text: str) -> ZoomAPIError:
+    message = f"Zoom returned {status_code}: {text[:200]}"
+    if status_code in RETRY_STATUSES:
+        return ZoomAPIError(message, status_code)
+    return ZoomRequestRejected(message, status_code)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait before the next attempt, or None to give up.
+    """
+    if attempt > settings.ZOOM_HTTP_MAX_RETRIES:
+        return None
+    delay = backoff_delay(
+        attempt,
+        settings.ZOOM_HTTP_RETRY_BASE_SECONDS,
+        settings.ZOOM_HTTP_RETRY_MAX_SECONDS,
+    ).total_seconds()
+    wait = _parse_retry_after(retry_after)
+    if wait is not None:
+        if wait > settings.ZOOM_HTTP_RETRY_MAX_SECONDS:
+            # too long to hold a worker; the provisioner retries the booking
+            return None
+        delay = max(delay, wait)
+    return delay
+
+
+def _never_connected(error: requests.ConnectionError) -> bool:
+    """
+    True when no connection to Zoom was made, so the request was never sent.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    # requests wraps urllib3's MaxRetryError, whose reason is the real failure
+    cause = error.args[0] if error.args else None
+    return isinstance(getattr(cause, "reason", cause), NewConnectionError)
+
+
+def _observe(kind: str, started: float, outcome: str):
+    # kind is "request" for one HTTP attempt, "call" for all attempts of a call
+    metrics.observe(f"zoom.{kind}_ms", (time.monotonic() - started) * 1000)
+    metrics.inc(f"zoom.{kind}s.{outcome}")
+
+
+zoom_breaker = CircuitBreaker(
+    "zoom", settings.ZOOM_BREAKER_FAILURES, settings.ZOOM_BREAKER_RESET_SECONDS
+)
 
+
+class ZoomClient:
+    """
+    Zoom API client over one pooled keep-alive session, with connect and
+    read timeouts, jittered retries on 429/5xx that honor Retry-After, and
+    a circuit breaker that fails fast while Zoom is down.
+
+    Transport errors are retried only when no connection was made (connect
+    timeouts, refused or unresolvable hosts). A read timeout, a reset after
+    the request was sent, or any other transport error is not: Zoom may
+    already have created the meeting, and the provisioner decides what to
+    do next.
+    """
+
+    def __init__(
+        self,
+        base_url: str = settings.ZOOM_API_BASE_URL,
+        token_manager: ZoomTokenManager = zoom_token_manager,
+        breaker: CircuitBreaker = zoom_breaker,
+    ):
+        self._base_url = base_url.rstrip("/")
+        self._tokens = token_manager
+        self._breaker = breaker
+        self._timeout = (
+            settings.ZOOM_CONNECT_TIMEOUT_SECONDS,
+            settings.ZOOM_TIMEOUT_SECONDS,
+        )
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=settings.ZOOM_HTTP_POOL_SIZE)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def create_meeting(self, topic: str, start_time: datetime, duration: int = 50):
+        return self.request(
+            "POST",
+            "/users/me/meetings",
+            _meeting_payload(topic, start_time, duration),
+            expected_status=201,
+        )
+
+    def request(
+        self, method: str, path: str, payload=None, expected_status: int = 200
+    ) -> dict:
+        self._breaker.before_call()
+        started = time.monotonic()
         try:
-            response = requests.post(
-                "https://api.zoom.us/v2/users/me/meetings", headers=headers, json=data
+            result = self._request_with_retries(method, path, payload, expected_status)
+        except ZoomRequestRejected:
+            self._breaker.record_success()
+            _observe("call", started, "rejected")
+            raise
+        except Exception:
+            self._breaker.record_failure()
+            _observe("call", started, "failed")
+            raise
+        self._breaker.record_success()
+        _observe("call", started, "ok")
+        return result
+
+    def _request_with_retries(
+        self, method: str, path: str, payload, expected_status: int
+    ) -> dict:
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            headers = {"Authorization": f"Bearer {self._tokens.get_token()}"}
+            started = time.monotonic()
+            try:
+                response = self._session.request(
+                    method,
+                    self._base_url + path,
+                    json=payload,
+                    headers=headers,
+                    timeout=self._timeout,
+                )
+            except requests.ConnectionError as e:
+                if not _never_connected(e):
+                    _observe("request", started, "error")
+                    raise ZoomAPIError(f"Zoom request failed: {e}")
+                _observe("request", started, "connect_error")
+                error = ZoomAPIError(f"Zoom request failed: {e}")
+            except requests.Timeout as e:
+                _observe("request", started, "timeout")
+                raise ZoomAPIError(f"Zoom request timed out: {e}")
+            except requests.RequestException as e:
+                _observe("request", started, "error")
+                raise ZoomAPIError(f"Zoom request failed: {e}")
+            else:
+                _observe("request", started, str(response.status_code))
+                if response.status_code == expected_status:
+                    return response.json()
+                error = _response_error(response.status_code, response.text)
+                if isinstance(error, ZoomRequestRejected):
+                    raise error
+                retry_after = response.headers.get("Retry-After")
+
+            delay = _retry_delay(attempt, retry_after)
+            if delay is None:
+                raise error
+            metrics.inc("zoom.retries")
+            time.sleep(delay)
+
+
+class AsyncZoomClient:
+    """
+    The same client for async callers, over a pooled httpx.AsyncClient, with
+    the same retry rules: only ConnectError and ConnectTimeout are retried.
+    Call aclose() on shutdown.
+    """
+
+    def __init__(
+        self,
+        base_url: str = settings.ZOOM_API_BASE_URL,
+        token_manager: ZoomTokenManager = zoom_token_manager,
+        breaker: CircuitBreaker = zoom_breaker,
+    ):
+        self._tokens = token_manager
+        self._breaker = breaker
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            timeout=httpx.Timeout(
+                settings.ZOOM_TIMEOUT_SECONDS,
+                connect=settings.ZOOM_CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(max_connections=settings.ZOOM_HTTP_POOL_SIZE),
+        )
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def create_meeting(
+        self, topic: str, start_time: datetime, duration: int = 50
+    ) -> dict:
+        return await self.request(
+            "POST",
+            "/users/me/meetings",
+            _meeting_payload(topic, start_time, duration),
+            expected_status=201,
+        )
+
+    async def request(
+        self, method: str, path: str, payload=None, expected_status: int = 200
+    ) -> dict:
+        self._breaker.before_call()
+        started = time.monotonic()
+        try:
+            result = await self._request_with_retries(
+                method, path, payload, expected_status
             )
-        except requests.RequestException as e:
-            raise Exception("Zoom API request failed", str(e))
+        except ZoomRequestRejected:
+            self._breaker.record_success()
+            _observe("call", started, "rejected")
+            raise
+        except Exception:
+            self._breaker.record_failure()
+            _observe("call", started, "failed")
+            raise
+        self._breaker.record_success()
+        _observe("call", started, "ok")
+        return result
+
+    async def _request_with_retries(
+        self, method: str, path: str, payload, expected_status: int
+    ) -> dict:
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            # a token refresh does blocking I/O, keep it off the event loop
+            token = await asyncio.to_thread(self._tokens.get_token)
+            started = time.monotonic()
+            try:
+                response = await self._client.request(
+                    method,
+                    path,
+                    json=payload,
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # the request never reached Zoom
+                _observe("request", started, "connect_error")
+                error = ZoomAPIError(f"Zoom request failed: {e}")
+            except httpx.TimeoutException as e:
+                _observe("request", started, "timeout")
+                raise ZoomAPIError(f"Zoom request timed out: {e}")
+            except httpx.HTTPError as e:
+                _observe("request", started, "error")
+                raise ZoomAPIError(f"Zoom request failed: {e}")
+            else:
+                _observe("request", started, str(response.status_code))
+                if response.status_code == expected_status:
+                    return response.json()
+                error = _response_error(response.status_code, response.text)
+                if isinstance(error, ZoomRequestRejected):
+                    raise error
+                retry_after = response.headers.get("Retry-After")
+
+            delay = _retry_delay(attempt, retry_after)
+            if delay is None:
+                raise error
+            metrics.inc("zoom.retries")
+            await asyncio.sleep(delay)
 
-        if response.status_code != 201:
-            raise Exception("Zoom meeting creation failed", response.text)
 
-        return response.json()
+zoom_client = ZoomClient()
+
+
+class ZoomService:
+    @staticmethod
+    def create_meeting(topic: str, start_time: datetime, duration: int = 50):
+        return zoom_client.create_meeting(topic, start_time, duration)
@@ -1,21 +1,159 @@
+import fcntl
+import json
+import logging
+import os
+import tempfile
 import time
-import requests
+from abc import ABC, abstractmethod
 from base64 import b64encode
-from app.core.config import settings  # adjust path as needed
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Iterator, Optional
+
+import requests
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# (access_token, expires_at as a unix timestamp)
+Token = tuple[str, float]
+
+
+class TokenStore(ABC):
+    """
+    Where the Zoom token is shared between worker processes. lock() is held
+    while a token is fetched, so only one process calls the OAuth endpoint.
+    """
+
+    @abstractmethod
+    def load(self) -> Optional[Token]: ...
+
+    @abstractmethod
+    def save(self, token: Token) -> None: ...
+
+    @abstractmethod
+    def lock(self): ...
+
+
+class FileTokenStore(TokenStore):
+    """
+    Shares the token between the workers of one host through a file,
+    guarded by an flock on a sibling lock file.
+    """
+
+    def __init__(self, path: str):
+        self._path = Path(path)
+        self._lock_path = self._path.with_name(self._path.name + ".lock")
+
+    def load(self) -> Optional[Token]:
+        try:
+            data = json.loads(self._path.read_text())
+            return data["access_token"], data["expires_at"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, token: Token) -> None:
+        access_token, expires_at = token
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        # the token grants API access, so only the app's user may read it
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"access_token": access_token, "expires_at": expires_at}, f)
+        os.replace(tmp_path, self._path)
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        with open(self._lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RedisTokenStore(TokenStore):
+    """
+    Shares the token between workers on any host. Needs the optional
+    `redis` package.
+    """
+
+    KEY = "zoom:token"
+
+    def __init__(self, url: str):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+
+    def load(self) -> Optional[Token]:
+        data = self._redis.get(self.KEY)
+        if data is None:
+            return None
+        data = json.loads(data)
+        return data["access_token"], data["expires_at"]
+
+    def save(self, token: Token) -> None:
+        access_token, expires_at = token
+        self._redis.set(
+            self.KEY,
+            json.dumps({"access_token": access_token, "expires_at": expires_at}),
+            ex=max(1, int(expires_at - time.time())),
+        )
+
+    def lock(self):
+        # expires on its own if the holder dies mid-fetch
+        return self._redis.lock(
+            f"{self.KEY}:lock", timeout=settings.ZOOM_TIMEOUT_SECONDS * 2
+        )
 
 
 class ZoomTokenManager:
-    _access_token = None
-    _expires_at = 0
+    """
+    Caches the Zoom server-to-server OAuth token.
 
-    @classmethod
-    def get_token(cls) -> str:
-        current_time = int(time.time())
+    Refreshes are single-flight: threads of one process wait on a lock,
+    processes wait on the store's lock, and whoever gets it second finds
+    the token already renewed in the store.
+    """
 
-        if cls._access_token and current_time < cls._expires_at:
-            return cls._access_token
+    def __init__(self, store: TokenStore):
+        self._store = store
+        self._token: Optional[Token] = None
+        self._lock = Lock()
 
-        # Fetch new token
+    def get_token(self) -> str:
+        return self._get(valid_for=0)[0]
+
+    def renew_if_expiring(self) -> None:
+        """
+        Background job: renew the token ahead of its expiry so requests
+        never wait on the OAuth call. Does nothing before the first token.
+        """
+        if self._token is None and self._store.load() is None:
+            return
+        self._get(valid_for=settings.ZOOM_TOKEN_RENEW_BEFORE_SECONDS)
+
+    def _get(self, valid_for: float) -> Token:
+        token = self._token
+        if _is_fresh(token, valid_for):
+            return token
+
+        with self._lock:
+            token = self._token
+            if not _is_fresh(token, valid_for):
+                token = self._store.load()
+            if not _is_fresh(token, valid_for):
+                with self._store.lock():
+                    token = self._store.load()
+                    if not _is_fresh(token, valid_for):
+                        token = self._fetch()
+                        self._store.save(token)
+            self._token = token
+            return token
+
+    def _fetch(self) -> Token:
         auth_string = f"{settings.ZOOM_CLIENT_ID}:{settings.ZOOM_CLIENT_SECRET}"
         auth_bytes = b64encode(auth_string.encode()).decode()
 
@@ -25,15 +163,36 @@ class ZoomTokenManager:
         }
 
         response = requests.post(
-            f"https://zoom.us/oauth/token?grant_type=account_credentials&account_id={settings.ZOOM_ACCOUNT_ID}",
+            settings.ZOOM_OAUTH_URL,
+            params={
+                "grant_type": "account_credentials",
+                "account_id": settings.ZOOM_ACCOUNT_ID,
+            },
             headers=headers,
+            timeout=settings.ZOOM_TIMEOUT_SECONDS,
         )
 
         if response.status_code != 200:
             raise Exception("Failed to get Zoom token", response.text)
 
+        metrics.inc("zoom.token_refreshes")
         token_data = response.json()
-        cls._access_token = token_data["access_token"]
-        cls._expires_at = current_time + token_data["expires_in"] - 60  # 60s buffer
+        # 60s buffer
+        expires_at = time.time() + token_data["expires_in"] - 60
+        return token_data["access_token"], expires_at
+
+
+def _is_fresh(token: Optional[Token], valid_for: float) -> bool:
+    return token is not None and time.time() + valid_for < token[1]
+
+
+def get_token_store() -> TokenStore:
+    if settings.CACHE_URL:
+        return RedisTokenStore(settings.CACHE_URL)
+    return FileTokenStore(
+        settings.ZOOM_TOKEN_FILE
+        or os.path.join(tempfile.gettempdir(), "schedulo-zoom-token.json")
+    )
+
 
-        return cls._access_token
+zoom_token_manager = ZoomTokenManager(get_token_store())
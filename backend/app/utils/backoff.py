@@ -0,0 +1,11 @@
+import random
+from datetime import timedelta
+
+
+def backoff_delay(attempts: int, base_seconds: float, max_seconds: float) -> timedelta:
+    """
+    Exponential backoff with jitter: between half and all of
+    base * 2^(attempts - 1), capped at max_seconds.
+    """
+    ceiling = min(base_seconds * 2 ** (attempts - 1), max_seconds)
+    return timedelta(seconds=random.uniform(ceiling / 2, ceiling))
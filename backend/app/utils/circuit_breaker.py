@@ -0,0 +1,56 @@
+import time
+from threading import Lock
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a dependency that is known to be down.
+    """
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit is open, retry in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` failures in a row and fails fast for
+    `reset_seconds`. Then one trial call is let through: success closes the
+    circuit again, failure keeps it open for another period.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+        self._lock = Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            retry_in = self._opened_at + self._reset_seconds - time.monotonic()
+            if retry_in > 0 or self._trial_running:
+                raise CircuitOpenError(self.name, max(retry_in, 0))
+            self._trial_running = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self._failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
@@ -0,0 +1,44 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+from fastapi import Request, Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a weak ETag from the freelancer's availability version and whatever
+    else shapes the response (ids, query parameters).
+    """
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # weak comparison: W/"x" and "x" refer to the same representation
+    candidates = {
+        candidate.strip().removeprefix("W/") for candidate in header.split(",")
+    }
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str, last_modified: datetime) -> Response:
+    return Response(
+        status_code=HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Last-Modified": _http_date(last_modified)},
+    )
+
+
+def set_validators(response: Response, etag: str, last_modified: datetime) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = _http_date(last_modified)
+    # clients must revalidate, which is cheap thanks to If-None-Match
+    response.headers["Cache-Control"] = "no-cache"
@@ -0,0 +1,28 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from app.exceptions import exception
+
+
+def encode_cursor(position: datetime, item_id: int) -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe cursor.
+    """
+    raw = json.dumps([position.isoformat(), item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(position), int(item_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise exception.AppException(
+            message="Invalid pagination cursor",
+            code="pagination.invalid_cursor",
+            target="cursor",
+            status_code=400,
+        )
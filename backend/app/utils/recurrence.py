@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+
+# (start, end, rule_id) triples flowing through the expansion pipeline
+Interval = tuple[datetime, datetime, int | None]
+
+
+def weekdays_to_mask(weekdays: Iterable[int]) -> int:
+    # Monday is bit 0, matching date.weekday()
+    mask = 0
+    for day in weekdays:
+        mask |= 1 << day
+    return mask
+
+
+def mask_to_weekdays(mask: int) -> list[int]:
+    return [day for day in range(7) if mask & (1 << day)]
+
+
+def expand_rule(
+    rule, window_start: datetime, window_end: datetime
+) -> Iterator[Interval]:
+    """
+    Lazily yield the occurrences of a weekly rule that overlap the window,
+    in chronological order.
+    """
+    first_day = max(window_start.date(), rule.valid_from)
+    last_day = window_end.date()
+    if rule.valid_until is not None:
+        last_day = min(last_day, rule.valid_until)
+
+    # weeks are counted from the Monday of the week the rule starts in
+    anchor = rule.valid_from - timedelta(days=rule.valid_from.weekday())
+    day = first_day
+    while day <= last_day:
+        week = (day - anchor).days // 7
+        if rule.weekdays & (1 << day.weekday()) and week % rule.interval_weeks == 0:
+            start = datetime.combine(day, rule.start_time)
+            end = datetime.combine(day, rule.end_time)
+            if end > window_start and start < window_end:
+                yield start, end, rule.id
+        day += timedelta(days=1)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> Iterator[Interval]:
+    """
+    Coalesce overlapping intervals of a start-sorted stream. A merged
+    interval spanning several rules has no single rule to book it through,
+    so its rule id becomes None.
+    """
+    current = None
+    for start, end, rule_id in intervals:
+        if current is None:
+            current = (start, end, rule_id)
+        elif start <= current[1]:
+            merged_rule_id = current[2] if current[2] == rule_id else None
+            current = (current[0], max(current[1], end), merged_rule_id)
+        else:
+            yield current
+            current = (start, end, rule_id)
+    if current is not None:
+        yield current
+
+
+def subtract_intervals(
+    intervals: Iterable[Interval], busy: list[tuple[datetime, datetime]]
+) -> Iterator[Interval]:
+    """
+    Remove the busy periods from a start-sorted stream of intervals.
+
+    Both inputs must be sorted by start; busy is consumed with a single
+    forward pointer so the whole pass is linear.
+    """
+    position = 0
+    for start, end, rule_id in intervals:
+        while position < len(busy) and busy[position][1] <= start:
+            position += 1
+        cursor = start
+        scan = position
+        while scan < len(busy) and busy[scan][0] < end:
+            busy_start, busy_end = busy[scan]
+            if busy_start > cursor:
+                yield cursor, busy_start, rule_id
+            cursor = max(cursor, busy_end)
+            scan += 1
+        if cursor < end:
+            yield cursor, end, rule_id
+
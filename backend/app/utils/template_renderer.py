@@ -1,10 +1,34 @@
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    select_autoescape,
+)
 from pathlib import Path
 
+from app.core.config import settings
+
 TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
-env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
+env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    # templates ship with the code, so never stat them on render
+    auto_reload=False,
+    # client-supplied names end up in these emails
+    autoescape=select_autoescape(["html"]),
+    # compiled templates survive restarts; None uses a per-user temp dir. The
+    # name changed with autoescaping, so older unescaped bytecode is never read
+    bytecode_cache=FileSystemBytecodeCache(
+        settings.TEMPLATE_CACHE_DIR, "__jinja2_escaped_%s.cache"
+    ),
+)
+
+# compiled once at import instead of looked up on every render
+templates: dict[str, Template] = {
+    name: env.get_template(name) for name in env.list_templates()
+}
 
 
 def render_template(template_name: str, **kwargs) -> str:
-    template = env.get_template(template_name)
+    template = templates.get(template_name) or env.get_template(template_name)
     return template.render(**kwargs)
@@ -0,0 +1,137 @@
+"""
+Booking contention: many freelancer-side confirmations racing for the one
+unit of a slot through update_booking.
+
+Needs PostgreSQL (row locks and the bookings_confirmed_unit index). Run from
+backend/ with the app's environment set, against a database you can write
+to and that accepts one connection per booker. The benchmark's freelancer
+and everything it owns is deleted afterwards:
+
+    python -m benchmarks.booking_contention_bench --database-url postgresql://...
+"""
+
+import argparse
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from threading import Barrier
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  registers every table
+from app.core.config import settings
+from app.crud.bookings import update_booking
+from app.db.base import Base
+from app.exceptions import exception
+from app.models.availability import AvailableSlot
+from app.models.bookings import Booking, BookingStatus
+from app.models.freelancer import Freelancer
+from app.schema.bookings import BookingUpdate
+
+
+def set_up(session_factory, bookers: int) -> tuple[int, list[int]]:
+    # one slot exactly one unit long, requested by every booker
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=30)
+    with session_factory() as db:
+        freelancer = Freelancer(
+            first_name="Bench",
+            last_name="Mark",
+            email=f"bench-{uuid.uuid4().hex}@example.com",
+            hashed_password="x",
+        )
+        db.add(freelancer)
+        db.flush()
+        slot = AvailableSlot(
+            freelancer_id=freelancer.id,
+            start_time=start,
+            end_time=start + timedelta(minutes=settings.BOOKING_DURATION_MINUTES),
+        )
+        db.add(slot)
+        db.flush()
+        bookings = [
+            Booking(
+                freelancer_id=freelancer.id,
+                slot_id=slot.id,
+                time=start,
+                duration_minutes=settings.BOOKING_DURATION_MINUTES,
+                client_name="Client",
+                client_email=f"client{i}@example.com",
+            )
+            for i in range(bookers)
+        ]
+        db.add_all(bookings)
+        db.commit()
+        return freelancer.id, [booking.id for booking in bookings]
+
+
+def confirm_all(session_factory, freelancer_id: int, booking_ids: list[int]):
+    barrier = Barrier(len(booking_ids))
+    confirm = BookingUpdate(status=BookingStatus.CONFIRMED)
+
+    def confirm_one(booking_id: int) -> tuple[str, float]:
+        with session_factory() as db:
+            barrier.wait()
+            started = time.perf_counter()
+            try:
+                update_booking(db, booking_id, freelancer_id, confirm)
+                outcome = "confirmed"
+            except exception.AppException as e:
+                outcome = e.response.details[0].code
+            return outcome, time.perf_counter() - started
+
+    with ThreadPoolExecutor(len(booking_ids)) as pool:
+        started = time.perf_counter()
+        results = list(pool.map(confirm_one, booking_ids))
+        elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--bookers", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, pool_size=args.bookers, max_overflow=0)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    freelancer_id, booking_ids = set_up(session_factory, args.bookers)
+    try:
+        results, elapsed = confirm_all(session_factory, freelancer_id, booking_ids)
+        with session_factory() as db:
+            confirmed = (
+                db.query(Booking)
+                .filter(
+                    Booking.freelancer_id == freelancer_id,
+                    Booking.status == BookingStatus.CONFIRMED,
+                )
+                .count()
+            )
+    finally:
+        with session_factory() as db:
+            db.query(Freelancer).filter(Freelancer.id == freelancer_id).delete()
+            db.commit()
+        engine.dispose()
+
+    outcomes = {}
+    for outcome, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    latencies = sorted(latency for _, latency in results)
+    print(f"bookers:           {args.bookers}")
+    print(f"outcomes:          {outcomes}")
+    print(f"confirmed in db:   {confirmed}")
+    print(f"wall time:         {elapsed * 1000:.0f}ms")
+    print(f"throughput:        {len(results) / elapsed:.0f} decisions/s")
+    print(
+        f"latency p50/p99:   {latencies[len(latencies) // 2] * 1000:.1f}ms / "
+        f"{latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms"
+    )
+    if confirmed != 1:
+        raise SystemExit(f"double booking: {confirmed} confirmed bookings")
+
+
+if __name__ == "__main__":
+    main()
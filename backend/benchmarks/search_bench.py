@@ -0,0 +1,161 @@
+"""
+Cross-freelancer "who is free" search over 50k freelancers.
+
+Needs PostgreSQL (GiST range index, multiranges). Run from backend/ with the
+app's environment set, against a database you can write to. Everything runs
+in one transaction that is rolled back at the end, so nothing is left behind
+(cascading deletes of 300k slots would take far longer than the benchmark):
+
+    python -m benchmarks.search_bench --database-url postgresql://...
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  registers every table
+from app.core.config import settings
+from app.crud.available_slots import search_free_freelancers
+from app.db.base import Base
+from app.models.availability import AvailableSlot
+from app.models.bookings import Booking, BookingStatus
+from app.models.freelancer import Freelancer
+
+BASE = datetime(2030, 1, 7)
+DAYS = 14
+SLOTS_PER_FREELANCER = 6
+
+
+def populate(db: Session, freelancers: int) -> None:
+    rng = random.Random(freelancers)
+    run = uuid.uuid4().hex[:8]
+    ids = (
+        db.execute(
+            insert(Freelancer).returning(Freelancer.id),
+            [
+                {
+                    "first_name": "Bench",
+                    "last_name": f"F{i}",
+                    "email": f"bench-{run}-{i}@example.com",
+                    "hashed_password": "x",
+                }
+                for i in range(freelancers)
+            ],
+        )
+        .scalars()
+        .all()
+    )
+
+    slots = []
+    for freelancer_id in ids:
+        # distinct days keep each freelancer's slots from overlapping
+        for day in rng.sample(range(DAYS), SLOTS_PER_FREELANCER):
+            start = BASE + timedelta(days=day, hours=rng.randrange(7, 16))
+            slots.append(
+                {
+                    "freelancer_id": freelancer_id,
+                    "start_time": start,
+                    "end_time": start + timedelta(hours=rng.choice((2, 3, 4))),
+                }
+            )
+    rows = db.execute(
+        insert(AvailableSlot).returning(
+            AvailableSlot.id, AvailableSlot.freelancer_id, AvailableSlot.start_time
+        ),
+        slots,
+    ).all()
+
+    # a third of the slots lose their first hour to a confirmed booking
+    db.execute(
+        insert(Booking),
+        [
+            {
+                "freelancer_id": freelancer_id,
+                "slot_id": slot_id,
+                "time": start,
+                "duration_minutes": 60,
+                "client_name": "Client",
+                "client_email": "client@example.com",
+                "status": BookingStatus.CONFIRMED,
+            }
+            for slot_id, freelancer_id, start in rows
+            if rng.random() < 1 / 3
+        ],
+    )
+    # ANALYZE counts the rows this transaction inserted
+    for table in ("freelancers", "available_slots", "bookings"):
+        db.execute(text(f"ANALYZE {table}"))
+
+
+def time_searches(db: Session, searches: int, pages: int) -> list[tuple]:
+    """
+    (page number, seconds, results) for every page fetched, following the
+    cursor for up to `pages` pages of 50 per search.
+    """
+    rng = random.Random(searches)
+    timings = []
+    for _ in range(searches):
+        start = BASE + timedelta(days=rng.randrange(DAYS), hours=rng.randrange(8, 17))
+        after = None
+        for page in range(pages):
+            started = time.perf_counter()
+            results, after = search_free_freelancers(
+                db,
+                start,
+                start + timedelta(hours=4),
+                timedelta(hours=1),
+                after=after,
+                limit=50,
+            )
+            timings.append((page, time.perf_counter() - started, len(results)))
+            if after is None:
+                break
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--freelancers", type=int, default=50_000)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        try:
+            started = time.perf_counter()
+            populate(db, args.freelancers)
+            print(
+                f"populated {args.freelancers} freelancers, "
+                f"{args.freelancers * SLOTS_PER_FREELANCER} slots "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+            timings = time_searches(db, args.searches, args.pages)
+        finally:
+            db.rollback()
+    engine.dispose()
+
+    print(f"searches: {args.searches}, pages of 50")
+    for page in range(args.pages):
+        page_timings = [(elapsed, n) for p, elapsed, n in timings if p == page]
+        if not page_timings:
+            break
+        latencies = sorted(elapsed for elapsed, _ in page_timings)
+        results = sum(n for _, n in page_timings) / len(page_timings)
+        print(
+            f"page {page + 1}: {len(page_timings):>4} fetched, "
+            f"{results:5.1f} results, p50/p99 "
+            f"{latencies[len(latencies) // 2] * 1000:.1f}ms / "
+            f"{latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Slot overlap checks: the in-memory SlotIntervalIndex against the range query
+create_available_slot used to run on every write.
+
+Run from backend/ with the app's environment set:
+
+    python -m benchmarks.slot_index_bench
+    python -m benchmarks.slot_index_bench --database-url postgresql://...
+
+The query path runs against a temporary table, in-memory SQLite by default.
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    Table,
+    and_,
+    create_engine,
+    select,
+)
+
+from app.services.slot_index import SlotIntervalIndex
+
+BASE = datetime(2026, 1, 1)
+FREELANCER_ID = 1
+
+
+def make_slots(count: int) -> list[tuple[int, datetime, datetime]]:
+    # one hour slots with a one hour gap, the shape of a busy calendar
+    return [
+        (i, BASE + timedelta(hours=2 * i), BASE + timedelta(hours=2 * i + 1))
+        for i in range(count)
+    ]
+
+
+def make_probes(count: int, lookups: int) -> list[tuple[datetime, datetime]]:
+    rng = random.Random(count)
+    probes = []
+    for _ in range(lookups):
+        start = BASE + timedelta(minutes=rng.randrange(count * 120))
+        probes.append((start, start + timedelta(minutes=30)))
+    return probes
+
+
+def time_index(slots, probes) -> tuple[float, float]:
+    started = time.perf_counter()
+    index = SlotIntervalIndex(slots)
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for start, end in probes:
+        index.find_overlap(start, end)
+    return build, (time.perf_counter() - started) / len(probes)
+
+
+def time_query(database_url: str, slots, probes) -> float:
+    engine = create_engine(database_url)
+    metadata = MetaData()
+    # the same columns and lack of a composite index as available_slots
+    table = Table(
+        "bench_available_slots",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("freelancer_id", Integer, index=True),
+        Column("start_time", DateTime),
+        Column("end_time", DateTime),
+        prefixes=["TEMPORARY"],
+    )
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(
+            table.insert(),
+            [
+                {
+                    "id": slot_id,
+                    "freelancer_id": FREELANCER_ID,
+                    "start_time": start,
+                    "end_time": end,
+                }
+                for slot_id, start, end in slots
+            ],
+        )
+        started = time.perf_counter()
+        for start, end in probes:
+            query = select(table.c.id).where(
+                and_(
+                    table.c.freelancer_id == FREELANCER_ID,
+                    table.c.end_time > start,
+                    table.c.start_time < end,
+                )
+            )
+            conn.execute(query.limit(1)).first()
+        elapsed = time.perf_counter() - started
+        conn.rollback()
+    engine.dispose()
+    return elapsed / len(probes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'slots':>8}  {'index build':>12}  {'index lookup':>13}  {'query':>11}")
+    for size in args.sizes:
+        slots = make_slots(size)
+        probes = make_probes(size, args.lookups)
+        build, lookup = time_index(slots, probes)
+        query = time_query(args.database_url, slots, probes)
+        print(
+            f"{size:>8}  {build * 1000:>10.1f}ms  {lookup * 1e6:>11.2f}us"
+            f"  {query * 1e6:>9.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
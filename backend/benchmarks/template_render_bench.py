@@ -0,0 +1,97 @@
+"""
+Email template rendering: a plain Jinja environment looked up on every
+render, as the renderer used to work, against render_template.
+
+Run from backend/ with the app's environment set:
+
+    python -m benchmarks.template_render_bench
+"""
+
+import argparse
+import tempfile
+import time
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from app.utils.template_renderer import TEMPLATES_DIR, render_template
+
+CONTEXT = dict(
+    client_name="Client",
+    freelancer_name="Freelancer",
+    time="January 07, 2030 at 09:00 AM",
+    booking_time="January 07, 2030 at 09:00 AM",
+    meeting_link="https://zoom.us/j/1",
+    requests=[
+        dict(client_name=f"Client {i}", booking_time="January 07, 2030 at 09:00 AM")
+        for i in range(3)
+    ],
+    current_year=2030,
+)
+
+
+def time_renders(render, names: list[str], renders: int, runs: int) -> float:
+    """
+    Best of `runs` wall times for rendering every template `renders` times.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        for _ in range(renders):
+            for name in names:
+                render(name, **CONTEXT)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def time_cold_load(names: list[str], bytecode_cache, loads: int) -> float:
+    """
+    Average seconds for a fresh environment to load every template.
+    """
+    started = time.perf_counter()
+    for _ in range(loads):
+        env = Environment(
+            loader=FileSystemLoader(TEMPLATES_DIR),
+            auto_reload=False,
+            bytecode_cache=bytecode_cache,
+        )
+        for name in names:
+            env.get_template(name)
+    return (time.perf_counter() - started) / loads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renders", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--loads", type=int, default=50)
+    args = parser.parse_args()
+
+    names = sorted(path.name for path in TEMPLATES_DIR.glob("*.html"))
+    before_env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
+
+    def render_before(name: str, **kwargs) -> str:
+        return before_env.get_template(name).render(**kwargs)
+
+    total = args.renders * len(names)
+    print(f"{len(names)} templates x {args.renders} renders, best of {args.runs}")
+    for label, render in (("before", render_before), ("after", render_template)):
+        elapsed = time_renders(render, names, args.renders, args.runs)
+        print(
+            f"{label:>7}: {elapsed * 1000:.0f}ms, "
+            f"{elapsed / total * 1e6:.1f}us per render"
+        )
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        bytecode_cache = FileSystemBytecodeCache(cache_dir)
+        # the first load fills the cache, as the previous run of the app did
+        time_cold_load(names, bytecode_cache, 1)
+        for label, cache in (("without", None), ("with", bytecode_cache)):
+            elapsed = time_cold_load(names, cache, args.loads)
+            print(
+                f"cold load {label} bytecode cache: "
+                f"{elapsed * 1000:.2f}ms for all templates"
+            )
+
+
+if __name__ == "__main__":
+    main()
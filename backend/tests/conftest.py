@@ -0,0 +1,87 @@
+import os
+
+# Tests touching the database need PostgreSQL (tsrange, exclusion constraints,
+# SKIP LOCKED) and run only when TEST_DATABASE_URL points at a throwaway
+# database. Everything else runs on the defaults below.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+os.environ.update(
+    DATABASE_URL=TEST_DATABASE_URL or "sqlite://",
+    RUN_BACKGROUND_TASKS="false",
+    # the limiter has its own tests; API tests would share its buckets
+    RATE_LIMIT_ENABLED="false",
+    EMAIL_TRANSPORT="stub",
+)
+for name, value in {
+    "SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "ZOOM_ACCOUNT_ID": "test",
+    "ZOOM_CLIENT_ID": "test",
+    "ZOOM_CLIENT_SECRET": "test",
+    "SENDGRID_API_KEY": "test",
+    "FROM_EMAIL": "noreply@example.com",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    import app.models  # noqa: F401  registers every table
+    from app.db.base import Base
+    from app.db.session import engine
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def session_factory(engine):
+    from app.db.base import Base
+    from app.db.session import SessionLocal
+
+    yield SessionLocal
+    # every test starts from empty tables; ids keep counting up so the
+    # per-process caches keyed by id never see a reused one
+    with engine.begin() as conn:
+        tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+        conn.exec_driver_sql(f"TRUNCATE {tables} CASCADE")
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def freelancer(db):
+    from app.models.freelancer import Freelancer
+
+    freelancer = Freelancer(
+        first_name="Ada",
+        last_name="Lovelace",
+        email="ada@example.com",
+        hashed_password="x",
+    )
+    db.add(freelancer)
+    db.commit()
+    return freelancer
+
+
+@pytest.fixture
+def client(session_factory):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    # not entered as a context manager, so the lifespan tasks never start
+    return TestClient(app)
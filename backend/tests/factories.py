@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from app.models.availability import AvailableSlot
+from app.models.bookings import Booking, BookingStatus
+from app.models.freelancer import Freelancer
+
+
+def add_freelancer(db, name: str = "Ada") -> Freelancer:
+    freelancer = Freelancer(
+        first_name=name,
+        last_name="Test",
+        email=f"{name.lower()}@example.com",
+        hashed_password="x",
+    )
+    db.add(freelancer)
+    db.flush()
+    return freelancer
+
+
+def add_slot(db, freelancer_id: int, start: datetime, end: datetime) -> AvailableSlot:
+    slot = AvailableSlot(freelancer_id=freelancer_id, start_time=start, end_time=end)
+    db.add(slot)
+    db.flush()
+    return slot
+
+
+def add_booking(
+    db,
+    slot: AvailableSlot,
+    time: datetime,
+    status: BookingStatus = BookingStatus.PENDING,
+    client_email: str = "client@example.com",
+) -> Booking:
+    booking = Booking(
+        freelancer_id=slot.freelancer_id,
+        slot_id=slot.id,
+        time=time,
+        duration_minutes=60,
+        client_name="Client",
+        client_email=client_email,
+        status=status,
+    )
+    db.add(booking)
+    db.flush()
+    return booking
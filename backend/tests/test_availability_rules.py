@@ -0,0 +1,42 @@
+from datetime import date, datetime, time, timedelta
+
+from app.crud.availability_rules import (
+    create_availability_rule,
+    expand_rule_availability,
+    materialize_rule_occurrence,
+)
+from app.schema.availability_rules import AvailabilityRuleCreate
+
+MONDAY = date(2030, 1, 7)
+
+
+def add_rule(db, freelancer_id: int, start: int, end: int):
+    return create_availability_rule(
+        db,
+        AvailabilityRuleCreate(
+            weekdays=[0],
+            start_time=time(start),
+            end_time=time(end),
+            valid_from=MONDAY,
+        ),
+        freelancer_id,
+    )
+
+
+def test_overlapping_rules_are_booked_through_their_own_occurrences(db, freelancer):
+    morning = add_rule(db, freelancer.id, 9, 12)
+    midday = add_rule(db, freelancer.id, 11, 14)
+    day_start = datetime.combine(MONDAY, time.min)
+
+    occurrences = [
+        (occurrence.start_time.hour, occurrence.end_time.hour, occurrence.rule_id)
+        for occurrence in expand_rule_availability(
+            db, freelancer.id, day_start, day_start + timedelta(days=1)
+        )
+    ]
+    assert occurrences == [(9, 12, morning.id), (11, 14, midday.id)]
+
+    slot = materialize_rule_occurrence(
+        db, midday.id, datetime.combine(MONDAY, time(11))
+    )
+    assert (slot.start_time.hour, slot.end_time.hour) == (11, 14)
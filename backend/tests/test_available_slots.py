@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from threading import Barrier
+
+from app.crud.available_slots import (
+    create_available_slot,
+    create_available_slots_bulk,
+)
+from app.exceptions import exception
+from app.models.availability import AvailableSlot
+from app.schema.available_slots import AvailableSlotCreate
+
+START = datetime(2030, 1, 7, 9)
+WORKERS = 16
+
+
+def test_parallel_overlapping_creates_admit_exactly_one(session_factory, freelancer):
+    freelancer_id = freelancer.id
+    barrier = Barrier(WORKERS)
+
+    def create(offset_minutes: int):
+        start = START + timedelta(minutes=offset_minutes)
+        data = AvailableSlotCreate(
+            start_time=start, end_time=start + timedelta(hours=2)
+        )
+        with session_factory() as db:
+            barrier.wait()
+            try:
+                create_available_slot(db, data, freelancer_id)
+                return "created"
+            except exception.TimeSlotConflictException:
+                return "conflict"
+
+    # every span overlaps every other one
+    with ThreadPoolExecutor(WORKERS) as pool:
+        outcomes = list(pool.map(create, [5 * i for i in range(WORKERS)]))
+
+    assert outcomes.count("created") == 1
+    assert outcomes.count("conflict") == WORKERS - 1
+    with session_factory() as db:
+        assert (
+            db.query(AvailableSlot)
+            .filter(AvailableSlot.freelancer_id == freelancer_id)
+            .count()
+            == 1
+        )
+
+
+def test_index_hit_for_a_moved_slot_is_not_a_conflict(session_factory, freelancer):
+    freelancer_id = freelancer.id
+    with session_factory() as db:
+        slot = create_available_slot(
+            db,
+            AvailableSlotCreate(start_time=START, end_time=START + timedelta(hours=1)),
+            freelancer_id,
+        )
+        slot_id = slot.id
+
+    # another worker moves the slot; this process's index still has it at START
+    with session_factory() as db:
+        db.query(AvailableSlot).filter(AvailableSlot.id == slot_id).update(
+            {
+                AvailableSlot.start_time: START + timedelta(days=1),
+                AvailableSlot.end_time: START + timedelta(days=1, hours=1),
+            }
+        )
+        db.commit()
+
+    with session_factory() as db:
+        slot = create_available_slot(
+            db,
+            AvailableSlotCreate(start_time=START, end_time=START + timedelta(hours=1)),
+            freelancer_id,
+        )
+        assert slot.id != slot_id
+
+
+def span(start_hour: float, end_hour: float) -> AvailableSlotCreate:
+    return AvailableSlotCreate(
+        start_time=START + timedelta(hours=start_hour - 9),
+        end_time=START + timedelta(hours=end_hour - 9),
+    )
+
+
+def test_bulk_create_reports_conflicts_per_item_in_input_order(db, freelancer):
+    create_available_slot(db, span(9, 10), freelancer.id)
+    items = [
+        span(12, 13),
+        span(9.5, 10.5),  # overlaps the existing slot
+        span(10, 11),
+        span(12.5, 13.5),  # overlaps item 0
+        span(11, 12),
+    ]
+
+    results = create_available_slots_bulk(db, items, freelancer.id)
+
+    assert [result.index for result in results] == list(range(5))
+    assert [result.created for result in results] == [True, False, True, False, True]
+    assert [
+        (result.error.code, result.error.target)
+        for result in results
+        if result.error
+    ] == [("timeslot.conflict", "slots.1"), ("timeslot.batch_conflict", "slots.3")]
+    stored = {
+        slot.id: (slot.start_time, slot.end_time)
+        for slot in db.query(AvailableSlot).all()
+    }
+    assert len(stored) == 4
+    # each created row is reported at its own position, whatever the order
+    # the INSERT wrote them in
+    for item, result in zip(items, results):
+        if result.created:
+            assert stored[result.slot.id] == (item.start_time, item.end_time)
+
+
+def test_bulk_create_with_only_conflicts_writes_nothing(db, freelancer):
+    create_available_slot(db, span(9, 11), freelancer.id)
+    version = freelancer.availability_version
+
+    results = create_available_slots_bulk(
+        db, [span(10, 12), span(9, 10)], freelancer.id
+    )
+
+    assert [result.error.code for result in results] == ["timeslot.conflict"] * 2
+    assert db.query(AvailableSlot).count() == 1
+    db.expire_all()
+    assert freelancer.availability_version == version
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.crud.available_slots import get_free_units, search_free_freelancers
+from app.models.bookings import Booking, BookingStatus
+from app.services.booking_lifecycle import BookingLifecycleJob
+from tests.factories import add_booking, add_freelancer, add_slot
+
+
+def test_completed_booking_keeps_its_unit(session_factory):
+    # a two-unit slot whose first unit has already ended
+    start = datetime.utcnow().replace(microsecond=0) - timedelta(hours=1, minutes=30)
+    with session_factory() as db:
+        freelancer = add_freelancer(db)
+        slot = add_slot(db, freelancer.id, start, start + timedelta(hours=2))
+        booking = add_booking(db, slot, start, BookingStatus.CONFIRMED)
+        db.commit()
+        slot_id, booking_id = slot.id, booking.id
+
+    processed = BookingLifecycleJob(session_factory).run()
+    assert processed["completed"] == 1
+
+    with session_factory() as db:
+        assert db.get(Booking, booking_id).status == BookingStatus.COMPLETED
+        slot = db.get(Booking, booking_id).slot
+        assert get_free_units(db, slot) == [start + timedelta(hours=1)]
+
+        results, _ = search_free_freelancers(
+            db, start, start + timedelta(hours=2), timedelta(hours=1)
+        )
+        assert [result.free_from for result in results] == [
+            start + timedelta(hours=1)
+        ]
+
+        with pytest.raises(IntegrityError):
+            add_booking(db, slot, start, BookingStatus.CONFIRMED, "other@example.com")
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.crud.bookings import count_bookings_by_status, get_bookings_by_freelancer_id
+from app.crud.freelancer import bump_availability_version, get_availability_version
+from app.exceptions import exception
+from app.models.bookings import BookingStatus
+from app.utils.pagination import decode_cursor, encode_cursor
+from tests.factories import add_booking, add_freelancer, add_slot
+
+START = datetime(2030, 1, 7, 9)
+
+
+@pytest.fixture
+def bookings(db):
+    """
+    Seven bookings over three hours: five share 10:00 (one confirmed, the
+    rest pending), the others are at 09:00 (pending) and 11:00 (cancelled).
+    """
+    freelancer = add_freelancer(db)
+    slot = add_slot(db, freelancer.id, START, START + timedelta(hours=3))
+    ten = START + timedelta(hours=1)
+    rows = [
+        add_booking(db, slot, START),
+        add_booking(db, slot, ten, BookingStatus.CONFIRMED),
+        *(add_booking(db, slot, ten) for _ in range(4)),
+        add_booking(db, slot, START + timedelta(hours=2), BookingStatus.CANCELLED),
+    ]
+    db.commit()
+    return freelancer.id, rows
+
+
+def test_status_and_time_filters(db, bookings):
+    freelancer_id, rows = bookings
+
+    pending, _ = get_bookings_by_freelancer_id(
+        db, freelancer_id, statuses=[BookingStatus.PENDING]
+    )
+    window, _ = get_bookings_by_freelancer_id(
+        db,
+        freelancer_id,
+        statuses=[BookingStatus.CONFIRMED, BookingStatus.CANCELLED],
+        # from is inclusive, to is exclusive
+        time_from=START + timedelta(hours=1),
+        time_to=START + timedelta(hours=2),
+    )
+
+    assert [b.id for b in pending] == [rows[i].id for i in (0, 2, 3, 4, 5)]
+    assert [b.id for b in window] == [rows[1].id]
+
+
+def test_cursor_walks_every_booking_once_across_time_ties(db, bookings):
+    freelancer_id, rows = bookings
+    seen = []
+    cursor = None
+
+    while True:
+        page, position = get_bookings_by_freelancer_id(
+            db,
+            freelancer_id,
+            after=decode_cursor(cursor) if cursor else None,
+            limit=2,
+        )
+        seen += [booking.id for booking in page]
+        if position is None:
+            break
+        cursor = encode_cursor(*position)
+
+    # pages of two split the five 10:00 bookings apart
+    assert seen == [booking.id for booking in rows]
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(exception.AppException) as excinfo:
+        decode_cursor("not-a-cursor")
+    assert excinfo.value.response.details[0].code == "pagination.invalid_cursor"
+
+
+def test_counts_are_cached_until_the_version_moves(db, bookings):
+    freelancer_id, rows = bookings
+    version = get_availability_version(db, freelancer_id).availability_version
+    expected = {"pending": 5, "confirmed": 1, "cancelled": 1, "completed": 0}
+
+    assert count_bookings_by_status(db, freelancer_id, version) == expected
+
+    # a write that skipped the version bump is not seen ...
+    rows[0].status = BookingStatus.CANCELLED
+    db.commit()
+    assert count_bookings_by_status(db, freelancer_id, version) == expected
+
+    # ... and one that bumps it is
+    bump_availability_version(db, freelancer_id)
+    db.commit()
+    version = get_availability_version(db, freelancer_id).availability_version
+    assert count_bookings_by_status(db, freelancer_id, version) == {
+        **expected,
+        "pending": 4,
+        "cancelled": 2,
+    }
@@ -0,0 +1,142 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.crud.bookings import create_booking, load_booking_for_update, update_booking
+from app.exceptions import exception
+from app.models.availability import AvailableSlot, SlotHold
+from app.models.bookings import BookingStatus, MeetingStatus
+from app.schema.bookings import BookingCreate, BookingUpdate
+from tests.factories import add_booking, add_freelancer, add_slot
+
+START = datetime(2030, 1, 7, 9)
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def add_pending_booking(db):
+    freelancer = add_freelancer(db)
+    slot = add_slot(db, freelancer.id, START, START + timedelta(hours=2))
+    booking = add_booking(db, slot, START)
+    db.commit()
+    return freelancer.id, booking.id
+
+
+def test_load_for_update_is_one_query(engine, db):
+    _, booking_id = add_pending_booking(db)
+
+    with count_statements(engine) as statements:
+        booking, slot, freelancer_name = load_booking_for_update(db, booking_id)
+
+    assert len(statements) == 1
+    assert "FOR UPDATE" in statements[0]
+    assert booking.slot_id == slot.id
+    assert freelancer_name == "Ada Test"
+
+
+def test_confirm_is_one_unit_of_work(engine, db):
+    freelancer_id, booking_id = add_pending_booking(db)
+    commits = []
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    event.listen(engine, "commit", on_commit)
+    try:
+        with count_statements(engine) as statements:
+            booking = update_booking(
+                db, booking_id, freelancer_id, BookingUpdate(status="confirmed")
+            )
+    finally:
+        event.remove(engine, "commit", on_commit)
+
+    # lock booking+slot, read taken units, bump the version, write the
+    # booking, then reload it after the commit
+    assert len(statements) == 5
+    assert len(commits) == 1
+    assert booking.status == BookingStatus.CONFIRMED
+    assert booking.meeting_status == MeetingStatus.PENDING
+
+
+def test_booking_waits_for_a_concurrent_hold_on_the_slot(session_factory):
+    with session_factory() as db:
+        freelancer = add_freelancer(db)
+        slot = add_slot(db, freelancer.id, START, START + timedelta(hours=1))
+        db.commit()
+        slot_id = slot.id
+
+    def book():
+        with session_factory() as db:
+            data = BookingCreate(client_name="Other", client_email="o@example.com")
+            try:
+                create_booking(db, data, slot_id=slot_id)
+                return "booked"
+            except exception.AppException as e:
+                return e.response.details[0].code
+
+    with ThreadPoolExecutor(1) as pool, session_factory() as holder:
+        # what create_hold does: lock the slot, then add the hold
+        holder.query(AvailableSlot).filter(
+            AvailableSlot.id == slot_id
+        ).with_for_update().one()
+        holder.add(
+            SlotHold(
+                slot_id=slot_id,
+                token="held",
+                start_time=START,
+                duration_minutes=60,
+                expires_at=datetime.utcnow() + timedelta(minutes=10),
+            )
+        )
+        holder.flush()
+        outcome = pool.submit(book)
+        time.sleep(0.3)
+        assert not outcome.done()
+        holder.commit()
+
+        assert outcome.result(timeout=5) == "slot.already_booked"
+
+
+def cancel(db, freelancer_id: int, booking_id: int):
+    update_booking(db, booking_id, freelancer_id, BookingUpdate(status="cancelled"))
+
+
+def test_cancel_reopens_a_slot_its_bookings_filled(db):
+    freelancer = add_freelancer(db)
+    slot = add_slot(db, freelancer.id, START, START + timedelta(hours=1))
+    booking = add_booking(db, slot, START)
+    db.commit()
+    update_booking(db, booking.id, freelancer.id, BookingUpdate(status="confirmed"))
+    assert db.get(AvailableSlot, slot.id).is_booked
+
+    cancel(db, freelancer.id, booking.id)
+
+    assert not db.get(AvailableSlot, slot.id).is_booked
+
+
+def test_cancel_keeps_a_slot_the_freelancer_blocked(db):
+    freelancer = add_freelancer(db)
+    slot = add_slot(db, freelancer.id, START, START + timedelta(hours=2))
+    booking = add_booking(db, slot, START, BookingStatus.CONFIRMED)
+    # blocked by hand with its second unit still free
+    slot.is_booked = True
+    db.commit()
+
+    cancel(db, freelancer.id, booking.id)
+
+    assert db.get(AvailableSlot, slot.id).is_booked
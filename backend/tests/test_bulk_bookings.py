@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+
+from app.crud.bookings import update_bookings_bulk
+from app.models.bookings import Booking, BookingStatus
+from app.models.outbox import OutboxMessage
+from app.schema.bookings import BookingTransition
+from tests.factories import add_booking, add_freelancer, add_slot
+
+START = datetime(2030, 1, 7, 9)
+
+
+def transition(booking: Booking, status: BookingStatus) -> BookingTransition:
+    return BookingTransition(booking_id=booking.id, status=status)
+
+
+def statuses(db, bookings: list[Booking]) -> list[BookingStatus]:
+    db.expire_all()
+    return [db.get(Booking, booking.id).status for booking in bookings]
+
+
+def test_mixed_batch_reports_each_item_and_commits_the_valid_ones(db):
+    ada = add_freelancer(db)
+    bob = add_freelancer(db, "Bob")
+    slot = add_slot(db, ada.id, START, START + timedelta(hours=3))
+    to_confirm = add_booking(db, slot, START)
+    to_cancel = add_booking(db, slot, START + timedelta(hours=1))
+    completed = add_booking(
+        db, slot, START + timedelta(hours=2), BookingStatus.COMPLETED
+    )
+    rival = add_booking(db, slot, START)
+    bobs_slot = add_slot(db, bob.id, START, START + timedelta(hours=1))
+    bobs = add_booking(db, bobs_slot, START)
+    db.commit()
+
+    results = update_bookings_bulk(
+        db,
+        ada.id,
+        [
+            transition(to_confirm, BookingStatus.CONFIRMED),
+            transition(completed, BookingStatus.CANCELLED),
+            transition(bobs, BookingStatus.CONFIRMED),
+            transition(to_cancel, BookingStatus.CANCELLED),
+            # the unit was confirmed for to_confirm earlier in this batch
+            transition(rival, BookingStatus.CONFIRMED),
+            BookingTransition(booking_id=999_999, status=BookingStatus.CONFIRMED),
+        ],
+    )
+
+    assert [result.index for result in results] == list(range(6))
+    assert [result.updated for result in results] == [
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+    ]
+    assert [result.error.code for result in results if result.error] == [
+        "booking.operation_not_allowed",
+        "booking.permission_denied",
+        "slot.already_booked",
+        "booking.not_found",
+    ]
+    assert results[0].booking.status == BookingStatus.CONFIRMED
+    assert statuses(db, [to_confirm, to_cancel, completed, rival, bobs]) == [
+        BookingStatus.CONFIRMED,
+        BookingStatus.CANCELLED,
+        BookingStatus.COMPLETED,
+        BookingStatus.PENDING,
+        BookingStatus.PENDING,
+    ]
+    # the cancellation email went out with the committed batch
+    assert db.query(OutboxMessage).count() == 1
+
+
+def test_unit_released_in_a_batch_can_be_confirmed_later_in_it(db):
+    ada = add_freelancer(db)
+    slot = add_slot(db, ada.id, START, START + timedelta(hours=1))
+    confirmed = add_booking(db, slot, START, BookingStatus.CONFIRMED)
+    waiting = add_booking(db, slot, START, client_email="next@example.com")
+    db.commit()
+
+    results = update_bookings_bulk(
+        db,
+        ada.id,
+        [
+            transition(confirmed, BookingStatus.CANCELLED),
+            transition(waiting, BookingStatus.CONFIRMED),
+        ],
+    )
+
+    assert [result.updated for result in results] == [True, True]
+    assert statuses(db, [confirmed, waiting]) == [
+        BookingStatus.CANCELLED,
+        BookingStatus.CONFIRMED,
+    ]
+
+
+def test_batch_with_no_valid_item_changes_nothing(db):
+    ada = add_freelancer(db)
+    slot = add_slot(db, ada.id, START, START + timedelta(hours=1))
+    completed = add_booking(db, slot, START, BookingStatus.COMPLETED)
+    db.commit()
+    version = ada.availability_version
+
+    results = update_bookings_bulk(
+        db, ada.id, [transition(completed, BookingStatus.CONFIRMED)]
+    )
+
+    assert [result.updated for result in results] == [False]
+    db.expire_all()
+    assert ada.availability_version == version
@@ -0,0 +1,77 @@
+from app.core.cache import InProcessBackend, ReadThroughCache
+from app.crud.freelancer import get_freelancer_contact
+from app.models.freelancer import Freelancer
+from tests.factories import add_freelancer
+
+
+def make_cache() -> ReadThroughCache:
+    return ReadThroughCache(InProcessBackend(max_entries=100), "test", ttl=60)
+
+
+def test_loads_once_until_invalidated():
+    cache = make_cache()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {"value": len(loads)}
+
+    assert cache.get_or_load(1, load) == {"value": 1}
+    assert cache.get_or_load(1, load) == {"value": 1}
+    cache.invalidate(1)
+    assert cache.get_or_load(1, load) == {"value": 2}
+
+
+def test_load_racing_with_an_invalidation_is_not_served():
+    cache = make_cache()
+    row = {"name": "old"}
+
+    def slow_load():
+        value = dict(row)
+        # a writer commits and invalidates while this load is in flight
+        row["name"] = "new"
+        cache.invalidate(1)
+        return value
+
+    assert cache.get_or_load(1, slow_load) == {"name": "old"}
+    assert cache.get_or_load(1, lambda: dict(row)) == {"name": "new"}
+
+
+def test_contact_is_dropped_after_the_rename_commits(session_factory):
+    with session_factory() as db:
+        freelancer_id = add_freelancer(db, "Old").id
+        db.commit()
+        assert get_freelancer_contact(db, freelancer_id)["freelancer_name"] == (
+            "Old Test"
+        )
+
+    with session_factory() as writer, session_factory() as reader:
+        writer.get(Freelancer, freelancer_id).first_name = "New"
+        writer.flush()
+        # a read between flush and commit still sees, and may cache, the old row
+        assert get_freelancer_contact(reader, freelancer_id)["freelancer_name"] == (
+            "Old Test"
+        )
+        writer.commit()
+
+    with session_factory() as db:
+        assert get_freelancer_contact(db, freelancer_id)["freelancer_name"] == (
+            "New Test"
+        )
+
+
+def test_generation_survives_eviction_of_other_entries():
+    cache = ReadThroughCache(InProcessBackend(max_entries=3), "test", ttl=60)
+
+    def slow_load():
+        # the invalidation lands while this load is in flight, so the old
+        # value is stored under the old generation
+        cache.invalidate(1)
+        return {"name": "old"}
+
+    cache.get_or_load(1, slow_load)
+    # enough other keys to push the oldest entries out of the LRU
+    cache.get_or_load(2, lambda: {"name": "two"})
+    cache.get_or_load(3, lambda: {"name": "three"})
+
+    assert cache.get_or_load(1, lambda: {"name": "new"}) == {"name": "new"}
@@ -0,0 +1,120 @@
+import smtplib
+
+import pytest
+import requests
+
+from app.core import email
+from app.core.email import EmailBatch, Recipient, SendGridTransport, SmtpTransport
+
+
+def make_batch(count: int) -> EmailBatch:
+    return EmailBatch(
+        html_content="<p>Hello %client_name%</p>",
+        recipients=[
+            Recipient(
+                to_email=f"client{i}@example.com",
+                subject="Booking Confirmation",
+                substitutions={"%client_name%": f"Client {i}"},
+            )
+            for i in range(count)
+        ],
+    )
+
+
+def sendgrid(monkeypatch, statuses: list[int]) -> tuple[SendGridTransport, list]:
+    """
+    A SendGrid transport whose session answers with the given statuses in
+    turn and records every payload posted.
+    """
+    transport = SendGridTransport("key", "noreply@example.com")
+    posted = []
+
+    def post(url, json, timeout):
+        posted.append(json)
+        response = requests.Response()
+        response.status_code = statuses[len(posted) - 1]
+        response._content = b"{}"
+        return response
+
+    monkeypatch.setattr(transport._session, "post", post)
+    return transport, posted
+
+
+def test_sendgrid_sends_a_batch_as_one_call_with_personalizations(monkeypatch):
+    transport, posted = sendgrid(monkeypatch, [202])
+
+    assert transport.send_batch(make_batch(3)) == [None] * 3
+
+    (payload,) = posted
+    assert payload["content"] == [
+        {"type": "text/html", "value": "<p>Hello %client_name%</p>"}
+    ]
+    assert payload["personalizations"][2] == {
+        "to": [{"email": "client2@example.com"}],
+        "subject": "Booking Confirmation",
+        "substitutions": {"%client_name%": "Client 2"},
+    }
+
+
+def test_sendgrid_splits_large_batches_and_fails_only_the_rejected_chunk(
+    monkeypatch,
+):
+    monkeypatch.setattr(SendGridTransport, "MAX_PERSONALIZATIONS", 2)
+    transport, posted = sendgrid(monkeypatch, [202, 500, 202])
+
+    errors = transport.send_batch(make_batch(5))
+
+    assert [len(payload["personalizations"]) for payload in posted] == [2, 2, 1]
+    assert [error is None for error in errors] == [True, True, False, False, True]
+
+
+class FakeSmtp:
+    """
+    An SMTP connection that drops after `fail_after` messages.
+    """
+
+    connections: list["FakeSmtp"] = []
+
+    def __init__(self, host, port, timeout, fail_after: int | None = None):
+        self.calls = []
+        self.sent = []
+        self.fail_after = fail_after
+        FakeSmtp.connections.append(self)
+
+    def starttls(self):
+        self.calls.append("starttls")
+
+    def login(self, username, password):
+        self.calls.append(("login", username))
+
+    def send_message(self, message):
+        if self.fail_after is not None and len(self.sent) >= self.fail_after:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(message["To"])
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    FakeSmtp.connections = []
+
+    def connect(host, port, timeout):
+        # the first connection drops after one message, later ones hold
+        fail_after = 1 if not FakeSmtp.connections else None
+        return FakeSmtp(host, port, timeout, fail_after)
+
+    monkeypatch.setattr(email.smtplib, "SMTP", connect)
+    return FakeSmtp
+
+
+def test_smtp_reuses_the_connection_and_reconnects_once_dropped(fake_smtp):
+    transport = SmtpTransport(
+        "relay.example.com", 587, "noreply@example.com", "user", "secret"
+    )
+
+    errors = transport.send_batch(make_batch(3))
+
+    assert errors == [None] * 3
+    first, second = fake_smtp.connections
+    assert first.sent == ["client0@example.com"]
+    assert second.sent == ["client1@example.com", "client2@example.com"]
+    assert second.calls == ["starttls", ("login", "user")]
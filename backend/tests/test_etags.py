@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.security import create_access_token
+from tests.factories import add_booking, add_slot
+
+START = datetime(2030, 1, 7, 9)
+
+
+@pytest.fixture
+def authed(client, freelancer):
+    client.cookies.set("access_token", create_access_token(str(freelancer.id)))
+    return client
+
+
+def revalidate(client, url: str, etag: str):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+def test_slot_revalidates_until_the_freelancer_changes_it(db, freelancer, authed):
+    slot = add_slot(db, freelancer.id, START, START + timedelta(hours=2))
+    db.commit()
+    url = f"/api/v1/availability/{slot.id}"
+
+    first = authed.get(url)
+    etag = first.headers["ETag"]
+
+    assert first.status_code == 200
+    cached = revalidate(authed, url, etag)
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    updated = authed.put(url, json={"end_time": "2030-01-07T12:00:00"})
+    assert updated.status_code == 200
+    fresh = revalidate(authed, url, etag)
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert fresh.json()["data"]["end_time"] == "2030-01-07T12:00:00"
+
+
+def test_booking_list_revalidates_until_a_booking_changes(db, freelancer, authed):
+    slot = add_slot(db, freelancer.id, START, START + timedelta(hours=2))
+    booking = add_booking(db, slot, START)
+    db.commit()
+    url = "/api/v1/bookings/"
+
+    etag = authed.get(url).headers["ETag"]
+
+    assert revalidate(authed, url, etag).status_code == 304
+    # the query is part of the representation
+    filtered = authed.get(
+        url, params={"status": "pending"}, headers={"If-None-Match": etag}
+    )
+    assert filtered.status_code == 200
+
+    confirmed = authed.put(
+        f"/api/v1/bookings/update/{booking.id}", json={"status": "confirmed"}
+    )
+    assert confirmed.status_code == 200
+    fresh = revalidate(authed, url, etag)
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert fresh.json()["data"]["counts"]["confirmed"] == 1
@@ -0,0 +1,54 @@
+from datetime import date, datetime, timedelta
+
+from app.crud.available_slots import get_freebusy
+from app.crud.freelancer import bump_availability_version
+from app.models.availability import AvailableSlot
+from app.models.bookings import BookingStatus
+from app.services.freebusy import BYTES_PER_DAY, FreeBusyCache
+from tests.factories import add_booking, add_freelancer, add_slot
+
+DAY = date(2030, 1, 7)
+NEXT_DAY = DAY + timedelta(days=1)
+
+
+def test_cache_serves_only_the_version_it_was_computed_at():
+    cache = FreeBusyCache(max_freelancers=10)
+    cache.store(1, 3, {DAY: b"v3"})
+
+    assert cache.lookup(1, 3, [DAY, NEXT_DAY]) == {DAY: b"v3"}
+    assert cache.lookup(1, 4, [DAY]) == {}
+
+
+def test_cache_keeps_the_newer_version():
+    cache = FreeBusyCache(max_freelancers=10)
+    cache.store(1, 4, {DAY: b"v4"})
+    # a slow request that read version 3 finishes last
+    cache.store(1, 3, {NEXT_DAY: b"v3"})
+    cache.store(1, 4, {NEXT_DAY: b"v4"})
+
+    assert cache.lookup(1, 4, [DAY, NEXT_DAY]) == {DAY: b"v4", NEXT_DAY: b"v4"}
+
+
+def test_write_from_another_worker_is_seen(session_factory):
+    morning = datetime.combine(DAY, datetime.min.time()) + timedelta(hours=8)
+    with session_factory() as db:
+        freelancer = add_freelancer(db)
+        slot = add_slot(db, freelancer.id, morning, morning + timedelta(hours=2))
+        db.commit()
+        freelancer_id, slot_id = freelancer.id, slot.id
+        before = get_freebusy(db, freelancer_id, DAY, 1)
+
+    # another process confirms a booking; nothing here invalidates the cache
+    with session_factory() as db:
+        slot = db.get(AvailableSlot, slot_id)
+        add_booking(db, slot, morning, BookingStatus.CONFIRMED)
+        bump_availability_version(db, freelancer_id)
+        db.commit()
+
+    with session_factory() as db:
+        after = get_freebusy(db, freelancer_id, DAY, 1)
+
+    # 15-minute buckets 32 to 39, 08:00 to 10:00, share the fifth byte
+    assert len(after) == BYTES_PER_DAY
+    assert before[4] == 0xFF
+    assert after[4] == 0x0F
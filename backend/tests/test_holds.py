@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.crud.bookings import create_booking
+from app.crud.holds import create_hold, release_hold, sweep_expired_holds
+from app.exceptions import exception
+from app.models.availability import SlotHold
+from app.schema.bookings import BookingCreate
+from tests.factories import add_freelancer, add_slot
+
+START = datetime(2030, 1, 7, 9)
+
+
+def booking_data(hold_token: str | None = None, name: str = "Client") -> BookingCreate:
+    return BookingCreate(
+        client_name=name,
+        client_email=f"{name.lower()}@example.com",
+        hold_token=hold_token,
+    )
+
+
+def error_code(excinfo) -> str:
+    return excinfo.value.response.details[0].code
+
+
+@pytest.fixture
+def slot_id(db) -> int:
+    """
+    A slot exactly one unit long, so a single hold takes all of it.
+    """
+    freelancer = add_freelancer(db)
+    slot = add_slot(db, freelancer.id, START, START + timedelta(hours=1))
+    db.commit()
+    return slot.id
+
+
+def expire(db, hold: SlotHold):
+    hold.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+
+def test_hold_takes_the_first_free_unit(db, slot_id):
+    hold = create_hold(db, slot_id)
+
+    assert hold.start_time == START
+    assert hold.duration_minutes == 60
+    assert hold.expires_at > datetime.utcnow()
+    with pytest.raises(exception.AppException) as excinfo:
+        create_hold(db, slot_id)
+    assert error_code(excinfo) == "slot.already_booked"
+
+
+def test_hold_blocks_another_clients_booking(db, slot_id):
+    create_hold(db, slot_id)
+
+    with pytest.raises(exception.AppException) as excinfo:
+        create_booking(db, booking_data(name="Other"), slot_id=slot_id)
+    assert error_code(excinfo) == "slot.already_booked"
+
+
+def test_holder_books_into_the_hold_and_releases_it(db, slot_id):
+    hold = create_hold(db, slot_id)
+    token = hold.token
+
+    booking = create_booking(db, booking_data(token), slot_id=slot_id)
+
+    assert booking.time == START
+    assert db.query(SlotHold).filter(SlotHold.token == token).count() == 0
+
+
+def test_expired_hold_frees_the_unit_and_its_token(db, slot_id):
+    hold = create_hold(db, slot_id)
+    token = hold.token
+    expire(db, hold)
+
+    with pytest.raises(exception.AppException) as excinfo:
+        create_booking(db, booking_data(token), slot_id=slot_id)
+    assert error_code(excinfo) == "hold.not_found"
+    booking = create_booking(db, booking_data(name="Other"), slot_id=slot_id)
+    assert booking.time == START
+
+
+def test_released_hold_frees_the_unit(db, slot_id):
+    release_hold(db, create_hold(db, slot_id).token)
+
+    assert create_hold(db, slot_id).start_time == START
+
+
+def test_sweeper_deletes_only_expired_holds(db):
+    freelancer = add_freelancer(db)
+    slot = add_slot(db, freelancer.id, START, START + timedelta(hours=2))
+    db.commit()
+    expired = create_hold(db, slot.id)
+    live = create_hold(db, slot.id)
+    expire(db, expired)
+
+    assert sweep_expired_holds(db) == 1
+    assert [hold.id for hold in db.query(SlotHold).all()] == [live.id]
+
+
+def test_hold_endpoints_round_trip(client, slot_id):
+    response = client.post("/api/v1/bookings/holds", params={"slot_id": slot_id})
+
+    assert response.status_code == 201
+    hold = response.json()["data"]
+    assert (hold["start_time"], hold["end_time"]) == (
+        "2030-01-07T09:00:00",
+        "2030-01-07T10:00:00",
+    )
+    taken = client.post("/api/v1/bookings/holds", params={"slot_id": slot_id})
+    assert taken.status_code == 400
+
+    released = client.delete(f"/api/v1/bookings/holds/{hold['token']}")
+    assert released.status_code == 200
+    again = client.post("/api/v1/bookings/holds", params={"slot_id": slot_id})
+    assert again.status_code == 201
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api import bookings as bookings_api
+from app.crud.idempotency import sweep_expired_keys
+from app.exceptions import exception
+from app.models.bookings import Booking
+from app.models.idempotency import IdempotencyKey
+from app.models.outbox import OutboxMessage
+from app.schema.bookings import BookingCreate
+from tests.factories import add_freelancer, add_slot
+
+START = datetime(2030, 1, 7, 9)
+BODY = {"client_name": "Client", "client_email": "client@example.com"}
+
+
+def test_conflict_without_a_stored_response_is_a_409(monkeypatch):
+    def create_booking(**kwargs):
+        raise exception.IdempotencyKeyConflictException()
+
+    monkeypatch.setattr(bookings_api, "create_booking", create_booking)
+    # unused before the conflict, and gone again after it
+    monkeypatch.setattr(bookings_api, "get_stored_response", lambda *args: None)
+
+    with pytest.raises(exception.IdempotencyKeyConflictException) as raised:
+        bookings_api.create_booking_endpoint(
+            BookingCreate(client_name="Client", client_email="client@example.com"),
+            slot_id=1,
+            rule_id=None,
+            start_time=None,
+            idempotency_key="retry-1",
+            db=None,
+        )
+    assert raised.value.status_code == 409
+
+
+@pytest.fixture
+def slot_id(db) -> int:
+    freelancer = add_freelancer(db)
+    slot = add_slot(db, freelancer.id, START, START + timedelta(hours=2))
+    db.commit()
+    return slot.id
+
+
+def book(client, slot_id: int, body: dict, key: str = "retry-1"):
+    return client.post(
+        "/api/v1/bookings/create",
+        params={"slot_id": slot_id},
+        json=body,
+        headers={"Idempotency-Key": key},
+    )
+
+
+def test_replayed_request_returns_the_stored_response(client, db, slot_id):
+    first = book(client, slot_id, BODY)
+    replay = book(client, slot_id, BODY)
+
+    assert first.status_code == replay.status_code == 201
+    assert replay.json()["data"] == first.json()["data"]
+    assert db.query(Booking).count() == 1
+    # one email each to the client and the freelancer, not two
+    assert db.query(OutboxMessage).count() == 2
+
+
+def test_key_reused_with_a_different_body_is_a_422(client, db, slot_id):
+    book(client, slot_id, BODY)
+
+    response = book(client, slot_id, {**BODY, "client_name": "Someone Else"})
+
+    assert response.status_code == 422
+    assert response.json()["details"][0]["code"] == "idempotency.key_reused"
+    assert db.query(Booking).count() == 1
+
+
+def test_sweeper_deletes_only_expired_keys(client, db, slot_id):
+    book(client, slot_id, BODY, key="old")
+    book(client, slot_id, BODY, key="new")
+    db.get(IdempotencyKey, "old").expires_at = datetime.utcnow()
+    db.commit()
+
+    assert sweep_expired_keys(db) == 1
+    assert [row.key for row in db.query(IdempotencyKey).all()] == ["new"]
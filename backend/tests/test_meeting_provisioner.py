@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.models.bookings import Booking, BookingStatus, MeetingStatus
+from app.models.freelancer import Freelancer
+from app.models.outbox import OutboxMessage
+from app.services import meeting_provisioner
+from app.services.meeting_provisioner import MeetingProvisioner
+from app.services.zoom_service import ZoomAPIError
+from app.utils.template_renderer import render_template
+from tests.factories import add_booking, add_freelancer, add_slot
+
+START = datetime(2030, 1, 7, 9)
+
+
+def add_due_booking(session_factory) -> tuple[int, int]:
+    with session_factory() as db:
+        freelancer = add_freelancer(db)
+        slot = add_slot(db, freelancer.id, START, START + timedelta(hours=2))
+        booking = add_booking(db, slot, START, BookingStatus.CONFIRMED)
+        booking.meeting_status = MeetingStatus.PENDING
+        booking.meeting_next_attempt_at = datetime.utcnow()
+        db.commit()
+        return booking.id, freelancer.id
+
+
+def version(db, freelancer_id: int) -> int:
+    return db.get(Freelancer, freelancer_id).availability_version
+
+
+def test_zoom_is_called_without_holding_the_booking_lock(
+    session_factory, monkeypatch
+):
+    booking_id, freelancer_id = add_due_booking(session_factory)
+    locked_during_call = []
+
+    def create_meeting(topic, start_time, duration):
+        with session_factory() as db:
+            # NOWAIT fails straight away if the provisioner still holds a lock
+            db.execute(
+                select(Booking.id)
+                .where(Booking.id == booking_id)
+                .with_for_update(nowait=True)
+            ).one()
+            locked_during_call.append(False)
+            db.rollback()
+        return {"join_url": "https://zoom.example/j/1"}
+
+    monkeypatch.setattr(
+        meeting_provisioner.ZoomService, "create_meeting", create_meeting
+    )
+    with session_factory() as db:
+        version_before = version(db, freelancer_id)
+
+    assert MeetingProvisioner(session_factory).drain() == 1
+
+    assert locked_during_call == [False]
+    with session_factory() as db:
+        booking = db.get(Booking, booking_id)
+        assert booking.meeting_status == MeetingStatus.READY
+        assert booking.meeting_link == "https://zoom.example/j/1"
+        assert version(db, freelancer_id) == version_before + 1
+        assert db.query(OutboxMessage).count() == 1
+
+
+def test_booking_cancelled_during_the_call_keeps_its_state(
+    session_factory, monkeypatch
+):
+    booking_id, _ = add_due_booking(session_factory)
+
+    def create_meeting(topic, start_time, duration):
+        with session_factory() as db:
+            booking = db.get(Booking, booking_id)
+            booking.status = BookingStatus.CANCELLED
+            booking.meeting_status = None
+            db.commit()
+        return {"join_url": "https://zoom.example/j/2"}
+
+    monkeypatch.setattr(
+        meeting_provisioner.ZoomService, "create_meeting", create_meeting
+    )
+
+    assert MeetingProvisioner(session_factory).drain() == 0
+
+    with session_factory() as db:
+        booking = db.get(Booking, booking_id)
+        assert booking.meeting_status is None
+        assert booking.meeting_link is None
+        assert db.query(OutboxMessage).count() == 0
+
+
+def test_final_failure_still_confirms_and_asks_the_freelancer_for_a_link(
+    session_factory, monkeypatch
+):
+    booking_id, _ = add_due_booking(session_factory)
+
+    def create_meeting(topic, start_time, duration):
+        raise ZoomAPIError("Zoom returned 503: unavailable", 503)
+
+    monkeypatch.setattr(
+        meeting_provisioner.ZoomService, "create_meeting", create_meeting
+    )
+
+    assert MeetingProvisioner(session_factory, max_attempts=1).drain() == 0
+
+    with session_factory() as db:
+        booking = db.get(Booking, booking_id)
+        assert booking.meeting_status == MeetingStatus.FAILED
+        emails = {
+            message.template: message
+            for message in db.query(OutboxMessage).all()
+        }
+        assert set(emails) == {
+            "client_booking_confirmation.html",
+            "freelancer_meeting_failed.html",
+        }
+        confirmation = emails["client_booking_confirmation.html"]
+        assert confirmation.to_email == "client@example.com"
+        assert "meeting_link" not in confirmation.context
+        html = render_template(confirmation.template, **confirmation.context)
+        assert "could not create the Zoom meeting" in html
+        assert 'class="zoom-link"' not in html
+        assert emails["freelancer_meeting_failed.html"].to_email == "ada@example.com"
@@ -0,0 +1,2 @@
+def test_metrics_are_not_served_unless_enabled(client):
+    assert client.get("/api/v1/metrics/").status_code == 404
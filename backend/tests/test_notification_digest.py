@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+from app.models.bookings import BookingStatus
+from app.models.notifications import FreelancerNotification
+from app.models.outbox import OutboxMessage
+from app.services.email_notification import notify_freelancer_on_booking_request
+from app.services.notification_digest import NotificationDigestJob
+from tests.factories import add_booking, add_freelancer, add_slot
+
+START = datetime(2030, 1, 7, 9)
+
+
+def queue_requests(
+    session_factory, statuses: list[BookingStatus], name: str = "Ada"
+) -> None:
+    """
+    Queue one digest row per booking request, then move each booking to the
+    given status and let the digest window close.
+    """
+    with session_factory() as db:
+        freelancer = add_freelancer(db, name)
+        slot = add_slot(db, freelancer.id, START, START + timedelta(hours=4))
+        for hour, status in enumerate(statuses):
+            booking = add_booking(
+                db,
+                slot,
+                START + timedelta(hours=hour),
+                client_email=f"client{hour}@example.com",
+            )
+            booking.client_name = f"Client {hour}"
+            notify_freelancer_on_booking_request(
+                db,
+                freelancer_name=freelancer.first_name,
+                freelancer_email=freelancer.email,
+                client_name=booking.client_name,
+                booking_time=booking.time,
+                freelancer_id=freelancer.id,
+                booking_id=booking.id,
+                digest_minutes=10,
+            )
+            booking.status = status
+        db.flush()
+        db.query(FreelancerNotification).filter(
+            FreelancerNotification.freelancer_id == freelancer.id
+        ).update({FreelancerNotification.send_after: datetime.utcnow()})
+        db.commit()
+
+
+def test_digest_leaves_out_requests_that_are_no_longer_pending(session_factory):
+    queue_requests(
+        session_factory,
+        [BookingStatus.PENDING, BookingStatus.CANCELLED, BookingStatus.PENDING],
+    )
+
+    assert NotificationDigestJob(session_factory).run() == 1
+
+    with session_factory() as db:
+        (email,) = db.query(OutboxMessage).all()
+        assert email.template == "freelancer_booking_digest.html"
+        assert [r["client_name"] for r in email.context["requests"]] == [
+            "Client 0",
+            "Client 2",
+        ]
+        assert db.query(FreelancerNotification).count() == 0
+
+
+def test_digest_of_only_cancelled_requests_sends_nothing(session_factory):
+    queue_requests(session_factory, [BookingStatus.CANCELLED] * 2)
+
+    assert NotificationDigestJob(session_factory).run() == 0
+
+    with session_factory() as db:
+        assert db.query(OutboxMessage).count() == 0
+        assert db.query(FreelancerNotification).count() == 0
+
+
+def test_batch_without_digests_does_not_end_the_run(session_factory):
+    # the first batch holds only a freelancer whose requests were cancelled
+    queue_requests(session_factory, [BookingStatus.CANCELLED], "Ada")
+    queue_requests(session_factory, [BookingStatus.PENDING], "Bob")
+
+    assert NotificationDigestJob(session_factory, batch_size=1).run() == 1
+
+    with session_factory() as db:
+        (email,) = db.query(OutboxMessage).all()
+        assert email.to_email == "bob@example.com"
+        assert db.query(FreelancerNotification).count() == 0
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.email import StubTransport, apply_substitutions
+from app.crud import bookings as bookings_crud
+from app.exceptions import exception
+from app.models.bookings import Booking
+from app.models.outbox import OutboxMessage, OutboxStatus
+from app.schema.bookings import BookingCreate
+from app.services.outbox import OutboxWorker, _build_batch, enqueue_email
+from tests.factories import add_freelancer, add_slot
+
+START = datetime(2030, 1, 7, 9)
+
+
+class FailingTransport(StubTransport):
+    def send(self, to_email: str, subject: str, html_content: str) -> None:
+        raise ConnectionError("relay unreachable")
+
+
+def queue_email(session_factory) -> int:
+    with session_factory() as db:
+        enqueue_email(
+            db,
+            to_email="client@example.com",
+            subject="Booking Cancellation",
+            template="client_booking_cancellation.html",
+            context=dict(
+                client_name="Client",
+                booking_time="January 07, 2030 at 09:00 AM",
+                freelancer_name="Ada",
+            ),
+        )
+        db.commit()
+        return db.query(OutboxMessage.id).scalar()
+
+
+def test_sent_message_is_marked_sent(session_factory):
+    message_id = queue_email(session_factory)
+    transport = StubTransport()
+
+    assert OutboxWorker(session_factory, transport).drain() == 1
+
+    (to_email, subject, html) = transport.sent[0]
+    assert (to_email, subject) == ("client@example.com", "Booking Cancellation")
+    assert "Client" in html
+    with session_factory() as db:
+        message = db.get(OutboxMessage, message_id)
+        assert message.status == OutboxStatus.SENT
+        assert message.sent_at is not None
+
+
+def test_transport_error_reschedules_with_backoff(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_RETRY_BASE_SECONDS", 60)
+    monkeypatch.setattr(settings, "OUTBOX_RETRY_MAX_SECONDS", 3600)
+    message_id = queue_email(session_factory)
+    started = datetime.utcnow()
+    worker = OutboxWorker(session_factory, FailingTransport(), max_attempts=3)
+
+    assert worker.drain() == 0
+
+    with session_factory() as db:
+        message = db.get(OutboxMessage, message_id)
+        assert message.status == OutboxStatus.PENDING
+        assert message.attempts == 1
+        assert message.last_error == "relay unreachable"
+        # the first retry waits between half and all of the base delay
+        assert started + timedelta(seconds=30) <= message.next_attempt_at
+        assert message.next_attempt_at <= datetime.utcnow() + timedelta(seconds=60)
+
+
+def test_message_fails_after_max_attempts(session_factory):
+    message_id = queue_email(session_factory)
+    worker = OutboxWorker(session_factory, FailingTransport(), max_attempts=2)
+
+    for _ in range(2):
+        worker.drain()
+        with session_factory() as db:
+            # make the retry due straight away
+            db.get(OutboxMessage, message_id).next_attempt_at = datetime.utcnow()
+            db.commit()
+
+    with session_factory() as db:
+        message = db.get(OutboxMessage, message_id)
+        assert message.status == OutboxStatus.FAILED
+        assert message.attempts == 2
+    # a failed message is never picked up again
+    assert worker.drain() == 0
+
+
+def test_emails_are_queued_in_the_booking_transaction(db, monkeypatch):
+    freelancer = add_freelancer(db)
+    slot = add_slot(db, freelancer.id, START, START + timedelta(hours=2))
+    db.commit()
+    data = BookingCreate(client_name="Client", client_email="client@example.com")
+
+    def fail(db, freelancer_id):
+        raise SQLAlchemyError("lost connection")
+
+    # fails after both emails were added, before the commit
+    monkeypatch.setattr(bookings_crud, "bump_availability_version", fail)
+    with pytest.raises(exception.AppException):
+        bookings_crud.create_booking(db, data, slot_id=slot.id)
+    assert db.query(Booking).count() == 0
+    assert db.query(OutboxMessage).count() == 0
+
+    monkeypatch.undo()
+    booking = bookings_crud.create_booking(db, data, slot_id=slot.id)
+
+    emails = db.query(OutboxMessage).order_by(OutboxMessage.id).all()
+    assert [email.to_email for email in emails] == [
+        "client@example.com",
+        "ada@example.com",
+    ]
+    assert db.query(Booking).one().id == booking.id
+
+
+def test_batched_values_are_escaped_like_a_single_render():
+    context = dict(
+        client_name="<b>Eve</b> & co",
+        booking_time="January 07, 2030 at 09:00 AM",
+        freelancer_name="Ada",
+    )
+    messages = [
+        OutboxMessage(
+            to_email=f"client{i}@example.com",
+            subject="Booking Cancellation",
+            template="client_booking_cancellation.html",
+            context=context,
+        )
+        for i in range(2)
+    ]
+
+    batch = _build_batch(messages)
+    batched = apply_substitutions(
+        batch.html_content, batch.recipients[0].substitutions
+    )
+
+    assert "&lt;b&gt;Eve&lt;/b&gt; &amp; co" in batched
+    assert "<b>Eve</b>" not in batched
+    assert batched == _build_batch(messages[:1]).html_content
@@ -0,0 +1,168 @@
+import asyncio
+import json
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.rate_limit import (
+    Budget,
+    InProcessTokenBucketStore,
+    RateLimitMiddleware,
+    TokenBucketStore,
+)
+
+LOGIN = "/api/v1/auth/login"
+BUDGETS = {
+    ("POST", LOGIN): [
+        Budget("ip", capacity=20, per_seconds=60),
+        Budget("email", capacity=5, per_seconds=60),
+    ],
+}
+
+
+class FakeStore(TokenBucketStore):
+    """
+    Records every key taken and answers with a preset wait per budget key.
+    """
+
+    def __init__(self, waits: dict[str, float] | None = None):
+        self.waits = waits or {}
+        self.taken: list[str] = []
+
+    async def take(self, buckets: list[tuple[str, int, float]]) -> list[float]:
+        keys = [key for key, _, _ in buckets]
+        self.taken.extend(keys)
+        return [self.waits.get(key.split(":")[2], 0.0) for key in keys]
+
+
+def make_client(
+    store: TokenBucketStore, budgets=BUDGETS
+) -> tuple[TestClient, list[bytes]]:
+    received = []
+    app = FastAPI()
+
+    @app.post(LOGIN)
+    async def login(request: Request):
+        received.append(await request.body())
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, store=store, budgets=budgets)
+    return TestClient(app), received
+
+
+def test_empty_bucket_is_rejected_before_the_app():
+    store = FakeStore(waits={"email": 2.4})
+    client, received = make_client(store)
+
+    response = client.post(LOGIN, json={"email": "ada@example.com"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert response.json()["details"][0]["target"] == "email"
+    assert received == []
+
+
+def test_email_key_comes_from_the_body_and_the_body_is_replayed():
+    store = FakeStore()
+    client, received = make_client(store)
+    body = json.dumps({"email": " Ada@Example.com ", "password": "secret"}).encode()
+
+    response = client.post(
+        LOGIN, content=body, headers={"Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 200
+    assert store.taken == [
+        f"POST:{LOGIN}:ip:testclient",
+        f"POST:{LOGIN}:email:ada@example.com",
+    ]
+    assert received == [body]
+
+
+def test_chunked_body_reaches_the_app_intact():
+    store = FakeStore()
+    chunks = [b'{"email": "ada@', b'example.com", ', b'"password": "secret"}']
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    received = []
+
+    async def app(scope, receive, send):
+        while True:
+            message = await receive()
+            received.append(message["body"])
+            if not message.get("more_body"):
+                return
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        pass
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": LOGIN,
+        "query_string": b"",
+        "headers": [],
+        "client": ("203.0.113.9", 4711),
+    }
+    middleware = RateLimitMiddleware(app, store=store, budgets=BUDGETS)
+    asyncio.run(middleware(scope, receive, send))
+
+    assert b"".join(received) == b"".join(chunks)
+    assert store.taken[1] == f"POST:{LOGIN}:email:ada@example.com"
+
+
+def test_rejected_request_spends_no_token_from_the_other_budgets():
+    budgets = {
+        ("POST", LOGIN): [
+            Budget("ip", capacity=2, per_seconds=3600),
+            Budget("email", capacity=1, per_seconds=3600),
+        ],
+    }
+    client, _ = make_client(InProcessTokenBucketStore(max_keys=100), budgets)
+
+    def login(email: str) -> int:
+        return client.post(LOGIN, json={"email": email}).status_code
+
+    assert login("ada@example.com") == 200
+    # the email budget rejects this one; the IP keeps its second token
+    assert login("ada@example.com") == 429
+    assert login("bob@example.com") == 200
+    assert login("eve@example.com") == 429
+
+
+def test_spoofed_forwarded_for_entries_share_the_proxy_seen_bucket(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_FORWARDED_FOR", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_PROXY_HOPS", 1)
+    store = FakeStore()
+    client, _ = make_client(store)
+
+    for spoofed in ("1.1.1.1", "2.2.2.2, 3.3.3.3"):
+        client.post(
+            LOGIN,
+            json={"email": "ada@example.com"},
+            headers={"X-Forwarded-For": f"{spoofed}, 198.51.100.7"},
+        )
+
+    ip_keys = [key for key in store.taken if ":ip:" in key]
+    assert ip_keys == [f"POST:{LOGIN}:ip:198.51.100.7"] * 2
+
+
+def test_forwarded_for_skips_the_configured_proxy_hops(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_FORWARDED_FOR", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_PROXY_HOPS", 2)
+    store = FakeStore()
+    client, _ = make_client(store)
+
+    client.post(
+        LOGIN,
+        json={"email": "ada@example.com"},
+        headers={"X-Forwarded-For": "1.1.1.1, 198.51.100.7, 10.0.0.2"},
+    )
+
+    assert store.taken[0] == f"POST:{LOGIN}:ip:198.51.100.7"
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+
+from app.utils.recurrence import merge_intervals, subtract_intervals
+
+BASE = datetime(2030, 1, 7)
+
+
+def hours(start: int, end: int, rule_id: int | None) -> tuple:
+    return BASE + timedelta(hours=start), BASE + timedelta(hours=end), rule_id
+
+
+def test_merge_keeps_the_rule_id_of_a_single_rule():
+    merged = list(merge_intervals([hours(9, 11, 1), hours(10, 12, 1)]))
+
+    assert merged == [hours(9, 12, 1)]
+
+
+def test_merge_across_rules_drops_the_rule_id():
+    merged = list(
+        merge_intervals([hours(9, 12, 1), hours(11, 14, 2), hours(15, 16, 2)])
+    )
+
+    assert merged == [hours(9, 14, None), hours(15, 16, 2)]
+
+
+def test_subtract_keeps_overlapping_intervals_apart():
+    busy = [(BASE + timedelta(hours=9), BASE + timedelta(hours=10))]
+
+    free = list(subtract_intervals([hours(9, 12, 1), hours(11, 14, 2)], busy))
+
+    assert free == [hours(10, 12, 1), hours(11, 14, 2)]
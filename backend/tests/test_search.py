@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+from app.crud.available_slots import search_free_freelancers
+from app.models.bookings import BookingStatus
+from tests.factories import add_booking, add_freelancer, add_slot
+
+NINE = datetime(2030, 1, 7, 9)
+
+
+def at(hours: float) -> datetime:
+    return NINE + timedelta(hours=hours)
+
+
+def search(db, start: float, end: float, minutes: int = 60) -> list[tuple]:
+    results, _ = search_free_freelancers(
+        db, at(start), at(end), timedelta(minutes=minutes)
+    )
+    return [
+        (result.first_name, result.free_from, result.free_until) for result in results
+    ]
+
+
+def test_search_subtracts_confirmed_bookings(db):
+    busy = add_freelancer(db, "Busy")
+    idle = add_freelancer(db, "Idle")
+    busy_slot = add_slot(db, busy.id, at(0), at(3))
+    add_slot(db, idle.id, at(1), at(3))
+    add_booking(db, busy_slot, at(0), BookingStatus.CONFIRMED)
+    add_booking(db, busy_slot, at(1), BookingStatus.CONFIRMED)
+    # pending requests leave the time free
+    add_booking(db, busy_slot, at(2), BookingStatus.PENDING)
+    db.commit()
+
+    assert search(db, 0, 2) == [("Idle", at(1), at(2))]
+    assert search(db, 0, 3) == [("Idle", at(1), at(3)), ("Busy", at(2), at(3))]
+    # the free hour is only in the window once a booking is not in the way
+    assert search(db, 0, 3, minutes=90) == [("Idle", at(1), at(3))]
+
+
+def test_search_window_mixing_aware_and_naive_bounds(db, client):
+    idle = add_freelancer(db, "Idle")
+    add_slot(db, idle.id, at(0), at(2))
+    db.commit()
+
+    # 11:00+02:00 is 09:00 UTC
+    response = client.get(
+        "/api/v1/availability/search",
+        params={"start": "2030-01-07T11:00:00+02:00", "end": "2030-01-07T10:00:00"},
+    )
+
+    assert response.status_code == 200
+    assert [item["first_name"] for item in response.json()["data"]["items"]] == [
+        "Idle"
+    ]
+
+
+def test_search_rejects_a_window_shorter_than_min_duration(client):
+    response = client.get(
+        "/api/v1/availability/search",
+        params={
+            "start": "2030-01-07T09:00:00Z",
+            "end": "2030-01-07T09:30:00",
+            "min_duration": 60,
+        },
+    )
+
+    assert response.status_code == 422
+    assert response.json()["details"][0]["code"] == "availability.invalid_window"
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+from app.services.slot_index import SlotIntervalIndex
+
+BASE = datetime(2030, 1, 1)
+
+
+def hours(start: int, end: int) -> tuple[datetime, datetime]:
+    return BASE + timedelta(hours=start), BASE + timedelta(hours=end)
+
+
+def make_index() -> SlotIntervalIndex:
+    # slot i covers hours [2i, 2i + 1)
+    return SlotIntervalIndex([(i, *hours(2 * i, 2 * i + 1)) for i in range(10)])
+
+
+def test_find_overlap():
+    index = make_index()
+
+    assert index.find_overlap(*hours(0, 1)) == 0
+    assert index.find_overlap(*hours(1, 2)) is None
+    assert index.find_overlap(*hours(3, 5)) == 2
+    assert index.find_overlap(*hours(4, 5), exclude_slot_id=2) is None
+
+
+def test_free_gaps():
+    index = make_index()
+
+    assert index.free_gaps(*hours(0, 4)) == [hours(1, 2), hours(3, 4)]
+
+
+def test_writes_do_not_change_a_snapshot_being_read():
+    index = make_index()
+    snapshot = index._arrays
+
+    index.remove(3)
+    index.add(42, *hours(7, 8))
+
+    assert snapshot[2] == list(range(10))
+    assert index.find_overlap(*hours(6, 7)) is None
+    assert index.find_overlap(*hours(7, 8)) == 42
+    assert len(index) == 10
@@ -0,0 +1,136 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from app.crud.availability_rules import create_availability_rule
+from app.crud.available_slots import get_available_slots
+from app.exceptions import exception
+from app.schema.availability_rules import AvailabilityRuleCreate
+from app.utils.pagination import decode_cursor, encode_cursor
+from tests.factories import add_slot
+
+MONDAY = date(2030, 1, 7)
+WINDOW_START = datetime.combine(MONDAY, time.min)
+WINDOW_END = WINDOW_START + timedelta(days=8)
+
+
+def at(day: int, hour: int) -> datetime:
+    return WINDOW_START + timedelta(days=day, hours=hour)
+
+
+@pytest.fixture
+def freelancer_id(db, freelancer) -> int:
+    """
+    Mondays 09:00-12:00 from a rule, plus concrete slots on both Mondays of
+    the window and just outside it.
+    """
+    create_availability_rule(
+        db,
+        AvailabilityRuleCreate(
+            weekdays=[0], start_time=time(9), end_time=time(12), valid_from=MONDAY
+        ),
+        freelancer.id,
+    )
+    for start, end in [
+        (at(-1, 23), at(0, 1)),  # straddles the window start
+        (at(0, 13), at(0, 14)),
+        (at(0, 15), at(0, 16)),
+        (at(7, 7), at(7, 8)),
+        (at(7, 12), at(7, 13)),
+        (at(-1, 10), at(-1, 11)),  # before the window
+        (at(8, 10), at(8, 11)),  # starts at the window end
+    ]:
+        add_slot(db, freelancer.id, start, end)
+    db.commit()
+    return freelancer.id
+
+
+def starts(page) -> list[tuple[datetime, bool]]:
+    # rule occurrences are the ones with a rule_id
+    return [
+        (slot.start_time, getattr(slot, "rule_id", None) is not None)
+        for slot in page
+    ]
+
+
+def test_window_lists_slots_and_rule_occurrences_in_start_order(db, freelancer_id):
+    page, next_position = get_available_slots(
+        db, freelancer_id, WINDOW_START, WINDOW_END
+    )
+
+    assert next_position is None
+    assert starts(page) == [
+        (at(-1, 23), False),
+        (at(0, 9), True),
+        (at(0, 13), False),
+        (at(0, 15), False),
+        (at(7, 7), False),
+        (at(7, 9), True),
+        (at(7, 12), False),
+    ]
+
+
+def test_cursor_pages_through_the_merged_stream(db, freelancer_id):
+    full, _ = get_available_slots(db, freelancer_id, WINDOW_START, WINDOW_END)
+    pages = []
+    cursor = None
+
+    while True:
+        page, next_position = get_available_slots(
+            db,
+            freelancer_id,
+            WINDOW_START,
+            WINDOW_END,
+            after=decode_cursor(cursor) if cursor else None,
+            limit=2,
+        )
+        pages.append(starts(page))
+        if next_position is None:
+            break
+        cursor = encode_cursor(*next_position)
+
+    # page boundaries fall on both slots and rule occurrences
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+    assert sum(pages, []) == starts(full)
+
+
+def test_window_must_be_positive(db, freelancer_id):
+    with pytest.raises(exception.AppException) as excinfo:
+        get_available_slots(db, freelancer_id, WINDOW_END, WINDOW_START)
+    assert excinfo.value.response.details[0].code == "availability.invalid_window"
+
+
+def test_cursor_keeps_rules_starting_at_the_same_time_apart(db, freelancer):
+    for end in (11, 12):
+        create_availability_rule(
+            db,
+            AvailabilityRuleCreate(
+                weekdays=[0], start_time=time(9), end_time=time(end), valid_from=MONDAY
+            ),
+            freelancer.id,
+        )
+    add_slot(db, freelancer.id, at(0, 8), at(0, 9))
+    db.commit()
+    seen = []
+    cursor = None
+
+    while True:
+        page, next_position = get_available_slots(
+            db,
+            freelancer.id,
+            WINDOW_START,
+            WINDOW_START + timedelta(days=1),
+            after=decode_cursor(cursor) if cursor else None,
+            limit=1,
+        )
+        seen += [(slot.start_time, slot.end_time) for slot in page]
+        if next_position is None:
+            break
+        cursor = encode_cursor(*next_position)
+
+    # occurrences sharing a start are ordered by descending rule id
+    assert seen == [
+        (at(0, 8), at(0, 9)),
+        (at(0, 9), at(0, 12)),
+        (at(0, 9), at(0, 11)),
+    ]
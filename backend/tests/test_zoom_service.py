@@ -0,0 +1,270 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from app.core.config import settings
+from app.services import zoom_service
+from app.services.zoom_service import (
+    AsyncZoomClient,
+    ZoomAPIError,
+    ZoomClient,
+    ZoomRequestRejected,
+)
+from app.utils import circuit_breaker
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+URL = "https://zoom.test/v2/users/me/meetings"
+
+
+class FakeTokens:
+    def get_token(self) -> str:
+        return "token"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "ZOOM_HTTP_RETRY_BASE_SECONDS", 0)
+    monkeypatch.setattr(settings, "ZOOM_HTTP_RETRY_MAX_SECONDS", 0)
+
+
+def make_breaker() -> CircuitBreaker:
+    return CircuitBreaker("zoom-test", failure_threshold=100, reset_seconds=60)
+
+
+def sync_client(monkeypatch, errors: list[Exception]) -> tuple[ZoomClient, list]:
+    """
+    A client whose session raises the given errors in turn, then answers 201.
+    """
+    client = ZoomClient("https://zoom.test/v2", FakeTokens(), make_breaker())
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append(url)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        response = requests.Response()
+        response.status_code = 201
+        response._content = b'{"join_url": "https://zoom.test/j/1"}'
+        return response
+
+    monkeypatch.setattr(client._session, "request", request)
+    return client, calls
+
+
+def refused() -> requests.ConnectionError:
+    reason = NewConnectionError(None, "Connection refused")
+    return requests.ConnectionError(MaxRetryError(None, URL, reason))
+
+
+def reset() -> requests.ConnectionError:
+    reason = ProtocolError("Connection aborted.", ConnectionResetError(104))
+    return requests.ConnectionError(MaxRetryError(None, URL, reason))
+
+
+@pytest.mark.parametrize(
+    "error", [refused(), requests.ConnectTimeout("connect timed out")]
+)
+def test_sync_retries_when_no_connection_was_made(monkeypatch, error):
+    client, calls = sync_client(monkeypatch, [error])
+
+    assert client.request("POST", "/users/me/meetings", {}, 201) == {
+        "join_url": "https://zoom.test/j/1"
+    }
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        reset(),
+        requests.ReadTimeout("read timed out"),
+        requests.exceptions.ChunkedEncodingError("truncated"),
+    ],
+)
+def test_sync_does_not_retry_once_the_request_may_have_been_sent(
+    monkeypatch, error
+):
+    client, calls = sync_client(monkeypatch, [error])
+
+    with pytest.raises(ZoomAPIError):
+        client.request("POST", "/users/me/meetings", {}, 201)
+    assert len(calls) == 1
+
+
+def async_request(errors: list[Exception]) -> tuple[dict | None, list]:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return httpx.Response(201, json={"join_url": "https://zoom.test/j/1"})
+
+    async def run():
+        client = AsyncZoomClient("https://zoom.test/v2", FakeTokens(), make_breaker())
+        await client.aclose()
+        client._client = httpx.AsyncClient(
+            base_url="https://zoom.test/v2", transport=httpx.MockTransport(handler)
+        )
+        try:
+            return await client.request("POST", "/users/me/meetings", {}, 201)
+        finally:
+            await client.aclose()
+
+    try:
+        result = asyncio.run(run())
+    except ZoomAPIError:
+        result = None
+    return result, calls
+
+
+@pytest.mark.parametrize(
+    "error",
+    [httpx.ConnectError("refused"), httpx.ConnectTimeout("connect timed out")],
+)
+def test_async_retries_when_no_connection_was_made(error):
+    result, calls = async_request([error])
+
+    assert result == {"join_url": "https://zoom.test/j/1"}
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        httpx.ReadError("connection reset"),
+        httpx.RemoteProtocolError("server disconnected"),
+        httpx.ReadTimeout("read timed out"),
+        httpx.WriteTimeout("write timed out"),
+    ],
+)
+def test_async_does_not_retry_other_transport_errors(error):
+    result, calls = async_request([error])
+
+    assert result is None
+    assert len(calls) == 1
+
+
+def response(status_code: int, headers: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = b'{"join_url": "https://zoom.test/j/1"}'
+    return response
+
+
+def answering_client(
+    monkeypatch, responses: list[requests.Response], breaker: CircuitBreaker
+) -> tuple[ZoomClient, list, list]:
+    """
+    A client whose session answers with the given responses in turn; returns
+    it with the URLs requested and the delays slept between attempts.
+    """
+    client = ZoomClient("https://zoom.test/v2", FakeTokens(), breaker)
+    calls = []
+    sleeps = []
+
+    def request(method, url, **kwargs):
+        calls.append(url)
+        return responses[len(calls) - 1]
+
+    monkeypatch.setattr(client._session, "request", request)
+    clock = SimpleNamespace(monotonic=time.monotonic, sleep=sleeps.append)
+    monkeypatch.setattr(zoom_service, "time", clock)
+    return client, calls, sleeps
+
+
+def test_429_waits_for_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "ZOOM_HTTP_RETRY_MAX_SECONDS", 30)
+    responses = [response(429, {"Retry-After": "7"}), response(201)]
+    client, calls, sleeps = answering_client(monkeypatch, responses, make_breaker())
+
+    assert client.request("POST", "/users/me/meetings", {}, 201)
+    assert len(calls) == 2
+    assert sleeps == [7.0]
+
+
+def test_retry_after_beyond_the_retry_cap_gives_up(monkeypatch):
+    monkeypatch.setattr(settings, "ZOOM_HTTP_RETRY_MAX_SECONDS", 30)
+    client, calls, sleeps = answering_client(
+        monkeypatch, [response(429, {"Retry-After": "120"})], make_breaker()
+    )
+
+    with pytest.raises(ZoomAPIError) as excinfo:
+        client.request("POST", "/users/me/meetings", {}, 201)
+    assert excinfo.value.status_code == 429
+    assert (len(calls), sleeps) == (1, [])
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 404])
+def test_4xx_is_not_retried_and_does_not_trip_the_breaker(monkeypatch, status_code):
+    breaker = CircuitBreaker("zoom-test", failure_threshold=1, reset_seconds=60)
+    client, calls, _ = answering_client(monkeypatch, [response(status_code)], breaker)
+
+    with pytest.raises(ZoomRequestRejected):
+        client.request("POST", "/users/me/meetings", {}, 201)
+    assert len(calls) == 1
+    assert not breaker.is_open
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    """
+    The breaker's clock; tests move it by changing clock[0].
+    """
+    now = [1000.0]
+    monkeypatch.setattr(
+        circuit_breaker, "time", SimpleNamespace(monotonic=lambda: now[0])
+    )
+    return now
+
+
+def test_breaker_opens_after_the_threshold(clock):
+    breaker = CircuitBreaker("zoom-test", failure_threshold=3, reset_seconds=60)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert not breaker.is_open
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.is_open
+    clock[0] += 59
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_in == pytest.approx(1)
+
+
+def test_breaker_lets_one_trial_through_after_the_cooldown(clock):
+    breaker = CircuitBreaker("zoom-test", failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    clock[0] += 60
+
+    breaker.before_call()
+    # half-open: only the trial call goes through
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert not breaker.is_open
+    breaker.before_call()
+
+
+def test_failed_trial_reopens_the_breaker_for_another_period(clock):
+    breaker = CircuitBreaker("zoom-test", failure_threshold=5, reset_seconds=60)
+    for _ in range(5):
+        breaker.record_failure()
+    clock[0] += 60
+
+    breaker.before_call()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_in == pytest.approx(60)
@@ -0,0 +1,68 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+
+from app.services.zoom_token_manager import FileTokenStore, ZoomTokenManager
+
+WORKERS = 8
+
+
+@pytest.fixture
+def fetches(monkeypatch) -> list[str]:
+    """
+    Replace the OAuth call with a slow fake that hands out numbered tokens.
+    """
+    issued = []
+
+    def fetch(self):
+        # long enough for every waiting caller to pile up behind the lock
+        time.sleep(0.05)
+        issued.append(f"token-{len(issued) + 1}")
+        return issued[-1], time.time() + 3600
+
+    monkeypatch.setattr(ZoomTokenManager, "_fetch", fetch)
+    return issued
+
+
+def get_tokens_concurrently(managers: list[ZoomTokenManager]) -> list[str]:
+    barrier = Barrier(len(managers))
+
+    def get(manager: ZoomTokenManager) -> str:
+        barrier.wait()
+        return manager.get_token()
+
+    with ThreadPoolExecutor(len(managers)) as pool:
+        return list(pool.map(get, managers))
+
+
+def test_concurrent_callers_share_one_fetch(tmp_path, fetches):
+    manager = ZoomTokenManager(FileTokenStore(str(tmp_path / "token.json")))
+
+    tokens = get_tokens_concurrently([manager] * WORKERS)
+
+    assert fetches == ["token-1"]
+    assert tokens == ["token-1"] * WORKERS
+
+
+def test_managers_sharing_a_store_file_share_one_fetch(tmp_path, fetches):
+    # one manager per worker process, each with its own handle on the file
+    path = str(tmp_path / "token.json")
+    managers = [ZoomTokenManager(FileTokenStore(path)) for _ in range(WORKERS)]
+
+    tokens = get_tokens_concurrently(managers)
+
+    assert fetches == ["token-1"]
+    assert tokens == ["token-1"] * WORKERS
+    # a process started later picks the token up from the file
+    assert ZoomTokenManager(FileTokenStore(path)).get_token() == "token-1"
+    assert fetches == ["token-1"]
+
+
+def test_expired_token_in_the_store_is_fetched_again(tmp_path, fetches):
+    store = FileTokenStore(str(tmp_path / "token.json"))
+    store.save(("stale", time.time() - 1))
+
+    assert ZoomTokenManager(store).get_token() == "token-1"
+    assert store.load()[0] == "token-1"